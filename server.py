@@ -1,10 +1,26 @@
 # server.py
 # ピラティススタジオ情報取得MCPサーバー
 
+import asyncio
+import contextvars
+import heapq
 import httpx
 import logging
 import json
 import base64
+import bisect
+import csv
+import html
+import math
+import random
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from mcp.server.fastmcp import FastMCP
 
 # ログ設定
@@ -35,10 +51,93 @@ WP_APP_PASSWORD = "SDVb bgJk W4zh okVe ruBh GvDy"
 WP_POST_TYPE = "pilates-studio"
 ALLOWED_STATUSES = ["publish", "draft"]
 
+# HTTP接続プール設定（全ツールで1つのクライアントを共有）
+WP_HTTP_TIMEOUT = 30.0
+WP_HTTP_MAX_CONNECTIONS = 10
+WP_HTTP_MAX_KEEPALIVE_CONNECTIONS = 5
+WP_HTTP_KEEPALIVE_EXPIRY = 30.0
+
+# context=edit の使用可否キャッシュの有効期間（秒）
+WP_EDIT_CONTEXT_CACHE_TTL = 600.0
+
+# 一覧の全ページ取得時の設定
+WP_PAGE_SIZE = 100
+WP_PAGE_FETCH_CONCURRENCY = 4
+
+# 一覧系ツールが表示に使うフィールド（_fields= で取得するフィールドを絞り込む）
+PILATES_LIST_FIELDS = ("id", "title", "status", "link")
+# 一覧で表示するカスタムフィールド（custom_fields / meta / ルートのいずれにあってもよい）
+PILATES_LIST_CUSTOM_FIELDS = ("簡易地区", "住所", "表用特徴", "表用料金")
+MEDIA_FREE_CONTENT_LIST_FIELDS = ("id", "title", "status", "date", "link")
+
+# 単一投稿GETのキャッシュ設定（TTL + LRU）
+WP_POST_CACHE_TTL = 60.0
+WP_POST_CACHE_MAX_ENTRIES = 256
+WP_POST_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# TTL切れ後も条件付きGET（If-None-Match / If-Modified-Since）で再検証するために保持する期間（秒）
+WP_POST_CACHE_REVALIDATE_TTL = 3600.0
+
+# ターム（カテゴリー・カスタムタクソノミー）インデックスの有効期間（秒）
+WP_TERM_INDEX_TTL = 300.0
+
+# GETのリトライ設定（指数バックオフ + ジッター、Retry-Afterを優先）
+WP_RETRY_MAX_ATTEMPTS = 3
+WP_RETRY_BASE_DELAY = 0.5
+WP_RETRY_MAX_DELAY = 8.0
+WP_RETRY_AFTER_MAX = 30.0  # これより長いRetry-Afterは待たずにエラーを返す
+WP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# サーキットブレーカー設定（ホスト単位）
+WP_CIRCUIT_FAILURE_THRESHOLD = 5  # 連続失敗でオープン
+WP_CIRCUIT_RESET_TIMEOUT = 30.0   # オープンからハーフオープンに移るまでの秒数
+
+# 同時接続数・レート制限（ホスト単位。共有ホスティングのスロットリング対策）
+WP_MAX_CONCURRENT_REQUESTS = 6
+WP_RATE_LIMIT_PER_SECOND = 8.0
+WP_RATE_LIMIT_BURST = 8
+
+# リクエストの優先度（小さいほど先に送信される）
+WP_PRIORITY_INTERACTIVE = 0  # 単一スタジオの表示など、ユーザーが待っている読み取り
+WP_PRIORITY_NORMAL = 1
+WP_PRIORITY_BULK = 2         # 一括更新・バックグラウンドでの再取得
+
+# 一括更新の同時書き込み数（WP_MAX_CONCURRENT_REQUESTS より小さくし、対話的な読み取りの枠を残す）
+WP_BULK_UPDATE_CONCURRENCY = 4
+
+# バッチAPI（/wp-json/batch/v1, WordPress 5.6+）で1回に送るサブリクエスト数の上限（WordPress既定値は25）
+WP_BATCH_ENABLED = True
+WP_BATCH_MAX_REQUESTS = 25
+
+def _env_seconds(name: str, default: float) -> float:
+    """環境変数を秒数として読む（未設定・数値でない・0以下の場合は default）"""
+    try:
+        value = float(os.environ.get(name, ""))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+# ローカルミラー（SQLite）設定。投稿をディスクに保持し、鮮度内であれば一覧・検索をローカルで処理する
+# 起動時に全投稿を取得するため既定では無効。環境変数 PILATES_MIRROR=1 で有効にする
+PILATES_MIRROR_ENABLED = os.environ.get("PILATES_MIRROR", "").strip().lower() in ("1", "true", "yes", "on")
+PILATES_MIRROR_PATH = os.environ.get("PILATES_MIRROR_PATH") or os.path.join(log_dir, 'mirror.sqlite3')
+# この秒数以内に同期したミラーのみ回答に使う（環境変数 PILATES_MIRROR_MAX_AGE、既定: 600）
+PILATES_MIRROR_MAX_AGE = _env_seconds("PILATES_MIRROR_MAX_AGE", 600.0)
+# ミラーが無効な場合に、ローカルインデックス用のスナップショットを取得し直すまでの秒数（環境変数 PILATES_INDEX_MAX_AGE、既定: 600）
+PILATES_INDEX_MAX_AGE = _env_seconds("PILATES_INDEX_MAX_AGE", 600.0)
+PILATES_MIRROR_POST_TYPES = (WP_POST_TYPE, "media-free-content")
+PILATES_MIRROR_TAXONOMIES = ("pilates-features", "studio_name", "categories", "tags")
+
+# ミラーの差分同期設定
+WP_SYNC_SWEEP_INTERVAL = 3600.0  # 削除・ステータス変更を検出する全件照合（id・status・modified_gmtのみ）の間隔（秒）
+WP_SYNC_OVERLAP = 60.0           # modified_after をさかのぼる秒数（同じ秒内の更新を取りこぼさないため）
+WP_SYNC_GMT_OVERLAP = 14 * 3600.0  # サイト時刻が不明でGMTから問い合わせる場合にさかのぼる秒数（タイムゾーン差を吸収）
+MIRROR_SWEEP_FIELDS = ("id", "status", "modified_gmt")
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 認証ヘッダーを生成（WordPress REST API用）
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def get_auth_headers():
+def _build_auth_headers() -> dict:
     """
     WordPress REST API用のBasic認証ヘッダーを生成
     参考: https://developer.wordpress.org/rest-api/using-the-rest-api/authentication/
@@ -50,10 +149,93 @@ def get_auth_headers():
         "Content-Type": "application/json"
     }
 
+
+# 起動時に1度だけ生成しておく
+_AUTH_HEADERS = _build_auth_headers()
+
+
+def get_auth_headers():
+    """
+    WordPress REST API用の認証ヘッダーを返す（事前生成済みのコピー）
+    """
+    return dict(_AUTH_HEADERS)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 共有HTTPクライアント
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    プロセス全体で共有するHTTPクライアントを返す。
+    ツール呼び出しごとのTCP/TLSハンドシェイクを避けるため、接続はkeep-aliveで再利用する。
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            headers=_AUTH_HEADERS,
+            timeout=WP_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=WP_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=WP_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=WP_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        logger.debug("Shared HTTP client created")
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """共有HTTPクライアントを閉じる（シャットダウン時）"""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+        logger.debug("Shared HTTP client closed")
+    _http_client = None
+
+
+# 現在のツール呼び出しのリクエスト優先度（asyncio.gatherで作ったタスクにも引き継がれる）
+_request_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "_request_priority", default=WP_PRIORITY_NORMAL
+)
+
+
+@asynccontextmanager
+async def _wp_client(priority: int | None = None):
+    """
+    共有HTTPクライアントを `async with` で受け取るためのラッパー。
+    ブロックを抜けてもクライアントは閉じない。
+    priority を指定すると、ブロック内のリクエストをその優先度で送信する。
+    """
+    token = _request_priority.set(priority) if priority is not None else None
+    try:
+        yield get_http_client()
+    finally:
+        if token is not None:
+            _request_priority.reset(token)
+
+
+@asynccontextmanager
+async def _server_lifespan(server: FastMCP):
+    """サーバー起動時に共有クライアントを作成し、終了時に閉じる"""
+    get_http_client()
+    # ローカルミラーが古ければバックグラウンドで同期を開始する
+    for post_type in PILATES_MIRROR_POST_TYPES:
+        if PILATES_MIRROR_ENABLED and not _mirror_is_fresh(post_type):
+            _mirror_schedule_refresh(post_type)
+    try:
+        yield {}
+    finally:
+        await _mirror_cancel_refreshes()
+        await _index_snapshot_cancel()
+        await close_http_client()
+        _mirror_close()
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # MCPサーバー作成
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-mcp = FastMCP("pilates-mcp-server")
+mcp = FastMCP("pilates-mcp-server", lifespan=_server_lifespan)
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ヘルパー関数
@@ -86,6 +268,729 @@ def _build_status_param(arg: str | None = None) -> str:
     return ",".join(ordered_unique)
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 同時接続数・レート制限（優先度付き）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ホストごとに同時接続数の上限（優先度付きセマフォ）とトークンバケットを持つ。
+# 空きを待つリクエストは優先度順（同じ優先度なら到着順）に送信される。
+_limiters: dict[str, dict] = {}
+
+
+def _limiter(host: str) -> dict:
+    """ホストのリミッター状態を返す（なければ作成）"""
+    return _limiters.setdefault(host, {
+        "active": 0,
+        "waiters": [],  # (優先度, 到着順, Future) のヒープ
+        "seq": 0,
+        "tokens": float(WP_RATE_LIMIT_BURST),
+        "refilled_at": time.monotonic(),
+    })
+
+
+def _limiter_release(host: str) -> None:
+    """枠を解放し、待っている中で最も優先度の高いリクエストに渡す"""
+    limiter = _limiter(host)
+    while limiter["waiters"]:
+        _, _, waiter = heapq.heappop(limiter["waiters"])
+        if not waiter.done():
+            # 枠は解放せずにそのまま引き渡す
+            waiter.set_result(None)
+            return
+    limiter["active"] -= 1
+
+
+async def _limiter_acquire(host: str, priority: int) -> None:
+    """同時接続枠を確保し、トークンバケットから1トークン消費する"""
+    limiter = _limiter(host)
+    if limiter["active"] < WP_MAX_CONCURRENT_REQUESTS and not limiter["waiters"]:
+        limiter["active"] += 1
+    else:
+        waiter = asyncio.get_running_loop().create_future()
+        limiter["seq"] += 1
+        heapq.heappush(limiter["waiters"], (priority, limiter["seq"], waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 枠を受け取った直後にキャンセルされた場合は次に回す
+                _limiter_release(host)
+            raise
+    
+    try:
+        while True:
+            now = time.monotonic()
+            limiter["tokens"] = min(
+                float(WP_RATE_LIMIT_BURST),
+                limiter["tokens"] + (now - limiter["refilled_at"]) * WP_RATE_LIMIT_PER_SECOND,
+            )
+            limiter["refilled_at"] = now
+            if limiter["tokens"] >= 1:
+                limiter["tokens"] -= 1
+                return
+            await asyncio.sleep((1 - limiter["tokens"]) / WP_RATE_LIMIT_PER_SECOND)
+    except BaseException:
+        _limiter_release(host)
+        raise
+
+
+@asynccontextmanager
+async def _wp_limiter(host: str):
+    """リクエスト1回分の送信枠を確保する（優先度は現在のコンテキストから取得）"""
+    await _limiter_acquire(host, _request_priority.get())
+    try:
+        yield
+    finally:
+        _limiter_release(host)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# リトライ・サーキットブレーカー
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ホストごとの状態: closed（通常）→ open（即時エラー）→ half_open（1件だけ試行）
+_circuits: dict[str, dict] = {}
+
+
+def _circuit(host: str) -> dict:
+    """ホストのサーキット状態を返す（なければ作成）"""
+    return _circuits.setdefault(host, {
+        "state": "closed",
+        "failures": 0,          # 連続失敗回数
+        "opened_at": 0.0,
+        "probe_in_flight": False,
+        "total_failures": 0,
+        "total_retries": 0,
+        "total_rejected": 0,
+        "last_error": "",
+    })
+
+
+def _circuit_before_request(host: str) -> bool:
+    """
+    リクエスト前にサーキットを確認する。
+    ハーフオープンの試行リクエストとして通した場合は True を返す。
+    
+    Raises:
+        RuntimeError: サーキットがオープン中（または試行中）の場合
+    """
+    circuit = _circuit(host)
+    if circuit["state"] == "open":
+        remaining = WP_CIRCUIT_RESET_TIMEOUT - (time.monotonic() - circuit["opened_at"])
+        if remaining > 0:
+            circuit["total_rejected"] += 1
+            raise RuntimeError(
+                f"WordPress（{host}）への接続を一時停止しています（直近のエラー: {circuit['last_error']}）。"
+                f"約{int(remaining) + 1}秒後に再試行してください。"
+            )
+        circuit["state"] = "half_open"
+        logger.info(f"Circuit half-open: {host}")
+    if circuit["state"] == "half_open":
+        if circuit["probe_in_flight"]:
+            circuit["total_rejected"] += 1
+            raise RuntimeError(f"WordPress（{host}）の復旧を確認中です。しばらくしてから再試行してください。")
+        circuit["probe_in_flight"] = True
+        return True
+    return False
+
+
+def _circuit_record_success(host: str) -> None:
+    circuit = _circuit(host)
+    if circuit["state"] != "closed":
+        logger.info(f"Circuit closed: {host}")
+    circuit["state"] = "closed"
+    circuit["failures"] = 0
+    circuit["probe_in_flight"] = False
+
+
+def _circuit_record_failure(host: str, error: str) -> None:
+    circuit = _circuit(host)
+    circuit["failures"] += 1
+    circuit["total_failures"] += 1
+    circuit["last_error"] = error
+    circuit["probe_in_flight"] = False
+    if circuit["state"] == "half_open" or circuit["failures"] >= WP_CIRCUIT_FAILURE_THRESHOLD:
+        if circuit["state"] != "open":
+            logger.warning(f"Circuit opened: {host} ({circuit['failures']} consecutive failures, last: {error})")
+        circuit["state"] = "open"
+        circuit["opened_at"] = time.monotonic()
+
+
+def _retry_delay(attempt: int, response: httpx.Response | None) -> float | None:
+    """
+    次のリトライまでの待ち時間を返す（待たずに諦める場合はNone）。
+    Retry-Afterがあればそれに従い、なければジッター付き指数バックオフ。
+    """
+    backoff = random.uniform(0, min(WP_RETRY_MAX_DELAY, WP_RETRY_BASE_DELAY * (2 ** (attempt - 1))))
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if not retry_after:
+        return backoff
+    try:
+        seconds = float(retry_after)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return backoff
+    if seconds > WP_RETRY_AFTER_MAX:
+        return None
+    return max(seconds, 0.0)
+
+
+async def _wp_send(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    retry: bool = False,
+    **kwargs,
+) -> httpx.Response:
+    """
+    WordPressへのすべてのリクエストの送信口。
+    ホスト単位の同時接続数・レート制限（優先度順）とサーキットブレーカーを通し、retry=True（冪等なGET）の場合は
+    タイムアウト・接続エラー・429/5xx をジッター付き指数バックオフでリトライする。
+    
+    Raises:
+        RuntimeError: サーキットがオープン中の場合
+        httpx.TransportError: リトライしても接続できなかった場合
+    """
+    host = httpx.URL(url).host
+    attempts = WP_RETRY_MAX_ATTEMPTS if retry else 1
+    
+    attempt = 0
+    while True:
+        attempt += 1
+        probe = _circuit_before_request(host)
+        try:
+            async with _wp_limiter(host):
+                response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as exc:
+            _circuit_record_failure(host, f"{type(exc).__name__}: {exc}")
+            if attempt >= attempts:
+                raise
+            delay = _retry_delay(attempt, None)
+        except BaseException:
+            # キャンセル等。ハーフオープンの試行枠だけ解放する
+            if probe:
+                _circuit(host)["probe_in_flight"] = False
+            raise
+        else:
+            if response.status_code not in WP_RETRY_STATUSES:
+                _circuit_record_success(host)
+                return response
+            if response.status_code >= 500:
+                _circuit_record_failure(host, f"HTTP {response.status_code}")
+            elif probe:
+                _circuit(host)["probe_in_flight"] = False
+            if attempt >= attempts:
+                return response
+            delay = _retry_delay(attempt, response)
+            if delay is None:
+                return response
+        
+        _circuit(host)["total_retries"] += 1
+        logger.warning(f"{method} {url} failed (attempt {attempt}/{attempts}). Retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 単一投稿GETのキャッシュ
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# キー: (投稿タイプ, 投稿ID, context) / 値: (レスポンス, サイズ, 記録時刻, 検証子)
+# 古い順に並べ、上限を超えたら先頭から追い出す（LRU）
+# TTL切れのエントリは検証子（ETag / Last-Modified）を使った条件付きGETで再検証し、
+# 304 Not Modified ならそのまま再利用する
+_post_cache: OrderedDict[tuple[str, int, str], tuple[httpx.Response, int, float, dict]] = OrderedDict()
+_post_cache_bytes = 0
+# 投稿ごとの更新世代（書き込みのたびに進める）。取得中に更新された古い内容をキャッシュしないために使う
+_post_cache_generation: dict[tuple[str, int], int] = {}
+
+
+def _post_cache_key(path: str, params: dict | None) -> tuple[str, int, str] | None:
+    """
+    単一投稿のGETならキャッシュキーを返す（それ以外はNone）。
+    例: ("pilates-studio/123", {"context": "edit"}) -> ("pilates-studio", 123, "edit")
+    """
+    parts = [part for part in path.strip("/").split("/") if part]
+    if len(parts) != 2 or not parts[1].isdigit():
+        return None
+    params = params or {}
+    if set(params) - {"context"}:
+        return None
+    return parts[0], int(parts[1]), str(params.get("context", "view"))
+
+
+def _response_validators(response: httpx.Response) -> dict:
+    """
+    条件付きGET用の検証子を取り出す。
+    ETag / Last-Modified ヘッダーがなければ、投稿の modified_gmt から Last-Modified を作る。
+    """
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["If-None-Match"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = response.headers["Last-Modified"]
+    else:
+        try:
+            modified_gmt = response.json().get('modified_gmt')
+            if modified_gmt:
+                modified = datetime.fromisoformat(modified_gmt).replace(tzinfo=timezone.utc)
+                validators["If-Modified-Since"] = format_datetime(modified, usegmt=True)
+        except (ValueError, AttributeError):
+            pass
+    return validators
+
+
+def _post_cache_get(key: tuple[str, int, str]) -> httpx.Response | None:
+    """キャッシュを参照（TTL内のエントリのみ返す）"""
+    entry = _post_cache.get(key)
+    if entry is None:
+        return None
+    response, _, stored_at, _ = entry
+    if time.monotonic() - stored_at > WP_POST_CACHE_TTL:
+        return None
+    _post_cache.move_to_end(key)
+    logger.debug(f"Post cache hit: {key}")
+    return response
+
+
+def _post_cache_get_stale(key: tuple[str, int, str]) -> tuple[httpx.Response, dict] | None:
+    """
+    TTL切れで再検証が必要なエントリを (レスポンス, 検証子) で返す。
+    検証子がない、または保持期間を過ぎたエントリは削除してNoneを返す。
+    """
+    global _post_cache_bytes
+    entry = _post_cache.get(key)
+    if entry is None:
+        return None
+    response, size, stored_at, validators = entry
+    if not validators or time.monotonic() - stored_at > WP_POST_CACHE_REVALIDATE_TTL:
+        del _post_cache[key]
+        _post_cache_bytes -= size
+        return None
+    return response, validators
+
+
+def _post_cache_touch(key: tuple[str, int, str]) -> None:
+    """304 Not Modified を受け取ったエントリの記録時刻を更新"""
+    entry = _post_cache.get(key)
+    if entry is not None:
+        response, size, _, validators = entry
+        _post_cache[key] = (response, size, time.monotonic(), validators)
+        _post_cache.move_to_end(key)
+
+
+def _post_cache_put(key: tuple[str, int, str], response: httpx.Response) -> None:
+    """レスポンスをキャッシュに保存し、件数・バイト数の上限を超えた分を追い出す"""
+    global _post_cache_bytes
+    size = len(response.content)
+    if size > WP_POST_CACHE_MAX_BYTES:
+        return
+    old = _post_cache.pop(key, None)
+    if old is not None:
+        _post_cache_bytes -= old[1]
+    _post_cache[key] = (response, size, time.monotonic(), _response_validators(response))
+    _post_cache_bytes += size
+    while _post_cache and (
+        len(_post_cache) > WP_POST_CACHE_MAX_ENTRIES or _post_cache_bytes > WP_POST_CACHE_MAX_BYTES
+    ):
+        _, (_, evicted_size, _, _) = _post_cache.popitem(last=False)
+        _post_cache_bytes -= evicted_size
+
+
+def _post_cache_invalidate(post_type: str, post_id: int) -> None:
+    """指定した投稿のキャッシュをすべてのcontextについて削除"""
+    global _post_cache_bytes
+    _post_cache_generation[(post_type, post_id)] = _post_cache_generation.get((post_type, post_id), 0) + 1
+    # 書き込み前に始まった実行中のGETには、以降のリクエストを合流させない
+    for key in [k for k in _inflight_gets if k[0] == f"{post_type}/{post_id}"]:
+        _inflight_gets.pop(key, None)
+    for key in [k for k in _post_cache if k[0] == post_type and k[1] == post_id]:
+        _post_cache_bytes -= _post_cache.pop(key)[1]
+        logger.debug(f"Post cache invalidated: {key}")
+
+
+def _post_cache_invalidate_path(path: str) -> None:
+    """書き込み先のパス（例: "pilates-studio/123"）に対応するキャッシュを削除"""
+    key = _post_cache_key(path, None)
+    if key is not None:
+        _post_cache_invalidate(key[0], key[1])
+
+
+# 実行中のGET（同一リクエストの同時実行を1回の通信にまとめる）
+# キー: (パス, 正規化したパラメータ)
+_inflight_gets: dict[tuple[str, tuple[tuple[str, str], ...]], asyncio.Future] = {}
+
+
+def _inflight_key(path: str, params: dict | None) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """パスとパラメータから実行中GETのキーを作る（パラメータの順序は無視）"""
+    normalized = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return path.strip("/"), normalized
+
+
+async def _wp_get(
+    client: httpx.AsyncClient,
+    path: str,
+    params: dict | None = None,
+) -> httpx.Response:
+    """
+    WordPress REST APIにGETリクエストを送信する。
+    単一投稿の取得（"{投稿タイプ}/{ID}"）は成功レスポンスをキャッシュし、各ツールで共有する。
+    同じパス・パラメータのGETが実行中であれば、新たに送信せずその結果を共有する。
+    TTL切れのキャッシュは条件付きGETで再検証し、304なら本文をダウンロードせず再利用する。
+    """
+    cache_key = _post_cache_key(path, params)
+    if cache_key is not None:
+        cached = _post_cache_get(cache_key)
+        if cached is not None:
+            return cached
+    
+    flight_key = _inflight_key(path, params)
+    inflight = _inflight_gets.get(flight_key)
+    if inflight is not None:
+        logger.debug(f"Joining in-flight GET: {flight_key}")
+        # 待っている側がキャンセルされても、共有中のリクエストは止めない
+        return await asyncio.shield(inflight)
+    
+    generation = _post_cache_generation.get(cache_key[:2]) if cache_key is not None else None
+    stale = _post_cache_get_stale(cache_key) if cache_key is not None else None
+    
+    async def fetch() -> httpx.Response:
+        headers = get_auth_headers()
+        if stale is not None:
+            # 前回の検証子を付けて条件付きGET
+            headers.update(stale[1])
+        response = await _wp_send(
+            client,
+            "GET",
+            f"{WP_SITE_URL}/wp-json/wp/v2/{path.lstrip('/')}",
+            retry=True,
+            params=params or {},
+            headers=headers,
+            timeout=30.0
+        )
+        if response.status_code == 304 and stale is not None:
+            logger.debug(f"Post cache revalidated (304): {cache_key}")
+            _post_cache_touch(cache_key)
+            return stale[0]
+        return response
+    
+    task = asyncio.ensure_future(fetch())
+    _inflight_gets[flight_key] = task
+    task.add_done_callback(
+        lambda done: _inflight_gets.pop(flight_key, None) if _inflight_gets.get(flight_key) is done else None
+    )
+    response = await asyncio.shield(task)
+    
+    # 取得中に同じ投稿が更新された場合は、古い内容なのでキャッシュしない
+    if (
+        cache_key is not None
+        and response.status_code == 200
+        and (stale is None or response is not stale[0])
+        and _post_cache_generation.get(cache_key[:2]) == generation
+    ):
+        _post_cache_put(cache_key, response)
+    return response
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# context=edit 権限キャッシュ
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# エンドポイントごとに「context=editが使えるか」を記録する。
+# 値: (使用可否, 記録時刻)
+_edit_context_capability: dict[str, tuple[bool, float]] = {}
+
+
+def _is_permission_error(response: httpx.Response) -> bool:
+    """context=edit 使用時の権限エラーかどうかを判定"""
+    if response.status_code in (401, 403):
+        return True
+    return response.status_code != 200 and ("権限" in str(response.text) or "rest_forbidden" in str(response.text))
+
+
+def _edit_context_endpoint_key(path: str) -> str:
+    """
+    パスをエンドポイント単位のキーに変換する。
+    例: "pilates-studio/123" -> "pilates-studio/{id}"
+    """
+    parts = [part for part in path.strip("/").split("/") if part]
+    return "/".join("{id}" if part.isdigit() else part for part in parts)
+
+
+def _get_edit_context_capability(key: str) -> bool | None:
+    """キャッシュ済みの使用可否を返す（未確認・期限切れの場合はNone）"""
+    entry = _edit_context_capability.get(key)
+    if entry is None:
+        return None
+    allowed, recorded_at = entry
+    if time.monotonic() - recorded_at > WP_EDIT_CONTEXT_CACHE_TTL:
+        _edit_context_capability.pop(key, None)
+        return None
+    return allowed
+
+
+def _set_edit_context_capability(key: str, allowed: bool) -> None:
+    """使用可否を記録"""
+    if _edit_context_capability.get(key, (None,))[0] != allowed:
+        logger.info(f"context=edit capability for {key}: {'allowed' if allowed else 'forbidden'}")
+    _edit_context_capability[key] = (allowed, time.monotonic())
+
+
+async def _wp_get_edit_context(
+    client: httpx.AsyncClient,
+    path: str,
+    params: dict | None = None,
+) -> httpx.Response:
+    """
+    context=edit付きでGETする。権限エラーの場合はcontext/statusなしで再試行する。
+    結果はエンドポイント単位でキャッシュし、権限がないと分かっている場合は
+    最初からcontext=editなしで送信して往復を1回に抑える。
+    認証エラー（401/403）が返った場合はキャッシュを破棄し、次回に再判定する。
+    """
+    key = _edit_context_endpoint_key(path)
+    edit_params = dict(params or {})
+    edit_params["context"] = "edit"
+    public_params = {k: v for k, v in edit_params.items() if k not in ("context", "status")}
+    
+    allowed = _get_edit_context_capability(key)
+    
+    if allowed is not False:
+        response = await _wp_get(client, path, edit_params)
+        logger.debug(f"Response status: {response.status_code} ({key}, context=edit)")
+        
+        if not _is_permission_error(response):
+            if response.status_code == 200:
+                _set_edit_context_capability(key, True)
+            return response
+        
+        # 権限エラーの場合はcontext=editを削除して再試行
+        try:
+            error_data = response.json() if response.text else {}
+            logger.warning(f"権限エラー詳細: {error_data}")
+        except Exception:
+            logger.warning(f"権限エラーレスポンス: {response.text[:200] if response.text else 'No response body'}")
+        logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
+        _set_edit_context_capability(key, False)
+    
+    # 権限がない場合は公開済みのみ取得（statusパラメータも削除）
+    response = await _wp_get(client, path, public_params)
+    logger.debug(f"Response status: {response.status_code} ({key})")
+    
+    if response.status_code in (401, 403):
+        # 認証情報そのもののエラー。次回はcontext=editから再判定する
+        _edit_context_capability.pop(key, None)
+    
+    return response
+
+
+# _fields= による絞り込みが効かない（必要なフィールドが返らない）エンドポイント
+_fields_projection_unsupported: set[str] = set()
+# 絞り込みなしで確かめても、表示するカスタムフィールドがどの投稿にもなかった (エンドポイント, キー) → 記録時刻
+# WP_EDIT_CONTEXT_CACHE_TTL の間は確認用の取得を省く
+_fields_custom_fields_absent: dict[tuple[str, tuple[str, ...]], float] = {}
+
+
+async def _wp_get_projected(
+    client: httpx.AsyncClient,
+    path: str,
+    params: dict | None,
+    fields: tuple[str, ...],
+    custom_field_keys: tuple[str, ...] = (),
+) -> httpx.Response:
+    """
+    _fields= で表示に使うフィールドだけを取得する（context=edit のフォールバック付き）。
+    custom_field_keys を指定した場合は、custom_fields / meta / ルートのそのキーも合わせて取得する。
+    プラグインの都合で宣言したフィールドやカスタムフィールドが欠けて返ってきた場合は、絞り込みなしで
+    取得し直し、以降そのエンドポイントでは絞り込みを使わない。
+    絞り込みなしでもカスタムフィールドがなかった場合はそれを記録し、一定時間は取得し直さない。
+    """
+    key = _edit_context_endpoint_key(path)
+    if key in _fields_projection_unsupported:
+        return await _wp_get_edit_context(client, path, params)
+    
+    request_fields = fields + (("custom_fields", "meta") + custom_field_keys if custom_field_keys else ())
+    response = await _wp_get_edit_context(client, path, {**(params or {}), "_fields": ",".join(request_fields)})
+    if response.status_code != 200:
+        return response
+    
+    def has_custom_fields(posts: list) -> bool:
+        return any(
+            key in _get_custom_fields_from_post(post)
+            for post in posts if isinstance(post, dict)
+            for key in custom_field_keys
+        )
+    
+    # どの投稿にも含まれないフィールドがあれば、絞り込みで落とされたと判断する
+    items = response.json()
+    if not isinstance(items, list) or not items:
+        return response
+    if any(all(field not in item for item in items) for field in fields):
+        logger.warning(f"_fields projection incomplete for {key}. Falling back to full payload.")
+        _fields_projection_unsupported.add(key)
+        return await _wp_get_edit_context(client, path, params)
+    
+    if custom_field_keys and not has_custom_fields(items):
+        absent_key = (key, custom_field_keys)
+        recorded_at = _fields_custom_fields_absent.get(absent_key)
+        if recorded_at is not None and time.monotonic() - recorded_at <= WP_EDIT_CONTEXT_CACHE_TTL:
+            return response
+        # 表示するカスタムフィールドがどの投稿にもない。絞り込みで落ちたのか、元々ないのかを全体で確かめる
+        full = await _wp_get_edit_context(client, path, params)
+        if full.status_code == 200 and isinstance(full.json(), list):
+            if has_custom_fields(full.json()):
+                logger.warning(f"_fields projection dropped custom fields for {key}. Falling back to full payload.")
+                _fields_projection_unsupported.add(key)
+                _fields_custom_fields_absent.pop(absent_key, None)
+            else:
+                _fields_custom_fields_absent[absent_key] = time.monotonic()
+        return full
+    return response
+
+
+def _wp_error_message(response: httpx.Response) -> str:
+    """エラーレスポンスからメッセージを取り出す"""
+    try:
+        error_data = response.json() if response.text else {}
+    except ValueError:
+        error_data = {}
+    if isinstance(error_data, dict) and error_data.get('message'):
+        return str(error_data['message'])
+    return f"HTTPステータス {response.status_code}"
+
+
+async def _wp_iter_collection_pages(
+    client: httpx.AsyncClient,
+    path: str,
+    params: dict | None = None,
+    *,
+    concurrency: int = WP_PAGE_FETCH_CONCURRENCY,
+    edit_context: bool = True,
+    fields: tuple[str, ...] | None = None,
+    custom_field_keys: tuple[str, ...] = (),
+):
+    """
+    コレクションを全ページ取得する非同期ジェネレーター（ページ単位で投稿リストを返す）。
+    1ページ目の X-WP-TotalPages を読み、残りのページは concurrency 件ずつ並列に取得する。
+    ページは順番通りに返す。呼び出し側がループを抜ければ、以降のページは取得しない。
+    edit_context=False の場合は context=edit を付けずに取得する（カテゴリー等）。
+    fields を指定した場合は _fields= でフィールドを絞り込む（edit_context=True のみ）。
+    custom_field_keys は _wp_get_projected と同じ（絞り込み時にも取得するカスタムフィールド）。
+    
+    Raises:
+        RuntimeError: 1ページ目の取得に失敗した場合、またはレスポンスが配列でない場合
+    """
+    page_params = dict(params or {})
+    page_params.setdefault("per_page", WP_PAGE_SIZE)
+    page_params["page"] = 1
+    if edit_context and fields:
+        async def get(client, path, params):
+            return await _wp_get_projected(client, path, params, fields, custom_field_keys)
+    else:
+        get = _wp_get_edit_context if edit_context else _wp_get
+    
+    first = await get(client, path, page_params)
+    if first.status_code != 200:
+        logger.error(f"API Error: {first.status_code} - {first.text[:200]}")
+        raise RuntimeError(_wp_error_message(first))
+    
+    items = first.json()
+    if not isinstance(items, list):
+        logger.error(f"Unexpected response format: {type(items)}")
+        raise RuntimeError("予期しないレスポンス形式です")
+    
+    try:
+        total_pages = int(first.headers.get("X-WP-TotalPages", "1"))
+    except ValueError:
+        total_pages = 1
+    logger.debug(
+        f"{path}: X-WP-Total={first.headers.get('X-WP-Total', '?')}, X-WP-TotalPages={total_pages}"
+    )
+    yield items
+    
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    
+    async def fetch_page(page: int) -> list:
+        async with semaphore:
+            response = await get(client, path, {**page_params, "page": page})
+        if response.status_code == 400:
+            # ページ数が途中で減った場合（rest_post_invalid_page_number）
+            return []
+        if response.status_code != 200:
+            raise RuntimeError(_wp_error_message(response))
+        data = response.json()
+        return data if isinstance(data, list) else []
+    
+    # concurrency 件ずつのウィンドウで取得し、ウィンドウ間で早期終了できるようにする
+    window = max(concurrency, 1)
+    for start in range(2, total_pages + 1, window):
+        pages = range(start, min(start + window, total_pages + 1))
+        results = await asyncio.gather(*(fetch_page(page) for page in pages))
+        for page_items in results:
+            yield page_items
+
+
+async def _wp_get_posts_by_ids(
+    client: httpx.AsyncClient,
+    post_type: str,
+    post_ids: list[int],
+    *,
+    use_cache: bool = True,
+) -> dict[int, dict]:
+    """
+    投稿をIDの一覧でまとめて取得する（投稿ID → 投稿オブジェクト）。
+    use_cache=True の場合、単一投稿キャッシュにあるものは再利用し、取得した投稿もキャッシュに保存する
+    （以降の単一投稿GETで再取得しないため）。
+    残りは include= で WP_PAGE_SIZE 件ずつに分け、チャンクを並列に取得する。
+    見つからなかったID（削除済み・対象外のステータス）は結果に含まれない。
+    
+    Raises:
+        RuntimeError: 取得に失敗した場合
+    """
+    posts: dict[int, dict] = {}
+    missing = []
+    for post_id in post_ids:
+        cached = None
+        if use_cache:
+            for context in ("edit", "view"):
+                cached = _post_cache_get((post_type, post_id, context))
+                if cached is not None:
+                    break
+        if cached is not None:
+            posts[post_id] = cached.json()
+        else:
+            missing.append(post_id)
+    # 取得中に更新された投稿は古い内容なのでキャッシュしない（_wp_get と同じ）
+    generations = {post_id: _post_cache_generation.get((post_type, post_id)) for post_id in missing}
+    
+    async def fetch_chunk(chunk: list[int]) -> tuple[list, str]:
+        params = {
+            "include": ",".join(str(post_id) for post_id in chunk),
+            "per_page": len(chunk),
+            "context": "edit",
+            "status": ",".join(ALLOWED_STATUSES),
+        }
+        response = await _wp_get_edit_context(client, post_type, params)
+        if response.status_code != 200:
+            raise RuntimeError(_wp_error_message(response))
+        data = response.json()
+        if not isinstance(data, list):
+            raise RuntimeError("予期しないレスポンス形式です")
+        # 権限がなく context=edit なしで取得した場合は view としてキャッシュする
+        context = "edit" if response.request.url.params.get("context") == "edit" else "view"
+        return data, context
+    
+    chunks = [missing[start:start + WP_PAGE_SIZE] for start in range(0, len(missing), WP_PAGE_SIZE)]
+    for page_posts, context in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+        for post in page_posts:
+            if isinstance(post, dict) and 'id' in post:
+                post_id = int(post['id'])
+                posts[post_id] = post
+                if use_cache and post_id in generations and (
+                    _post_cache_generation.get((post_type, post_id)) == generations[post_id]
+                ):
+                    _post_cache_put((post_type, post_id, context), httpx.Response(200, json=post))
+    logger.debug(f"{post_type}: {len(post_ids) - len(missing)} cached, {len(missing)} fetched in {len(chunks)} chunks")
+    return posts
+
+
 def _get_custom_fields_from_post(post_data: dict) -> dict:
     """
     投稿データからカスタムフィールドを取得する。
@@ -143,48 +1048,1693 @@ def _get_custom_fields_from_post(post_data: dict) -> dict:
         'rendered', 'protected', 'raw'
     }
     
-    # ルートレベルからカスタムフィールドを抽出
-    for key, value in post_data.items():
-        # 標準キーでなく、既知のカスタムフィールド名と一致する場合
-        if key not in standard_keys and (key in known_custom_fields or not key.startswith('_')):
-            # まだresultに含まれていない場合のみ追加
-            if key not in result:
-                result[key] = value
-                logger.debug(f"Found custom field at root level: {key}")
+    # ルートレベルからカスタムフィールドを抽出
+    for key, value in post_data.items():
+        # 標準キーでなく、既知のカスタムフィールド名と一致する場合
+        if key not in standard_keys and (key in known_custom_fields or not key.startswith('_')):
+            # まだresultに含まれていない場合のみ追加
+            if key not in result:
+                result[key] = value
+                logger.debug(f"Found custom field at root level: {key}")
+    
+    if result:
+        logger.debug(f"Total custom fields found: {len(result)}")
+        return result
+    
+    # どちらも存在しない場合
+    logger.debug("No custom_fields or meta found in post data")
+    logger.debug(f"Available keys in post data: {list(post_data.keys())}")
+    return {}
+
+
+def _post_missing_detail_fields(post: dict, require_custom_fields: bool) -> bool:
+    """
+    一覧・検索結果の投稿オブジェクトに、詳細表示に必要な項目が欠けているかを判定する。
+    （_fields で絞り込まれた場合や、プラグインが一覧にメタを含めない場合など）
+    """
+    if not isinstance(post.get('title'), dict) or 'rendered' not in post['title']:
+        return True
+    if 'link' not in post or 'content' not in post:
+        return True
+    if require_custom_fields and not _get_custom_fields_from_post(post):
+        return True
+    return False
+
+
+def _format_fields_for_display(fields: dict, include_internal: bool = False) -> str:
+    """
+    カスタムフィールドを表示用にフォーマットする。
+    完全な構造（ネストされた配列など）を保持する。
+    """
+    if not fields:
+        return "カスタムフィールドが見つかりませんでした。"
+    
+    result = "【カスタムフィールド（完全な構造）】\n\n"
+    
+    for key, value in fields.items():
+        if not include_internal and key.startswith('_'):
+            continue
+        
+        # 完全な構造をJSON形式で表示
+        try:
+            formatted_value = json.dumps(value, ensure_ascii=False, indent=2)
+            result += f"{key}:\n{formatted_value}\n\n"
+        except Exception as e:
+            # JSON化できない場合は文字列として表示
+            result += f"{key}: {str(value)}\n\n"
+    
+    return result
+
+def _format_studio_by_id(store: dict) -> str:
+    """pilates-studio 投稿を pilates_by_id の形式（全カスタムフィールド）で表示用にフォーマットする"""
+    status_emoji = get_status_emoji(store.get('status', ''))
+    result = f"━━━━━━━━━━━━━━━━━━━━\n"
+    result += f"{status_emoji} {store['title']['rendered']}\n"
+    result += f"🆔 ID: {store['id']} | ステータス: {store.get('status', '不明')}\n"
+    result += f"━━━━━━━━━━━━━━━━━━━━\n\n"
+    
+    # カスタムフィールドをすべて表示（完全な構造）
+    fields = _get_custom_fields_from_post(store)
+    if fields:
+        result += _format_fields_for_display(fields, include_internal=False)
+    else:
+        result += "【カスタムフィールド】\n\n"
+        result += "カスタムフィールドが見つかりませんでした。\n"
+        result += f"利用可能なキー: {', '.join(store.keys())}\n"
+    
+    result += f"\n🔗 {store['link']}\n"
+    
+    return result
+
+
+def _format_media_free_content_by_id(post: dict) -> str:
+    """media-free-content 投稿を media_free_content_by_id の形式（本文・全カスタムフィールド）で表示用にフォーマットする"""
+    status_emoji = get_status_emoji(post.get('status', ''))
+    result = f"━━━━━━━━━━━━━━━━━━━━\n"
+    result += f"{status_emoji} {post['title']['rendered']}\n"
+    result += f"🆔 ID: {post['id']} | ステータス: {post.get('status', '不明')}\n"
+    result += f"📅 公開日: {post.get('date', 'N/A')} | 最終更新: {post.get('modified', 'N/A')}\n"
+    result += f"━━━━━━━━━━━━━━━━━━━━\n\n"
+    
+    # 本文（完全なHTMLを含む）
+    result += "━━━ 📝 本文 ━━━\n\n"
+    # content.raw（編集用の生のコンテンツ）があればそれを使用、なければrenderedを使用
+    if post.get('content', {}).get('raw'):
+        content = post['content']['raw']
+        result += f"{content}\n\n"
+    elif post.get('content', {}).get('rendered'):
+        content = post['content']['rendered']
+        result += f"{content}\n\n"
+    else:
+        result += "本文が見つかりませんでした。\n\n"
+    
+    # カスタムフィールドをすべて表示（完全な構造）
+    fields = _get_custom_fields_from_post(post)
+    if fields:
+        result += _format_fields_for_display(fields, include_internal=False)
+    else:
+        result += "【カスタムフィールド】\n\n"
+        result += "カスタムフィールドが見つかりませんでした。\n"
+        result += f"利用可能なキー: {', '.join(post.keys())}\n"
+    
+    result += f"\n🔗 {post['link']}\n"
+    
+    return result
+
+
+def _format_post_by_id(post: dict) -> str:
+    """通常投稿（posts）を表示用にフォーマットする（本文は冒頭のみ）"""
+    status_emoji = get_status_emoji(post.get('status', ''))
+    result = f"━━━━━━━━━━━━━━━━━━━━\n"
+    result += f"{status_emoji} {post['title']['rendered']}\n"
+    result += f"🆔 ID: {post['id']} | ステータス: {post.get('status', '不明')}\n"
+    result += f"📅 公開日: {post.get('date', 'N/A')} | 最終更新: {post.get('modified', 'N/A')}\n"
+    result += f"━━━━━━━━━━━━━━━━━━━━\n\n"
+    
+    if post.get('categories'):
+        result += f"🏷️ カテゴリーID: {', '.join(str(cat_id) for cat_id in post['categories'])}\n"
+    
+    if post.get('content', {}).get('rendered'):
+        content = re.sub('<[^<]+?>', '', post['content']['rendered'])
+        result += f"📝 本文:\n{content.strip()[:300]}...\n"
+    
+    result += f"\n🔗 {post.get('link', 'N/A')}\n"
+    
+    return result
+
+
+def _format_posts_by_ids(post_ids: list[int], posts: dict[int, dict], formatter, label: str) -> str:
+    """まとめて取得した投稿を、指定されたIDの順番で1つの結果にする"""
+    found = sum(1 for post_id in post_ids if post_id in posts)
+    result = f"📚 {found}/{len(post_ids)}件の{label}を取得しました\n\n"
+    
+    for post_id in post_ids:
+        post = posts.get(post_id)
+        if post is None:
+            result += f"❌ ID {post_id} の{label}が見つかりませんでした。\n\n"
+            continue
+        if 'title' not in post or 'rendered' not in post.get('title', {}):
+            result += f"❌ ID {post_id} のデータ形式が正しくありません。\n\n"
+            continue
+        result += formatter(post) + "\n"
+    
+    return result
+
+
+def _parse_post_id_list(raw: str) -> tuple[list[int], str | None]:
+    """カンマ区切りの投稿IDを重複を除いて入力順のリストにする"""
+    post_ids = []
+    for piece in (raw or "").replace("、", ",").split(","):
+        piece = piece.strip()
+        if not piece:
+            continue
+        if not piece.isdigit():
+            return [], f"❌ 投稿IDは数字をカンマ区切りで指定してください: {piece}"
+        if int(piece) not in post_ids:
+            post_ids.append(int(piece))
+    if not post_ids:
+        return [], "❌ 投稿IDを1つ以上指定してください（例: \"12,34,56\"）。"
+    return post_ids, None
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ローカルミラー（SQLite）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_MIRROR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    post_type TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    status TEXT,
+    slug TEXT,
+    title TEXT,
+    link TEXT,
+    date TEXT,
+    modified TEXT,
+    modified_gmt TEXT,
+    content TEXT,
+    fields TEXT NOT NULL DEFAULT '{}',
+    terms TEXT NOT NULL DEFAULT '{}',
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (post_type, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    post_type TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL,
+    high_water_mark TEXT,
+    high_water_mark_local TEXT,
+    last_sweep_at REAL
+);
+"""
+
+# 既存のミラーファイルに後から追加した列
+_MIRROR_MIGRATIONS = {
+    "posts": (("modified", "TEXT"),),
+    "sync_state": (("high_water_mark", "TEXT"), ("high_water_mark_local", "TEXT"), ("last_sweep_at", "REAL")),
+}
+
+_mirror_conn: sqlite3.Connection | None = None
+
+# 投稿タイプごとの同期タスク（同じ投稿タイプの全件同期を同時に走らせない）
+_mirror_refresh_tasks: dict[str, asyncio.Task] = {}
+
+
+def _mirror_db() -> sqlite3.Connection:
+    """ミラーのDB接続を返す（初回呼び出し時に開き、スキーマを作成する）"""
+    global _mirror_conn
+    if _mirror_conn is None:
+        os.makedirs(os.path.dirname(PILATES_MIRROR_PATH), exist_ok=True)
+        conn = sqlite3.connect(PILATES_MIRROR_PATH, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_MIRROR_SCHEMA)
+        for table, columns in _MIRROR_MIGRATIONS.items():
+            existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in columns:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        _mirror_conn = conn
+        logger.debug(f"Mirror database opened: {PILATES_MIRROR_PATH}")
+    return _mirror_conn
+
+
+def _mirror_close() -> None:
+    """ミラーのDB接続を閉じる（シャットダウン時）"""
+    global _mirror_conn
+    if _mirror_conn is not None:
+        _mirror_conn.close()
+        _mirror_conn = None
+
+
+def _mirror_rendered(value) -> str:
+    """title / content（{"rendered": ..., "raw": ...} または文字列）を文字列にする"""
+    if isinstance(value, dict):
+        return value.get('rendered') or value.get('raw') or ''
+    return value if isinstance(value, str) else ''
+
+
+def _mirror_terms_from_post(post: dict) -> dict:
+    """投稿からタクソノミーのターム（IDまたはタームオブジェクトの配列）を取り出す"""
+    return {
+        taxonomy: post[taxonomy]
+        for taxonomy in PILATES_MIRROR_TAXONOMIES
+        if isinstance(post.get(taxonomy), list)
+    }
+
+
+def _mirror_post_row(post_type: str, post: dict, synced_at: float) -> dict:
+    """投稿をミラーの行（posts テーブルの列名 → 値）にする"""
+    return {
+        "post_type": post_type,
+        "id": int(post['id']),
+        "status": post.get('status'),
+        "slug": post.get('slug'),
+        "title": _mirror_rendered(post.get('title')),
+        "link": post.get('link'),
+        "date": post.get('date'),
+        "modified": post.get('modified'),
+        "modified_gmt": post.get('modified_gmt'),
+        "content": _mirror_rendered(post.get('content')),
+        "fields": json.dumps(_get_custom_fields_from_post(post), ensure_ascii=False),
+        "terms": json.dumps(_mirror_terms_from_post(post), ensure_ascii=False),
+        "synced_at": synced_at,
+    }
+
+
+def _mirror_upsert(post_type: str, posts: list[dict]) -> None:
+    """
+    投稿をミラーに保存する。
+    既存の行より modified_gmt が古いデータでは上書きしない（同期中の書き込みを巻き戻さない）。
+    """
+    now = time.time()
+    rows = [
+        _mirror_post_row(post_type, post, now)
+        for post in posts
+        if isinstance(post, dict) and 'id' in post
+    ]
+    if not rows:
+        return
+    
+    conn = _mirror_db()
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO posts (post_type, id, status, slug, title, link, date, modified, modified_gmt,
+                               content, fields, terms, synced_at)
+            VALUES (:post_type, :id, :status, :slug, :title, :link, :date, :modified, :modified_gmt,
+                    :content, :fields, :terms, :synced_at)
+            ON CONFLICT (post_type, id) DO UPDATE SET
+                status = excluded.status,
+                slug = excluded.slug,
+                title = excluded.title,
+                link = excluded.link,
+                date = excluded.date,
+                modified = excluded.modified,
+                modified_gmt = excluded.modified_gmt,
+                content = excluded.content,
+                fields = excluded.fields,
+                terms = excluded.terms,
+                synced_at = excluded.synced_at
+            WHERE excluded.modified_gmt IS NULL
+               OR posts.modified_gmt IS NULL
+               OR excluded.modified_gmt >= posts.modified_gmt
+            """,
+            rows,
+        )
+    _mirror_notify_change(post_type, [row["id"] for row in rows], [])
+
+
+def _mirror_delete(post_type: str, post_ids: list[int]) -> None:
+    """ミラーから投稿を削除する"""
+    if not post_ids:
+        return
+    conn = _mirror_db()
+    with conn:
+        conn.executemany(
+            "DELETE FROM posts WHERE post_type = ? AND id = ?",
+            [(post_type, int(post_id)) for post_id in post_ids],
+        )
+    _mirror_notify_change(post_type, [], [int(post_id) for post_id in post_ids])
+
+
+def _mirror_rows(post_type: str, post_ids, columns: str = "*") -> list[sqlite3.Row]:
+    """指定IDの行を取得する（SQLiteの変数上限を超えないよう分割して問い合わせる）"""
+    post_ids = [int(post_id) for post_id in post_ids]
+    conn = _mirror_db()
+    rows = []
+    for start in range(0, len(post_ids), 500):
+        chunk = post_ids[start:start + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        rows.extend(conn.execute(
+            f"SELECT {columns} FROM posts WHERE post_type = ? AND id IN ({placeholders})",
+            (post_type, *chunk),
+        ).fetchall())
+    return rows
+
+
+def _mirror_notify_change(post_type: str, changed_ids: list[int], removed_ids: list[int]) -> None:
+    """
+    ミラーの変更をローカルインデックスに反映する（構築済みのインデックスのみ。
+    未構築のインデックスは初回使用時にミラー全体から構築される）。
+    changed_ids は保存後の行を読み直して反映する（古いデータで上書きされなかった行も正しく扱う）。
+    """
+    if post_type == WP_POST_TYPE:
+        _index_notify_change(changed_ids, removed_ids)
+    search_index = _search_indexes.get(post_type)
+    if search_index is not None:
+        _search_index_remove_ids(search_index, removed_ids)
+        if changed_ids:
+            _search_index_update(search_index, _mirror_rows(post_type, changed_ids, "id, title, content, fields"))
+
+
+def _mirror_synced_at(post_type: str) -> float | None:
+    """最後に同期を開始した時刻（UNIX時刻）。未同期なら None"""
+    row = _mirror_db().execute(
+        "SELECT synced_at FROM sync_state WHERE post_type = ?", (post_type,)
+    ).fetchone()
+    return row["synced_at"] if row else None
+
+
+def _mirror_is_fresh(post_type: str) -> bool:
+    """ミラーが有効で、PILATES_MIRROR_MAX_AGE 以内に同期済みかを判定する"""
+    if not PILATES_MIRROR_ENABLED or post_type not in PILATES_MIRROR_POST_TYPES:
+        return False
+    try:
+        synced_at = _mirror_synced_at(post_type)
+    except sqlite3.Error as exc:
+        logger.warning(f"Mirror state read failed: {exc}")
+        return False
+    return synced_at is not None and time.time() - synced_at <= PILATES_MIRROR_MAX_AGE
+
+
+def _mirror_mark_stale(post_type: str) -> None:
+    """ミラーを古い扱いにする（次の読み取りからWordPressに問い合わせ、再同期する）"""
+    conn = _mirror_db()
+    with conn:
+        conn.execute("UPDATE sync_state SET synced_at = 0 WHERE post_type = ?", (post_type,))
+
+
+def _mirror_sync_state(post_type: str) -> dict:
+    """同期状態（synced_at / high_water_mark / last_sweep_at）を返す。未同期なら空の辞書"""
+    row = _mirror_db().execute(
+        "SELECT * FROM sync_state WHERE post_type = ?", (post_type,)
+    ).fetchone()
+    return dict(row) if row else {}
+
+
+def _mirror_advance_high_water(mark: dict, posts: list[dict]) -> None:
+    """
+    同期で取得した投稿で high_water_mark（最大の modified_gmt）と high_water_mark_local（その投稿の modified）を進める。
+    同期中に自分の書き込みで保存した行は含めない（それより前のリモートの更新を飛ばさないため）。
+    """
+    for post in posts:
+        if not isinstance(post, dict):
+            continue
+        modified_gmt = post.get('modified_gmt')
+        if modified_gmt and modified_gmt > (mark.get("high_water_mark") or ""):
+            mark["high_water_mark"] = modified_gmt
+            mark["high_water_mark_local"] = post.get('modified')
+
+
+def _mirror_save_sync_state(
+    post_type: str,
+    synced_at: float,
+    mark: dict,
+    swept_at: float | None = None,
+) -> None:
+    """同期完了と、今回の同期で取得した投稿から求めた high_water_mark を記録する"""
+    conn = _mirror_db()
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO sync_state (post_type, synced_at, high_water_mark, high_water_mark_local, last_sweep_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (post_type) DO UPDATE SET
+                synced_at = excluded.synced_at,
+                high_water_mark = excluded.high_water_mark,
+                high_water_mark_local = excluded.high_water_mark_local,
+                last_sweep_at = COALESCE(excluded.last_sweep_at, sync_state.last_sweep_at)
+            """,
+            (
+                post_type,
+                synced_at,
+                mark.get("high_water_mark"),
+                mark.get("high_water_mark_local"),
+                swept_at,
+            ),
+        )
+
+
+def _mirror_sync_params() -> dict:
+    """同期で取得する投稿の共通パラメータ"""
+    return {
+        "context": "edit",
+        "status": ",".join(ALLOWED_STATUSES),
+    }
+
+
+async def _mirror_full_sync(client: httpx.AsyncClient, post_type: str, mark: dict | None = None) -> int:
+    """
+    全ページを取得してミラーを作り直す（初回同期用）。
+    今回の同期で見つからなかった投稿（削除・ゴミ箱など）はミラーから消す。
+    mark を渡した場合は、取得した投稿から求め直した high_water_mark をそこに入れる。
+    
+    Returns:
+        取得した投稿数
+    """
+    started = time.time()
+    if mark is None:
+        mark = {}
+    mark.clear()
+    seen: set[int] = set()
+    async for page_posts in _wp_iter_collection_pages(client, post_type, _mirror_sync_params()):
+        _mirror_upsert(post_type, page_posts)
+        _mirror_advance_high_water(mark, page_posts)
+        seen.update(int(post['id']) for post in page_posts if isinstance(post, dict) and 'id' in post)
+    
+    conn = _mirror_db()
+    with conn:
+        # 同期中に書き込みで追加された行（synced_at >= started）は残す
+        stale_ids = [
+            row["id"]
+            for row in conn.execute(
+                "SELECT id FROM posts WHERE post_type = ? AND synced_at < ?", (post_type, started)
+            )
+            if row["id"] not in seen
+        ]
+    _mirror_delete(post_type, stale_ids)
+    _mirror_save_sync_state(post_type, started, mark, swept_at=started)
+    logger.info(f"Mirror full sync: {post_type} ({len(seen)} posts, {len(stale_ids)} removed)")
+    return len(seen)
+
+
+async def _mirror_incremental_sync(
+    client: httpx.AsyncClient,
+    post_type: str,
+    mark: dict,
+) -> int:
+    """
+    high_water_mark 以降に更新された投稿だけを取得してミラーに反映し、mark を取得した投稿で進める。
+    modified_after はサイトのタイムゾーン（post_modified）で比較されるため、
+    最新投稿の modified（サイト時刻）から WP_SYNC_OVERLAP 分さかのぼって問い合わせる。
+    サイト時刻が不明な場合は modified_gmt から WP_SYNC_GMT_OVERLAP 分さかのぼる。
+    （重複して取得した投稿は modified_gmt が同じなので、上書きしても内容は変わらない）
+    
+    Returns:
+        取得した投稿数
+    """
+    if mark.get("high_water_mark_local"):
+        base, overlap = mark["high_water_mark_local"], WP_SYNC_OVERLAP
+    else:
+        base, overlap = mark["high_water_mark"], WP_SYNC_GMT_OVERLAP
+    try:
+        since = datetime.fromisoformat(base).replace(tzinfo=None)
+    except ValueError:
+        logger.warning(f"Invalid high-water mark for {post_type}: {base}")
+        return await _mirror_full_sync(client, post_type, mark)
+    modified_after = (since - timedelta(seconds=overlap)).isoformat(timespec="seconds")
+    
+    params = _mirror_sync_params()
+    params.update({"modified_after": modified_after, "orderby": "modified", "order": "asc"})
+    changed = 0
+    async for page_posts in _wp_iter_collection_pages(client, post_type, params):
+        _mirror_upsert(post_type, page_posts)
+        _mirror_advance_high_water(mark, page_posts)
+        changed += len(page_posts)
+    logger.debug(f"Mirror incremental sync: {post_type} ({changed} posts modified after {modified_after})")
+    return changed
+
+
+async def _mirror_sweep(client: httpx.AsyncClient, post_type: str, mark: dict) -> tuple[int, int]:
+    """
+    id・status・modified_gmt だけを全件取得し、ミラーとの差分を検出する。
+    WordPress側にない投稿（削除・ゴミ箱・非公開化）はミラーから消し、
+    ステータスや更新日時が異なる投稿だけを取得し直す（取得し直した投稿で mark を進める）。
+    
+    Returns:
+        (取得し直した件数, 削除した件数)
+    """
+    started = time.time()
+    remote: dict[int, tuple] = {}
+    async for page_posts in _wp_iter_collection_pages(
+        client, post_type, _mirror_sync_params(), fields=MIRROR_SWEEP_FIELDS
+    ):
+        for post in page_posts:
+            if isinstance(post, dict) and 'id' in post:
+                remote[int(post['id'])] = (post.get('status'), post.get('modified_gmt'))
+    
+    conn = _mirror_db()
+    local = {
+        row["id"]: (row["status"], row["modified_gmt"], row["synced_at"])
+        for row in conn.execute(
+            "SELECT id, status, modified_gmt, synced_at FROM posts WHERE post_type = ?", (post_type,)
+        )
+    }
+    # 同期中に書き込みで追加された行は残す
+    removed = [
+        post_id for post_id, (_, _, synced_at) in local.items()
+        if post_id not in remote and synced_at < started
+    ]
+    changed = [
+        post_id for post_id, state in remote.items()
+        if post_id not in local or local[post_id][:2] != state
+    ]
+    
+    _mirror_delete(post_type, removed)
+    if changed:
+        fetched = await _wp_get_posts_by_ids(client, post_type, changed, use_cache=False)
+        _mirror_upsert(post_type, list(fetched.values()))
+        _mirror_advance_high_water(mark, list(fetched.values()))
+    logger.debug(f"Mirror sweep: {post_type} ({len(changed)} refetched, {len(removed)} removed)")
+    return len(changed), len(removed)
+
+
+async def _mirror_refresh(post_type: str) -> int:
+    """
+    ミラーを同期する（BULK優先度で送信）。
+    初回は全件取得し、以降は high_water_mark 以降の更新分だけを取得する。
+    削除やステータス変更は WP_SYNC_SWEEP_INTERVAL ごとの軽量な全件照合で検出する。
+    
+    Returns:
+        取得した投稿数
+    
+    Raises:
+        RuntimeError: 取得に失敗した場合
+    """
+    started = time.time()
+    state = _mirror_sync_state(post_type)
+    async with _wp_client(WP_PRIORITY_BULK) as client:
+        if not state.get("high_water_mark"):
+            return await _mirror_full_sync(client, post_type)
+        
+        # 前回の high_water_mark から、今回取得した投稿の分だけ進める
+        mark = {
+            "high_water_mark": state.get("high_water_mark"),
+            "high_water_mark_local": state.get("high_water_mark_local"),
+        }
+        fetched = await _mirror_incremental_sync(client, post_type, mark)
+        swept_at = None
+        if started - (state.get("last_sweep_at") or 0) >= WP_SYNC_SWEEP_INTERVAL:
+            refetched, _ = await _mirror_sweep(client, post_type, mark)
+            fetched += refetched
+            swept_at = started
+    
+    _mirror_save_sync_state(post_type, started, mark, swept_at=swept_at)
+    logger.info(f"Mirror refreshed: {post_type} ({fetched} posts fetched)")
+    return fetched
+
+
+async def _mirror_refresh_task(post_type: str) -> None:
+    """バックグラウンド同期の本体（失敗してもログに残すだけ）"""
+    try:
+        await _mirror_refresh(post_type)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        logger.warning(f"Mirror refresh failed for {post_type}: {exc}")
+
+
+def _mirror_schedule_refresh(post_type: str) -> asyncio.Task:
+    """バックグラウンドで全件同期を開始する（実行中なら既存のタスクを返す）"""
+    task = _mirror_refresh_tasks.get(post_type)
+    if task is None or task.done():
+        task = asyncio.create_task(_mirror_refresh_task(post_type))
+        _mirror_refresh_tasks[post_type] = task
+    return task
+
+
+async def _mirror_cancel_refreshes() -> None:
+    """実行中のバックグラウンド同期を止める（シャットダウン時）"""
+    tasks = [task for task in _mirror_refresh_tasks.values() if not task.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    _mirror_refresh_tasks.clear()
+
+
+def _mirror_row_to_post(row: sqlite3.Row) -> dict:
+    """ミラーの行をWordPressの投稿オブジェクトと同じ形に戻す"""
+    post = {
+        "id": row["id"],
+        "status": row["status"],
+        "slug": row["slug"],
+        "link": row["link"],
+        "date": row["date"],
+        "modified_gmt": row["modified_gmt"],
+        "title": {"rendered": row["title"] or ""},
+        "content": {"rendered": row["content"] or ""},
+        "custom_fields": json.loads(row["fields"] or "{}"),
+    }
+    if row["modified"]:
+        # modified 列の追加前に同期した行は次の同期まで空
+        post["modified"] = row["modified"]
+    post.update(json.loads(row["terms"] or "{}"))
+    return post
+
+
+def _mirror_ready(post_type: str) -> bool:
+    """
+    ミラーを回答に使えるかを判定する。
+    無効・未同期・鮮度切れの場合は False を返し、バックグラウンドで再同期を開始する。
+    """
+    if not PILATES_MIRROR_ENABLED or post_type not in PILATES_MIRROR_POST_TYPES:
+        return False
+    if not _mirror_is_fresh(post_type):
+        _mirror_schedule_refresh(post_type)
+        return False
+    return True
+
+
+def _mirror_posts(post_type: str, status: str, post_ids: set[int] | None = None) -> list[dict] | None:
+    """
+    ミラーから投稿を取得する（日付の新しい順）。post_ids を指定した場合はそのIDに限る。
+    ミラーを使えない場合は None を返す（呼び出し側はWordPressに問い合わせる）。
+    """
+    if not _mirror_ready(post_type):
+        return None
+    
+    statuses = set(s for s in _build_status_param(status).split(",") if s)
+    try:
+        if post_ids is None:
+            rows = _mirror_db().execute(
+                "SELECT * FROM posts WHERE post_type = ?", (post_type,)
+            ).fetchall()
+        else:
+            rows = _mirror_rows(post_type, post_ids)
+    except sqlite3.Error as exc:
+        logger.warning(f"Mirror read failed: {exc}")
+        return None
+    rows = [row for row in rows if row["status"] in statuses]
+    rows.sort(key=lambda row: (row["date"] or "", row["id"]), reverse=True)
+    return [_mirror_row_to_post(row) for row in rows]
+
+
+def _mirror_apply_write(post_type: str, post: dict) -> None:
+    """
+    書き込み成功後のレスポンス（投稿オブジェクト）をミラーに反映する。
+    表示に必要な項目（pilates-studio ではカスタムフィールドも）が含まれないレスポンスでは
+    内容を判断できないので、ミラーを古い扱いにする。
+    ミラーが無効な場合は、ローカルインデックスのスナップショットに反映する。
+    """
+    _index_snapshot_apply_write(post_type, post)
+    if not PILATES_MIRROR_ENABLED or post_type not in PILATES_MIRROR_POST_TYPES:
+        return
+    if not isinstance(post, dict) or 'id' not in post:
+        return
+    try:
+        if post.get('status') not in ALLOWED_STATUSES:
+            _mirror_delete(post_type, [post['id']])
+        elif not _post_missing_detail_fields(post, require_custom_fields=(post_type == WP_POST_TYPE)):
+            _mirror_upsert(post_type, [post])
+        else:
+            _mirror_mark_stale(post_type)
+    except sqlite3.Error as exc:
+        logger.warning(f"Mirror write-through failed: {exc}")
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ローカルインデックスの元データ（ミラー、またはメモリ上のスナップショット）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# スナップショットとして取得する項目とカスタムフィールド（エリア・ファセット・料金・キャンペーンと一覧表示に使うもの）
+INDEX_SNAPSHOT_FIELDS = ("id", "status", "slug", "title", "link", "date", "modified", "modified_gmt")
+INDEX_SNAPSHOT_CUSTOM_FIELDS = (
+    "簡易地区", "住所", "ジャンル", "レッスン方式", "男性利用可否", "駐車場",
+    "表用料金", "価格", "体験", "初期費用", "キャンペーン期間", "キャンペーン内容",
+)
+
+# ミラーが無効な場合は WP_POST_TYPE の全件（本文以外）をメモリに取得し、そこからインデックスを作る
+# rows: 投稿ID → ミラーの posts と同じ列名の辞書 / loaded_at: 取得を開始した時刻（未取得・古い扱いは None）
+# writes: 取得中に書き込んだ投稿（投稿ID → 行、削除は None）。取得完了後に上から反映する
+_index_snapshot: dict = {"rows": {}, "loaded_at": None, "writes": None}
+_index_snapshot_task: asyncio.Task | None = None
+
+
+def _index_uses_mirror() -> bool:
+    """ローカルインデックスをミラーから作るか（False ならメモリ上のスナップショットから作る）"""
+    return PILATES_MIRROR_ENABLED and WP_POST_TYPE in PILATES_MIRROR_POST_TYPES
+
+
+def _index_source_rows(columns: str = "*", post_ids=None) -> list:
+    """
+    ローカルインデックスの元データの行を返す（post_ids を指定した場合はそのIDに限る）。
+    スナップショットの行は常に全列を持つ（columns はミラーの場合のみ使う）。
+    """
+    if _index_uses_mirror():
+        if post_ids is None:
+            return _mirror_db().execute(
+                f"SELECT {columns} FROM posts WHERE post_type = ?", (WP_POST_TYPE,)
+            ).fetchall()
+        return _mirror_rows(WP_POST_TYPE, post_ids, columns)
+    rows = _index_snapshot["rows"]
+    if post_ids is None:
+        return list(rows.values())
+    return [rows[post_id] for post_id in post_ids if post_id in rows]
+
+
+def _index_posts(status: str, post_ids) -> list[dict]:
+    """元データから指定IDの投稿を取得する（ステータスで絞り込み、日付の新しい順）"""
+    statuses = set(s for s in _build_status_param(status).split(",") if s)
+    rows = [row for row in _index_source_rows("*", post_ids) if row["status"] in statuses]
+    rows.sort(key=lambda row: (row["date"] or "", row["id"]), reverse=True)
+    return [_mirror_row_to_post(row) for row in rows]
+
+
+def _index_notify_change(changed_ids: list[int], removed_ids: list[int]) -> None:
+    """元データの変更を構築済みのローカルインデックス（エリア・ファセット・料金・キャンペーン）に反映する"""
+    if _area_index["built"]:
+        _area_index_remove_ids(removed_ids)
+        if changed_ids:
+            _area_index_update(_index_source_rows("id, fields", changed_ids))
+    if _facet_index["built"]:
+        _facet_index_remove_ids(removed_ids)
+        if changed_ids:
+            _facet_index_update(_index_source_rows("id, status, fields", changed_ids))
+    if _price_index["built"]:
+        _price_index_remove_ids(removed_ids)
+        if changed_ids:
+            _price_index_update(_index_source_rows("id, status, fields", changed_ids))
+    if _campaign_index["built"]:
+        _campaign_index_remove_ids(removed_ids)
+        if changed_ids:
+            _campaign_index_update(_index_source_rows("id, modified, fields", changed_ids))
+
+
+def _index_reset() -> None:
+    """ローカルインデックスを未構築に戻す（次回の使用時に元データ全体から構築し直す）"""
+    for index in (_area_index, _facet_index, _price_index, _campaign_index):
+        index["built"] = False
+
+
+async def _index_snapshot_load() -> int:
+    """
+    WP_POST_TYPE の全件を取得してスナップショットを作り直す（BULK優先度で送信）。
+    本文は取得せず、インデックスと一覧表示に使う項目とカスタムフィールドだけに絞り込む。
+    
+    Returns:
+        取得した投稿数
+    
+    Raises:
+        RuntimeError: 取得に失敗した場合
+    """
+    started = time.time()
+    rows: dict[int, dict] = {}
+    _index_snapshot["writes"] = {}
+    try:
+        async with _wp_client(WP_PRIORITY_BULK) as client:
+            async for page_posts in _wp_iter_collection_pages(
+                client, WP_POST_TYPE, _mirror_sync_params(),
+                fields=INDEX_SNAPSHOT_FIELDS, custom_field_keys=INDEX_SNAPSHOT_CUSTOM_FIELDS,
+            ):
+                for post in page_posts:
+                    if isinstance(post, dict) and 'id' in post:
+                        row = _mirror_post_row(WP_POST_TYPE, post, started)
+                        rows[row["id"]] = row
+        # 取得中に書き込んだ投稿は、取得したページより新しい
+        for post_id, row in _index_snapshot["writes"].items():
+            if row is None:
+                rows.pop(post_id, None)
+            else:
+                rows[post_id] = row
+    finally:
+        _index_snapshot["writes"] = None
+    
+    _index_snapshot.update({"rows": rows, "loaded_at": started})
+    _index_reset()
+    logger.info(f"Index snapshot loaded: {WP_POST_TYPE} ({len(rows)} posts)")
+    return len(rows)
+
+
+async def _index_snapshot_task_main() -> None:
+    """スナップショット取得タスクの本体（失敗してもログに残すだけ）"""
+    try:
+        await _index_snapshot_load()
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:
+        logger.warning(f"Index snapshot load failed: {exc}")
+
+
+def _index_snapshot_is_fresh() -> bool:
+    """スナップショットが PILATES_INDEX_MAX_AGE 以内に取得済みかを判定する"""
+    loaded_at = _index_snapshot["loaded_at"]
+    return loaded_at is not None and time.time() - loaded_at <= PILATES_INDEX_MAX_AGE
+
+
+async def _index_ensure_fresh() -> bool:
+    """
+    ローカルインデックスの元データを鮮度内にしてから True を返す。
+    ミラーが有効ならミラーの同期を待ち、無効なら WP_POST_TYPE の全件取得を待つ（実行中の取得があれば相乗りする）。
+    取得に失敗した場合は False。
+    """
+    global _index_snapshot_task
+    if _index_uses_mirror():
+        return await _mirror_ensure_fresh(WP_POST_TYPE)
+    if not _index_snapshot_is_fresh():
+        if _index_snapshot_task is None or _index_snapshot_task.done():
+            _index_snapshot_task = asyncio.create_task(_index_snapshot_task_main())
+        # 待っている呼び出しがキャンセルされても、相乗りしている他の呼び出しのために取得は続ける
+        await asyncio.shield(_index_snapshot_task)
+    return _index_snapshot_is_fresh()
+
+
+def _index_available() -> bool:
+    """
+    元データの取得を待たずにローカルインデックスを使えるか。
+    ミラーが有効ならミラーが鮮度内か（古ければバックグラウンドで再同期を始める）、無効ならスナップショットが鮮度内かを返す。
+    スナップショットの取得は始めない（全件取得は、インデックスなしでは回答できないツールの呼び出し時だけ行う）。
+    """
+    if _index_uses_mirror():
+        return _mirror_ready(WP_POST_TYPE)
+    return _index_snapshot_is_fresh()
+
+
+async def _index_snapshot_cancel() -> None:
+    """実行中のスナップショット取得を止める（シャットダウン時）"""
+    task = _index_snapshot_task
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def _index_snapshot_apply_write(post_type: str, post: dict) -> None:
+    """
+    書き込み成功後のレスポンスをスナップショットに反映する（ミラーが無効な場合のみ）。
+    内容を判断できないレスポンス（カスタムフィールドなし等）では、スナップショットを古い扱いにする。
+    """
+    if _index_uses_mirror() or post_type != WP_POST_TYPE:
+        return
+    if not isinstance(post, dict) or 'id' not in post:
+        return
+    post_id = int(post['id'])
+    if post.get('status') not in ALLOWED_STATUSES:
+        row = None
+    elif not _post_missing_detail_fields(post, require_custom_fields=True):
+        row = _mirror_post_row(WP_POST_TYPE, post, time.time())
+    else:
+        _index_snapshot["loaded_at"] = None
+        return
+    
+    if _index_snapshot["writes"] is not None:
+        _index_snapshot["writes"][post_id] = row
+    if row is None:
+        _index_snapshot["rows"].pop(post_id, None)
+        _index_notify_change([], [post_id])
+    else:
+        _index_snapshot["rows"][post_id] = row
+        _index_notify_change([post_id], [])
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# エリアインデックス（簡易地区・住所 → 投稿ID）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+AREA_INDEX_FIELDS = ("簡易地区", "住所")
+
+_PREFECTURES = (
+    "北海道", "青森県", "岩手県", "宮城県", "秋田県", "山形県", "福島県",
+    "茨城県", "栃木県", "群馬県", "埼玉県", "千葉県", "東京都", "神奈川県",
+    "新潟県", "富山県", "石川県", "福井県", "山梨県", "長野県", "岐阜県",
+    "静岡県", "愛知県", "三重県", "滋賀県", "京都府", "大阪府", "兵庫県",
+    "奈良県", "和歌山県", "鳥取県", "島根県", "岡山県", "広島県", "山口県",
+    "徳島県", "香川県", "愛媛県", "高知県", "福岡県", "佐賀県", "長崎県",
+    "熊本県", "大分県", "宮崎県", "鹿児島県", "沖縄県",
+)
+
+_AREA_SUFFIXES = "都道府県市区町村郡"
+
+# 都道府県の後に続く「郡 + 町村」「市または特別区」「政令市の区」
+# 名前が「市」で終わる市（四日市市・廿日市市）は、最初の「市」で切らないよう先に照合する
+_AREA_COUNTY_PATTERN = re.compile(r"(.+?郡)(.+?[町村])")
+_AREA_CITY_PATTERN = re.compile(r"(?:四日市|廿日市)市|.+?[市区]")
+_AREA_WARD_PATTERN = re.compile(r".+?区")
+_AREA_SEPARATOR_PATTERN = re.compile(r"[\s・、,/／|｜()（）]+")
+
+# 投稿タイプ（WP_POST_TYPE）のエリアインデックス
+# postings: 正規化したトークン → 投稿IDの集合 / by_post: 投稿ID → トークンの集合
+_area_index: dict = {"built": False, "postings": {}, "by_post": {}}
+
+
+def _area_stem(unit: str) -> str:
+    """
+    行政区画の接尾辞（都・道・府・県・市・区・町・村・郡）を取り除く（例: "渋谷区" → "渋谷"）。
+    語幹が1文字になる場合（"港区" など）は他の地名と紛れるのでそのまま返す。
+    """
+    if unit == "北海道" or len(unit) < 3:
+        return unit
+    if unit[-1] in _AREA_SUFFIXES:
+        return unit[:-1]
+    return unit
+
+
+def _area_municipality_units(rest: str) -> tuple[list[str], str]:
+    """
+    都道府県を除いた地名の先頭から郡・市区町村・政令市の区を切り出し、(区画のリスト, 残り) を返す。
+    名前に「町」「村」を含む市（東村山市・十日町市・大町市など）を途中で切らないよう、
+    町村より先に、最初に現れる「市」または「区」までを市区とする。
+    郡は後に町村が続く場合だけ郡とみなす（"大和郡山市" は市）。町村は郡の後でだけ切り出す。
+    """
+    county = _AREA_COUNTY_PATTERN.match(rest)
+    if county and "市" not in county.group(2):
+        return [county.group(1), county.group(2)], rest[county.end():]
+    
+    city = _AREA_CITY_PATTERN.match(rest)
+    if not city:
+        return [], rest
+    units = [city.group(0)]
+    rest = rest[city.end():]
+    if units[0].endswith("市"):
+        ward = _AREA_WARD_PATTERN.match(rest)
+        if ward:
+            units.append(ward.group(0))
+            rest = rest[ward.end():]
+    return units, rest
+
+
+def _area_units(text: str) -> list[str]:
+    """
+    地名を行政区画の単位に分割する。
+    例: "東京都渋谷区神宮前1-2-3" → ["東京都", "渋谷区", "神宮前"]、"神奈川県横浜市中区" → ["神奈川県", "横浜市", "中区"]、
+    "東京都東村山市本町" → ["東京都", "東村山市", "本町"]
+    区画として解釈できない断片（"渋谷" など）はそのまま1単位とする。
+    """
+    units = []
+    for piece in _AREA_SEPARATOR_PATTERN.split(unicodedata.normalize("NFKC", text or "").lower()):
+        if not piece:
+            continue
+        rest = piece
+        for prefecture in _PREFECTURES:
+            if rest.startswith(prefecture):
+                units.append(prefecture)
+                rest = rest[len(prefecture):]
+                break
+        # 番地以降は区画として扱わない
+        rest = re.split(r"[0-9-]", rest, maxsplit=1)[0]
+        municipality_units, rest = _area_municipality_units(rest)
+        units.extend(municipality_units)
+        # 残り（町名・駅名など）も1単位として扱う
+        if rest:
+            units.append(rest)
+    return units
+
+
+def _area_tokens(fields: dict) -> set[str]:
+    """投稿のカスタムフィールド（簡易地区・住所）からインデックスに登録するトークンを作る"""
+    tokens = set()
+    for field in AREA_INDEX_FIELDS:
+        value = fields.get(field)
+        values = value if isinstance(value, list) else [value]
+        for text in values:
+            if not isinstance(text, str):
+                continue
+            for unit in _area_units(text):
+                tokens.add(unit)
+                tokens.add(_area_stem(unit))
+    return tokens
+
+
+def _area_query_terms(query: str) -> list[str]:
+    """検索語を行政区画の語幹に変換する（例: "東京都 葛飾区" → ["東京", "葛飾"]）"""
+    return [_area_stem(unit) for unit in _area_units(query)]
+
+
+def _area_prefix_match(term: str, token: str) -> bool:
+    """
+    完全一致しない検索語の照合規則: トークンが検索語で始まるか（例: "神宮" → "神宮前"）。
+    1文字の検索語は区画の接尾辞が1文字続く場合だけ一致とする（"港" → "港区"。"山" は "山形" に一致しない）。
+    地名の途中との一致（"山" → "岡山"、"村山" → "東村山"）は扱わない。
+    """
+    if not token.startswith(term) or token == term:
+        return token == term
+    return len(term) >= 2 or (len(token) == 2 and token[1] in _AREA_SUFFIXES)
+
+
+def _area_tokens_match(tokens: set[str], terms: list[str]) -> bool:
+    """すべての検索語が、トークンのいずれかと一致または前方一致するか"""
+    return all(
+        term in tokens or any(_area_prefix_match(term, token) for token in tokens)
+        for term in terms
+    )
+
+
+def _area_index_set(post_id: int, tokens: set[str]) -> None:
+    """投稿のトークンを登録し直す"""
+    _area_index_remove_ids([post_id])
+    if not tokens:
+        return
+    _area_index["by_post"][post_id] = tokens
+    for token in tokens:
+        _area_index["postings"].setdefault(token, set()).add(post_id)
+
+
+def _area_index_remove_ids(post_ids: list[int]) -> None:
+    """投稿をインデックスから外す"""
+    postings = _area_index["postings"]
+    for post_id in post_ids:
+        for token in _area_index["by_post"].pop(post_id, ()):
+            ids = postings.get(token)
+            if ids is not None:
+                ids.discard(post_id)
+                if not ids:
+                    del postings[token]
+
+
+def _area_index_update(rows: list[sqlite3.Row]) -> None:
+    """元データの行（id, fields）でインデックスを更新する"""
+    for row in rows:
+        _area_index_set(row["id"], _area_tokens(json.loads(row["fields"] or "{}")))
+
+
+def _area_index_ensure() -> None:
+    """未構築であれば元データ（ミラーまたはスナップショット）の全行からインデックスを構築する"""
+    if _area_index["built"]:
+        return
+    rows = _index_source_rows("id, fields")
+    _area_index["postings"] = {}
+    _area_index["by_post"] = {}
+    _area_index_update(rows)
+    _area_index["built"] = True
+    logger.debug(f"Area index built: {len(rows)} posts, {len(_area_index['postings'])} tokens")
+
+
+def _area_index_lookup(query: str) -> set[int]:
+    """
+    エリア名に一致する投稿IDの集合を返す（検索語ごとの集合の積）。
+    登録済みトークンと完全一致しない語は、トークンの語彙から前方一致するもの（_area_prefix_match）を集める。
+    """
+    _area_index_ensure()
+    terms = _area_query_terms(query)
+    if not terms:
+        return set()
+    
+    postings = _area_index["postings"]
+    result: set[int] | None = None
+    for term in terms:
+        ids = postings.get(term)
+        if ids is None:
+            ids = set()
+            for token, token_ids in postings.items():
+                if _area_prefix_match(term, token):
+                    ids |= token_ids
+        result = set(ids) if result is None else result & ids
+        if not result:
+            return set()
+    return result
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 全文検索インデックス（bigram + BM25）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+SEARCH_FIELD_BOOSTS = {"title": 3.0, "fields": 1.5, "content": 1.0}
+SEARCH_BM25_K1 = 1.2
+SEARCH_BM25_B = 0.75
+
+# 英数字の連続と、それ以外の文字（日本語など）の連続を別のランとして切り出す
+_SEARCH_TOKEN_PATTERN = re.compile(r"[0-9a-z_]+|[^\W0-9a-z_]+")
+_SEARCH_TAG_PATTERN = re.compile(r"<[^<]+?>")
+
+# 投稿タイプごとの転置インデックス
+# postings: トークン → {投稿ID: 重み付き出現数} / doc_len: 投稿ID → 重み付き文書長 / total_len: 文書長の合計
+_search_indexes: dict[str, dict] = {}
+
+
+def _search_tokens(text: str, *, query: bool = False) -> list[str]:
+    """
+    テキストをトークンに分割する（NFKC正規化・小文字化）。
+    文字種が変わる位置でランを区切り、英数字のランは単語として、それ以外（日本語など）は文字bigramとして扱う。
+    文書側は1文字のクエリ（例: "港"）でも引けるよう、日本語などの各文字も1文字トークンとして登録する。
+    クエリ側は1文字だけのランのみ1文字トークンにする。
+    """
+    tokens = []
+    for run in _SEARCH_TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", text or "").lower()):
+        if run.isascii() or len(run) == 1:
+            tokens.append(run)
+            continue
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        if not query:
+            tokens.extend(run)
+    return tokens
+
+
+def _search_field_text(value) -> str:
+    """カスタムフィールドの値（文字列・配列・オブジェクト）から文字列をすべて取り出して連結する"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " ".join(_search_field_text(item) for item in value.values())
+    if isinstance(value, list):
+        return " ".join(_search_field_text(item) for item in value)
+    return ""
+
+
+def _search_document(row: sqlite3.Row) -> dict[str, float]:
+    """ミラーの行から、トークン → 重み付き出現数（フィールドごとのブースト込み）を作る"""
+    fields = json.loads(row["fields"] or "{}")
+    texts = {
+        "title": html.unescape(row["title"] or ""),
+        "fields": " ".join(
+            _search_field_text(value) for key, value in fields.items() if not key.startswith('_')
+        ),
+        "content": html.unescape(_SEARCH_TAG_PATTERN.sub(" ", row["content"] or "")),
+    }
+    weights: dict[str, float] = {}
+    for field, text in texts.items():
+        boost = SEARCH_FIELD_BOOSTS[field]
+        for token in _search_tokens(text):
+            weights[token] = weights.get(token, 0.0) + boost
+    return weights
+
+
+def _search_index_remove_ids(index: dict, post_ids: list[int]) -> None:
+    """投稿をインデックスから外す"""
+    postings = index["postings"]
+    for post_id in post_ids:
+        for token in index["by_post"].pop(post_id, ()):
+            docs = postings.get(token)
+            if docs is not None:
+                docs.pop(post_id, None)
+                if not docs:
+                    del postings[token]
+        index["total_len"] -= index["doc_len"].pop(post_id, 0.0)
+
+
+def _search_index_update(index: dict, rows: list[sqlite3.Row]) -> None:
+    """ミラーの行（id, title, content, fields）でインデックスを更新する"""
+    _search_index_remove_ids(index, [row["id"] for row in rows])
+    for row in rows:
+        weights = _search_document(row)
+        post_id = row["id"]
+        index["by_post"][post_id] = set(weights)
+        index["doc_len"][post_id] = sum(weights.values())
+        index["total_len"] += index["doc_len"][post_id]
+        for token, weight in weights.items():
+            index["postings"].setdefault(token, {})[post_id] = weight
+
+
+def _search_index(post_type: str) -> dict:
+    """投稿タイプのインデックスを返す（未構築であればミラーの全行から構築する）"""
+    index = _search_indexes.get(post_type)
+    if index is None:
+        index = {"postings": {}, "by_post": {}, "doc_len": {}, "total_len": 0.0}
+        rows = _mirror_db().execute(
+            "SELECT id, title, content, fields FROM posts WHERE post_type = ?", (post_type,)
+        ).fetchall()
+        _search_index_update(index, rows)
+        _search_indexes[post_type] = index
+        logger.debug(f"Search index built: {post_type} ({len(rows)} posts, {len(index['postings'])} tokens)")
+    return index
+
+
+def _search_index_query(post_type: str, query: str) -> dict[int, float]:
+    """
+    クエリのトークンをすべて含む投稿を BM25 でスコア付けして返す（投稿ID → スコア）。
+    WordPress の search= と同じく、すべての語を含む投稿だけを対象にする。
+    """
+    index = _search_index(post_type)
+    tokens = set(_search_tokens(query, query=True))
+    if not tokens:
+        return {}
+    
+    postings = index["postings"]
+    # 出現文書の少ないトークンから積集合を取る
+    token_docs = sorted((postings.get(token, {}) for token in tokens), key=len)
+    if not token_docs[0]:
+        return {}
+    candidates = set(token_docs[0])
+    for docs in token_docs[1:]:
+        candidates &= docs.keys()
+        if not candidates:
+            return {}
+    
+    doc_count = len(index["doc_len"])
+    avg_len = index["total_len"] / doc_count if doc_count else 1.0
+    scores = dict.fromkeys(candidates, 0.0)
+    for docs in token_docs:
+        idf = math.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+        for post_id in candidates:
+            tf = docs[post_id]
+            norm = SEARCH_BM25_K1 * (1 - SEARCH_BM25_B + SEARCH_BM25_B * index["doc_len"][post_id] / avg_len)
+            scores[post_id] += idf * tf * (SEARCH_BM25_K1 + 1) / (tf + norm)
+    return scores
+
+
+def _mirror_search_top(post_type: str, query: str, status: str, limit: int) -> list[dict] | None:
+    """
+    ミラーを全文検索し、スコアの高い順に最大 limit 件の投稿を返す。
+    クエリが空の場合は日付の新しい順。ミラーを使えない場合は None（呼び出し側は WordPress の search= で検索する）。
+    インデックスは本文も対象にするため、本文を持たないスナップショットからは作らない（ローカルでの順位付けは PILATES_MIRROR=1 の場合のみ）。
+    """
+    if not _mirror_ready(post_type):
+        return None
+    try:
+        if not query.strip():
+            posts = _mirror_posts(post_type, status)
+            return posts[:limit] if posts is not None else None
+        scores = _search_index_query(post_type, query)
+    except sqlite3.Error as exc:
+        logger.warning(f"Search index query failed: {exc}")
+        return None
+    
+    posts = _mirror_posts(post_type, status, post_ids=set(scores))
+    if posts is None:
+        return None
+    # _mirror_posts は日付の新しい順なので、同点は新しい投稿が先になる
+    return heapq.nlargest(limit, posts, key=lambda post: scores[post['id']])
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ファセットインデックス（レッスン・設備 → 投稿IDのビットセット）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+FACET_FIELDS = ("ジャンル", "レッスン方式", "男性利用可否", "駐車場")
+
+# 括弧内の区切り（"なし（近隣、コインパーキング）" の読点など）では分割しない
+_FACET_SEPARATOR_PATTERN = re.compile(r"[、,，/／\n]+(?![^(（]*[)）])")
+# 値の補足（"可（要予約）" の括弧内など）。照合では除いて比較する
+_FACET_NOTE_PATTERN = re.compile(r"\([^)]*(?:\)|$)|\[[^\]]*(?:\]|$)|【[^】]*(?:】|$)")
+_YEN_AMOUNT_PATTERN = re.compile(r"([0-9][0-9,]*(?:\.[0-9]+)?)\s*(万)?\s*円|¥\s*([0-9][0-9,]*)")
+
+# ビットセットは投稿ごとに割り当てた連番（ordinal）をビット位置とする int（積集合は &、件数は bit_count()）
+# 投稿IDをそのまま使うと、IDの大きいサイトでは件数が少なくても巨大な int になるため
+# bits: ファセット → 値 → ビットセット（"status" も含む）/ by_post: 投稿ID → ファセット → 値の集合
+# ordinals: 投稿ID → ビット位置 / ids: ビット位置 → 投稿ID（空きは None）/ free: 外した投稿の空きビット位置
+_facet_index: dict = {"built": False, "bits": {}, "by_post": {}, "ordinals": {}, "ids": [], "free": []}
+
+
+def _parse_yen_amounts(text: str) -> list[int]:
+    """料金の文字列から金額（円）をすべて取り出す（例: "月額9,800円〜 / 入会金¥5,000" → [9800, 5000]、"1.2万円" → [12000]）"""
+    amounts = []
+    for number, man, yen_number in _YEN_AMOUNT_PATTERN.findall(unicodedata.normalize("NFKC", text or "")):
+        try:
+            if yen_number:
+                amounts.append(int(yen_number.replace(",", "")))
+            else:
+                value = float(number.replace(",", ""))
+                amounts.append(int(round(value * 10000 if man else value)))
+        except ValueError:
+            continue
+    return amounts
+
+
+def _facet_normalize(value: str) -> str:
+    """ファセット値を正規化する（NFKC・前後の空白除去・小文字化）"""
+    return unicodedata.normalize("NFKC", value).strip().lower()
+
+
+def _facet_value_key(value: str) -> str:
+    """照合用のファセット値（補足の括弧書きと空白を除く。例: "可（要予約）" → "可"）"""
+    return re.sub(r"\s+", "", _FACET_NOTE_PATTERN.sub("", _facet_normalize(value)))
+
+
+def _facet_values(value) -> set[str]:
+    """カスタムフィールドの値（文字列・配列）をファセット値の集合にする。文字列は読点・カンマ等で分割する"""
+    values = set()
+    for item in (value if isinstance(value, list) else [value]):
+        if isinstance(item, dict):
+            item = item.get('label') or item.get('value') or item.get('name')
+        if isinstance(item, (int, float)) and not isinstance(item, bool):
+            item = str(item)
+        if not isinstance(item, str):
+            continue
+        for piece in _FACET_SEPARATOR_PATTERN.split(item):
+            piece = _facet_normalize(piece)
+            if piece:
+                values.add(piece)
+    return values
+
+
+def _facet_field_text(value) -> str:
+    """1件目の値を文字列として返す（配列の場合は先頭要素）"""
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    return value if isinstance(value, str) else ""
+
+
+def _facet_ordinal(post_id: int) -> int:
+    """投稿のビット位置を返す（未登録なら空き位置を再利用して割り当て、ビットセットを詰めて保つ）"""
+    ordinals = _facet_index["ordinals"]
+    if post_id not in ordinals:
+        ids = _facet_index["ids"]
+        if _facet_index["free"]:
+            ordinal = _facet_index["free"].pop()
+            ids[ordinal] = post_id
+        else:
+            ordinal = len(ids)
+            ids.append(post_id)
+        ordinals[post_id] = ordinal
+    return ordinals[post_id]
+
+
+def _facet_index_remove_ids(post_ids: list[int]) -> None:
+    """投稿をインデックスから外す（ビット位置は空きとして再利用する）"""
+    bits = _facet_index["bits"]
+    for post_id in post_ids:
+        facets = _facet_index["by_post"].pop(post_id, None)
+        if facets is None:
+            continue
+        ordinal = _facet_index["ordinals"].pop(post_id)
+        mask = ~(1 << ordinal)
+        for facet, values in facets.items():
+            for value in values:
+                remaining = bits[facet][value] & mask
+                if remaining:
+                    bits[facet][value] = remaining
+                else:
+                    del bits[facet][value]
+        _facet_index["ids"][ordinal] = None
+        _facet_index["free"].append(ordinal)
+
+
+def _facet_index_update(rows: list[sqlite3.Row]) -> None:
+    """元データの行（id, status, fields）でインデックスを更新する"""
+    _facet_index_remove_ids([row["id"] for row in rows])
+    bits = _facet_index["bits"]
+    for row in rows:
+        post_id = row["id"]
+        fields = json.loads(row["fields"] or "{}")
+        facets = {"status": {row["status"] or ""}}
+        for facet in FACET_FIELDS:
+            values = _facet_values(fields.get(facet))
+            if values:
+                facets[facet] = values
+        bit = 1 << _facet_ordinal(post_id)
+        for facet, values in facets.items():
+            facet_bits = bits.setdefault(facet, {})
+            for value in values:
+                facet_bits[value] = facet_bits.get(value, 0) | bit
+        _facet_index["by_post"][post_id] = facets
+
+
+def _facet_index_ensure() -> None:
+    """未構築であれば元データ（ミラーまたはスナップショット）の全行からインデックスを構築する"""
+    if _facet_index["built"]:
+        return
+    rows = _index_source_rows("id, status, fields")
+    _facet_index.update({"bits": {}, "by_post": {}, "ordinals": {}, "ids": [], "free": []})
+    _facet_index_update(rows)
+    _facet_index["built"] = True
+    logger.debug(f"Facet index built: {len(rows)} posts")
+
+
+def _facet_match_bits(facet: str, query: str) -> int:
+    """
+    ファセットの指定値に一致する投稿のビットセット。
+    カンマ区切りの複数値はいずれかに一致（OR）。値は完全一致、または補足の括弧書きを除いた値との一致で照合する
+    （"可" は "可（要予約）" に一致し、"不可" には一致しない）。
+    """
+    facet_bits = _facet_index["bits"].get(facet, {})
+    result = 0
+    for term in _facet_values(query):
+        for value, value_bits in facet_bits.items():
+            if value == term or _facet_value_key(value) == term:
+                result |= value_bits
+    return result
+
+
+def _facet_price_bits(min_price: int, max_price: int) -> int:
+    """月額料金が [min_price, max_price] に入る投稿のビットセット（0 は上限・下限なし）"""
+    ordinals = _facet_index["ordinals"]
+    result = 0
+    for _, post_id in _price_range("monthly", min_price, max_price):
+        if post_id in ordinals:
+            result |= 1 << ordinals[post_id]
+    return result
+
+
+def _bits_to_ids(bits: int) -> list[int]:
+    """ビットセットを投稿IDのリスト（昇順）にする"""
+    ids = _facet_index["ids"]
+    post_ids = []
+    while bits:
+        low = bits & -bits
+        post_ids.append(ids[low.bit_length() - 1])
+        bits ^= low
+    return sorted(post_ids)
+
+
+async def _mirror_ensure_fresh(post_type: str) -> bool:
+    """
+    ミラーを鮮度内にしてから True を返す（WordPress側で代替できないローカル検索用）。
+    鮮度切れの場合は同期の完了を待つ。ミラーが無効、または同期に失敗した場合は False。
+    """
+    if not PILATES_MIRROR_ENABLED or post_type not in PILATES_MIRROR_POST_TYPES:
+        return False
+    if not _mirror_is_fresh(post_type):
+        await _mirror_schedule_refresh(post_type)
+    return _mirror_is_fresh(post_type)
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 料金インデックス（月額・体験・初期費用 → 昇順リスト）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 種別の表示名 → インデックスのキー
+PRICE_KINDS = {"月額": "monthly", "体験": "trial", "初期費用": "entry"}
+
+_PRICE_PAREN_PATTERN = re.compile(r"\([^)]*\)")
+# "通常10,000円→0円" の矢印の前の金額（変更前の料金）
+_PRICE_OLD_AMOUNT_PATTERN = re.compile(r"(?:[0-9][0-9,]*(?:\.[0-9]+)?\s*(?:万)?\s*円|¥\s*[0-9][0-9,]*)\s*[→⇒]")
+
+# by_post: 投稿ID → {"monthly", "trial", "entry", "area", "status"}（抽出できなかった料金は None）
+# sorted: 種別 → (金額, 投稿ID) の昇順リスト
+_price_index: dict = {"built": False, "by_post": {}, "sorted": {kind: [] for kind in PRICE_KINDS.values()}}
+
+
+def _price_clean_text(text: str) -> str:
+    """
+    料金の文字列を解析用に整える。
+    括弧内（税抜額などの補足）を除き、"通常10,000円→0円" のような表記は金額ごとに矢印の前（変更前の料金）を除く。
+    他の料金の記載はそのまま残す（例: "事務手数料 3,300円 / 入会金 通常10,000円→0円" → "事務手数料 3,300円 / 入会金 通常0円"）。
+    """
+    text = _PRICE_PAREN_PATTERN.sub(" ", unicodedata.normalize("NFKC", text or ""))
+    return _PRICE_OLD_AMOUNT_PATTERN.sub("", text)
+
+
+def _price_min_amount(text: str) -> int | None:
+    """文字列の最安値（円）。金額がなく「無料」とある場合は 0"""
+    text = _price_clean_text(text)
+    amounts = _parse_yen_amounts(text)
+    if amounts:
+        return min(amounts)
+    return 0 if "無料" in text else None
+
+
+def _price_entries(value) -> list[str]:
+    """価格フィールド（文字列・配列・リピーター）を1プラン1文字列のリストにする"""
+    if isinstance(value, list):
+        return [_search_field_text(item) for item in value]
+    if isinstance(value, dict):
+        return [_search_field_text(item) for item in value.values()]
+    if isinstance(value, str):
+        return value.splitlines()
+    return []
+
+
+def _parse_studio_prices(fields: dict) -> dict:
+    """
+    カスタムフィールドから数値の料金を抽出する。
+    
+    - monthly: 価格のうち「月」を含むプラン（月額・月謝・月4回など）の最安値。なければ表用料金の最安値
+    - trial: 体験の最安値。なければ価格のうち「体験」を含むプランの最安値
+    - entry: 初期費用に含まれる金額の合計（入会金 + 事務手数料など）。「無料」のみなら 0
+    """
+    plans = _price_entries(fields.get('価格'))
     
-    if result:
-        logger.debug(f"Total custom fields found: {len(result)}")
-        return result
+    monthly_candidates = [
+        amount for amount in (_price_min_amount(plan) for plan in plans if "月" in plan)
+        if amount is not None
+    ]
+    monthly = min(monthly_candidates) if monthly_candidates else _price_min_amount(
+        _facet_field_text(fields.get('表用料金'))
+    )
     
-    # どちらも存在しない場合
-    logger.debug("No custom_fields or meta found in post data")
-    logger.debug(f"Available keys in post data: {list(post_data.keys())}")
-    return {}
+    trial = _price_min_amount(_search_field_text(fields.get('体験')))
+    if trial is None:
+        trial_candidates = [
+            amount for amount in (_price_min_amount(plan) for plan in plans if "体験" in plan)
+            if amount is not None
+        ]
+        trial = min(trial_candidates) if trial_candidates else None
+    
+    entry_text = _price_clean_text(_search_field_text(fields.get('初期費用')))
+    entry_amounts = _parse_yen_amounts(entry_text)
+    if entry_amounts:
+        entry = sum(entry_amounts)
+    else:
+        entry = 0 if "無料" in entry_text else None
+    
+    return {"monthly": monthly, "trial": trial, "entry": entry}
 
 
-def _format_fields_for_display(fields: dict, include_internal: bool = False) -> str:
-    """
-    カスタムフィールドを表示用にフォーマットする。
-    完全な構造（ネストされた配列など）を保持する。
+def _price_index_remove_ids(post_ids: list[int]) -> None:
+    """投稿をインデックスから外す"""
+    for post_id in post_ids:
+        entry = _price_index["by_post"].pop(post_id, None)
+        if entry is None:
+            continue
+        for kind, sorted_list in _price_index["sorted"].items():
+            if entry[kind] is not None:
+                position = bisect.bisect_left(sorted_list, (entry[kind], post_id))
+                del sorted_list[position]
+
+
+def _price_index_update(rows: list[sqlite3.Row]) -> None:
+    """元データの行（id, status, fields）でインデックスを更新する"""
+    _price_index_remove_ids([row["id"] for row in rows])
+    for row in rows:
+        fields = json.loads(row["fields"] or "{}")
+        entry = _parse_studio_prices(fields)
+        for kind, sorted_list in _price_index["sorted"].items():
+            if entry[kind] is not None:
+                bisect.insort(sorted_list, (entry[kind], row["id"]))
+        entry["area"] = _facet_field_text(fields.get('簡易地区'))
+        entry["status"] = row["status"]
+        _price_index["by_post"][row["id"]] = entry
+
+
+def _price_index_ensure() -> None:
+    """未構築であれば元データ（ミラーまたはスナップショット）の全行からインデックスを構築する"""
+    if _price_index["built"]:
+        return
+    rows = _index_source_rows("id, status, fields")
+    _price_index.update({"by_post": {}, "sorted": {kind: [] for kind in PRICE_KINDS.values()}})
+    _price_index_update(rows)
+    _price_index["built"] = True
+    logger.debug(f"Price index built: {len(rows)} posts")
+
+
+def _price_range(kind: str, min_price: int = 0, max_price: int = 0) -> list[tuple[int, int]]:
+    """種別の料金が [min_price, max_price] に入る (金額, 投稿ID) を昇順で返す（0 は上限・下限なし）"""
+    sorted_list = _price_index["sorted"][kind]
+    start = bisect.bisect_left(sorted_list, (min_price, -1)) if min_price > 0 else 0
+    end = bisect.bisect_right(sorted_list, (max_price, float("inf"))) if max_price > 0 else len(sorted_list)
+    return sorted_list[start:end]
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# キャンペーン期間インデックス（キャンペーン期間 → 開始日・終了日の昇順リスト）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+_CAMPAIGN_DATE_PATTERN = re.compile(
+    r"(?:(\d{4})\s*[年/.\-]\s*)?(\d{1,2})\s*[月/.\-]\s*(\d{1,2}|末)\s*日?"
+)
+_CAMPAIGN_OPEN_START = date.min.toordinal()
+_CAMPAIGN_OPEN_END = date.max.toordinal()
+
+# by_post: 投稿ID → (開始日, 終了日)（date.toordinal()。期限なしは _CAMPAIGN_OPEN_START / _CAMPAIGN_OPEN_END）
+# starts / ends: (開始日 or 終了日, 投稿ID) の昇順リスト
+_campaign_index: dict = {"built": False, "by_post": {}, "starts": [], "ends": []}
+
+
+def _campaign_date(year: int, month: int, day: str) -> date | None:
+    """年・月・日（"末" は月末）から日付を作る。存在しない日付は None"""
+    try:
+        if day == "末":
+            next_month = date(year + month // 12, month % 12 + 1, 1)
+            return next_month - timedelta(days=1)
+        return date(year, month, int(day))
+    except ValueError:
+        return None
+
+
+def _parse_campaign_period(text: str, base_year: int) -> tuple[int, int] | None:
     """
-    if not fields:
-        return "カスタムフィールドが見つかりませんでした。"
-    
-    result = "【カスタムフィールド（完全な構造）】\n\n"
+    キャンペーン期間の文字列から (開始日, 終了日) の序数を取り出す。
     
-    for key, value in fields.items():
-        if not include_internal and key.startswith('_'):
+    - "2024年10月1日〜2024年10月31日"、"10/1〜10/31"、"2024-10-01 - 2024-10-31" → 開始日と終了日
+    - "11月末まで"、"〜12/31" → 終了日のみ（開始は期限なし）
+    - "10月1日から"、"10/1〜" → 開始日のみ（終了は期限なし）
+    年の省略時は base_year（投稿の更新年）とし、終了日が開始日より前なら翌年とみなす。
+    日付を読み取れない場合は None。
+    """
+    text = unicodedata.normalize("NFKC", text or "").replace("~", "〜").replace("～", "〜")
+    matches = list(_CAMPAIGN_DATE_PATTERN.finditer(text))
+    if not matches:
+        return None
+    
+    dates = []
+    year = base_year
+    for match in matches[:2]:
+        if match.group(1):
+            year = int(match.group(1))
+        parsed = _campaign_date(year, int(match.group(2)), match.group(3))
+        if parsed is None:
+            return None
+        dates.append((parsed, bool(match.group(1)), match))
+    
+    if len(dates) == 2:
+        (start, _, _), (end, end_has_year, _) = dates
+        if end < start and not end_has_year:
+            end = _campaign_date(end.year + 1, end.month, str(end.day)) or end
+        return start.toordinal(), end.toordinal()
+    
+    single, _, match = dates[0]
+    before = text[:match.start()]
+    after = text[match.end():]
+    if "まで" in after or "〜" in before:
+        return _CAMPAIGN_OPEN_START, single.toordinal()
+    if "から" in after or "〜" in after or "より" in after:
+        return single.toordinal(), _CAMPAIGN_OPEN_END
+    return single.toordinal(), single.toordinal()
+
+
+def _campaign_index_remove_ids(post_ids: list[int]) -> None:
+    """投稿をインデックスから外す"""
+    for post_id in post_ids:
+        period = _campaign_index["by_post"].pop(post_id, None)
+        if period is None:
+            continue
+        start, end = period
+        del _campaign_index["starts"][bisect.bisect_left(_campaign_index["starts"], (start, post_id))]
+        del _campaign_index["ends"][bisect.bisect_left(_campaign_index["ends"], (end, post_id))]
+
+
+def _campaign_index_update(rows: list[sqlite3.Row]) -> None:
+    """元データの行（id, modified, fields）でインデックスを更新する"""
+    _campaign_index_remove_ids([row["id"] for row in rows])
+    for row in rows:
+        fields = json.loads(row["fields"] or "{}")
+        text = _facet_field_text(fields.get('キャンペーン期間'))
+        if not text:
             continue
-        
-        # 完全な構造をJSON形式で表示
         try:
-            formatted_value = json.dumps(value, ensure_ascii=False, indent=2)
-            result += f"{key}:\n{formatted_value}\n\n"
-        except Exception as e:
-            # JSON化できない場合は文字列として表示
-            result += f"{key}: {str(value)}\n\n"
+            base_year = int((row["modified"] or "")[:4])
+        except ValueError:
+            base_year = date.today().year
+        period = _parse_campaign_period(text, base_year)
+        if period is None:
+            continue
+        _campaign_index["by_post"][row["id"]] = period
+        bisect.insort(_campaign_index["starts"], (period[0], row["id"]))
+        bisect.insort(_campaign_index["ends"], (period[1], row["id"]))
+
+
+def _campaign_index_ensure() -> None:
+    """未構築であれば元データ（ミラーまたはスナップショット）の全行からインデックスを構築する"""
+    if _campaign_index["built"]:
+        return
+    rows = _index_source_rows("id, modified, fields")
+    _campaign_index.update({"by_post": {}, "starts": [], "ends": []})
+    _campaign_index_update(rows)
+    _campaign_index["built"] = True
+    logger.debug(f"Campaign index built: {len(_campaign_index['by_post'])} campaigns")
+
+
+def _campaign_query(on: date, days: int) -> dict[str, set[int]]:
+    """
+    基準日のキャンペーンを分類する。
     
-    return result
+    Returns:
+        {"active": 実施中, "upcoming": days 日以内に開始, "expired": 過去 days 日以内に終了}
+    """
+    day = on.toordinal()
+    starts = _campaign_index["starts"]
+    ends = _campaign_index["ends"]
+    by_post = _campaign_index["by_post"]
+    inf = float("inf")
+    
+    # 実施中 = 開始済み（starts の先頭から）かつ未終了（ends の末尾まで）。短い方の範囲だけを見て、もう一方の条件を確かめる
+    started_end = bisect.bisect_right(starts, (day, inf))
+    not_ended_start = bisect.bisect_left(ends, (day, -1))
+    if started_end <= len(ends) - not_ended_start:
+        active = {post_id for _, post_id in starts[:started_end] if by_post[post_id][1] >= day}
+    else:
+        active = {post_id for _, post_id in ends[not_ended_start:] if by_post[post_id][0] <= day}
+    upcoming = starts[started_end:bisect.bisect_right(starts, (day + days, inf))]
+    expired = ends[bisect.bisect_left(ends, (day - days, -1)):not_ended_start]
+    return {
+        "active": active,
+        "upcoming": {post_id for _, post_id in upcoming},
+        "expired": {post_id for _, post_id in expired},
+    }
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # ツール定義
@@ -213,10 +2763,8 @@ async def pilates_list(
     """
     logger.info(f"pilates_list called with 店舗名={店舗名}, エリア={エリア}, 件数={件数}, status={status}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
             search_query = 店舗名 or エリア or ""
             logger.debug(f"Search query: {search_query}")
             
@@ -229,40 +2777,29 @@ async def pilates_list(
             if search_query:
                 params["search"] = search_query
             
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}",
-                params=params,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Response status: {response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if response.status_code in (401, 403) or (response.status_code != 200 and ("権限" in str(response.text) or "rest_forbidden" in str(response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                params.pop("context", None)
-                # statusパラメータも削除（権限がない場合は公開済みのみ取得）
-                params.pop("status", None)
-                response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}",
-                    params=params,
-                    headers=headers,
-                    timeout=30.0
+            # ローカルミラーが鮮度内なら全文検索インデックスで検索する（タイトル・カスタムフィールド・本文）
+            stores = _mirror_search_top(WP_POST_TYPE, search_query, status, params["per_page"])
+            if stores is not None:
+                logger.debug("Answered from local mirror")
+            else:
+                # 権限がない場合はcontext=editなしで取得（権限の有無はキャッシュされる）
+                # 表示に使うフィールドだけを取得する
+                response = await _wp_get_projected(
+                    client, WP_POST_TYPE, params, PILATES_LIST_FIELDS, PILATES_LIST_CUSTOM_FIELDS
                 )
-            
-            # ステータスコードチェック
-            if response.status_code != 200:
-                error_data = response.json() if response.text else {}
-                logger.error(f"API Error: {response.status_code} - {error_data}")
-                return f"APIエラーが発生しました: {error_data.get('message', 'Unknown error')}"
-            
-            stores = response.json()
-            
-            # レスポンスが配列でない場合のチェック
-            if not isinstance(stores, list):
-                logger.error(f"Unexpected response format: {type(stores)}")
-                return f"予期しないレスポンス形式です"
+                
+                # ステータスコードチェック
+                if response.status_code != 200:
+                    error_data = response.json() if response.text else {}
+                    logger.error(f"API Error: {response.status_code} - {error_data}")
+                    return f"APIエラーが発生しました: {error_data.get('message', 'Unknown error')}"
+                
+                stores = response.json()
+                
+                # レスポンスが配列でない場合のチェック
+                if not isinstance(stores, list):
+                    logger.error(f"Unexpected response format: {type(stores)}")
+                    return f"予期しないレスポンス形式です"
             
             logger.debug(f"Found {len(stores)} stores")
             
@@ -277,9 +2814,9 @@ async def pilates_list(
                 result += f"{status_emoji} {store['title']['rendered']}\n"
                 result += f"🆔 ID: {store['id']} | ステータス: {store.get('status', '不明')}\n"
                 
-                # カスタムフィールド取得
-                if 'custom_fields' in store:
-                    fields = store['custom_fields']
+                # カスタムフィールド取得（custom_fields / meta / ルートから取得）
+                fields = _get_custom_fields_from_post(store)
+                if fields:
                     
                     # 簡易地区
                     if '簡易地区' in fields:
@@ -320,10 +2857,9 @@ async def pilates_detail(店舗名: str, status: str = "publish,draft") -> str:
     """
     logger.info(f"pilates_detail called with 店舗名={店舗名}, status={status}")
     
-    async with httpx.AsyncClient() as client:
+    # 対話的な読み取りは一括処理より優先して送信する
+    async with _wp_client(WP_PRIORITY_INTERACTIVE) as client:
         try:
-            headers = get_auth_headers()
-            
             # 店舗を検索（下書き含む）
             logger.debug(f"Searching for store: {店舗名}")
             search_params = {
@@ -332,39 +2868,25 @@ async def pilates_detail(店舗名: str, status: str = "publish,draft") -> str:
                 "context": "edit",  # 編集コンテキストで下書きも取得可能に
                 "status": _build_status_param(status)  # カンマ区切りで複数ステータスを指定可能
             }
-            search_response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}",
-                params=search_params,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Search response status: {search_response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if search_response.status_code in (401, 403) or (search_response.status_code != 200 and ("権限" in str(search_response.text) or "rest_forbidden" in str(search_response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                search_params.pop("context", None)
-                search_params.pop("status", None)
-                search_response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}",
-                    params=search_params,
-                    headers=headers,
-                    timeout=30.0
-                )
-            
-            # ステータスコードチェック
-            if search_response.status_code != 200:
-                error_data = search_response.json() if search_response.text else {}
-                logger.error(f"Search API Error: {search_response.status_code} - {error_data}")
-                return f"APIエラーが発生しました: {error_data.get('message', 'Unknown error')}"
-            
-            stores = search_response.json()
-            
-            # レスポンスが配列でない場合のチェック
-            if not isinstance(stores, list):
-                logger.error(f"Unexpected response format: {type(stores)}")
-                return f"予期しないレスポンス形式です"
+            # ローカルミラーが鮮度内なら全文検索インデックスで最もスコアの高いスタジオを選ぶ
+            stores = _mirror_search_top(WP_POST_TYPE, 店舗名, status, 1)
+            if stores is not None:
+                logger.debug("Answered from local mirror")
+            else:
+                search_response = await _wp_get_edit_context(client, WP_POST_TYPE, search_params)
+                
+                # ステータスコードチェック
+                if search_response.status_code != 200:
+                    error_data = search_response.json() if search_response.text else {}
+                    logger.error(f"Search API Error: {search_response.status_code} - {error_data}")
+                    return f"APIエラーが発生しました: {error_data.get('message', 'Unknown error')}"
+                
+                stores = search_response.json()
+                
+                # レスポンスが配列でない場合のチェック
+                if not isinstance(stores, list):
+                    logger.error(f"Unexpected response format: {type(stores)}")
+                    return f"予期しないレスポンス形式です"
             
             logger.debug(f"Search results count: {len(stores)}")
             
@@ -372,36 +2894,22 @@ async def pilates_detail(店舗名: str, status: str = "publish,draft") -> str:
                 logger.warning(f"No stores found for: {店舗名}")
                 return f"「{店舗名}」が見つかりませんでした。"
             
-            store_id = stores[0]['id']
+            store = stores[0]
+            store_id = store['id']
             logger.info(f"Found store ID: {store_id}")
             
-            # 詳細取得（編集コンテキストで下書きも取得可能に）
-            logger.debug(f"Fetching details for store ID: {store_id}")
-            detail_response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}/{store_id}",
-                params={"context": "edit"},
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Detail response status: {detail_response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if detail_response.status_code in (401, 403) or (detail_response.status_code != 200 and ("権限" in str(detail_response.text) or "rest_forbidden" in str(detail_response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                detail_response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}/{store_id}",
-                    params={},
-                    headers=headers,
-                    timeout=30.0
-                )
-            
-            # ステータスコードをチェック
-            if detail_response.status_code != 200:
-                logger.error(f"HTTP error: {detail_response.status_code}")
-                return f"エラーが発生しました: HTTPステータス {detail_response.status_code}"
-            
-            store = detail_response.json()
+            # 検索結果は詳細取得と同じ投稿オブジェクトなので、そのまま表示する。
+            # 必要な項目が欠けている場合のみ詳細を取得し直す
+            if _post_missing_detail_fields(store, require_custom_fields=True):
+                logger.debug(f"Fetching details for store ID: {store_id}")
+                detail_response = await _wp_get_edit_context(client, f"{WP_POST_TYPE}/{store_id}")
+                
+                # ステータスコードをチェック
+                if detail_response.status_code != 200:
+                    logger.error(f"HTTP error: {detail_response.status_code}")
+                    return f"エラーが発生しました: HTTPステータス {detail_response.status_code}"
+                
+                store = detail_response.json()
             logger.debug(f"Store data keys: {store.keys()}")
             
             # titleキーが存在するかチェック
@@ -416,7 +2924,6 @@ async def pilates_detail(店舗名: str, status: str = "publish,draft") -> str:
             
             # 本文
             if store.get('content', {}).get('rendered'):
-                import re
                 content = store['content']['rendered']
                 content = re.sub('<[^<]+?>', '', content)
                 result += f"📝 説明:\n{content.strip()[:500]}...\n\n"
@@ -595,37 +3102,13 @@ async def pilates_by_id(投稿ID: int) -> str:
     """
     logger.info(f"pilates_by_id called with ID={投稿ID}")
     
-    async with httpx.AsyncClient() as client:
+    # 対話的な読み取りは一括処理より優先して送信する
+    async with _wp_client(WP_PRIORITY_INTERACTIVE) as client:
         try:
-            headers = get_auth_headers()
-            
             logger.debug(f"Fetching pilates studio with ID: {投稿ID}")
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}/{投稿ID}",
-                params={"context": "edit"},  # 編集コンテキストで下書きも取得可能に
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Response status: {response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if response.status_code in (401, 403) or (response.status_code != 200 and ("権限" in str(response.text) or "rest_forbidden" in str(response.text))):
-                # エラーレスポンスの内容をログに記録
-                try:
-                    error_data = response.json() if response.text else {}
-                    logger.warning(f"権限エラー詳細: {error_data}")
-                except:
-                    logger.warning(f"権限エラーレスポンス: {response.text[:200] if response.text else 'No response body'}")
-                
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}/{投稿ID}",
-                    params={},
-                    headers=headers,
-                    timeout=30.0
-                )
-            
+            # 編集コンテキストで下書きも取得可能に（権限がない場合は自動でフォールバック）
+            response = await _wp_get_edit_context(client, f"{WP_POST_TYPE}/{投稿ID}")
+
             # ステータスコードをチェック
             if response.status_code == 404:
                 return f"ID {投稿ID} のスタジオが見つかりませんでした。"
@@ -662,24 +3145,7 @@ async def pilates_by_id(投稿ID: int) -> str:
             if 'title' not in store or 'rendered' not in store.get('title', {}):
                 return f"ID {投稿ID} のデータ形式が正しくありません。レスポンス: {store}"
             
-            status_emoji = get_status_emoji(store.get('status', ''))
-            result = f"━━━━━━━━━━━━━━━━━━━━\n"
-            result += f"{status_emoji} {store['title']['rendered']}\n"
-            result += f"🆔 ID: {store['id']} | ステータス: {store.get('status', '不明')}\n"
-            result += f"━━━━━━━━━━━━━━━━━━━━\n\n"
-            
-            # カスタムフィールドをすべて表示（完全な構造）
-            fields = _get_custom_fields_from_post(store)
-            if fields:
-                result += _format_fields_for_display(fields, include_internal=False)
-            else:
-                result += "【カスタムフィールド】\n\n"
-                result += "カスタムフィールドが見つかりませんでした。\n"
-                result += f"利用可能なキー: {', '.join(store.keys())}\n"
-            
-            result += f"\n🔗 {store['link']}\n"
-            
-            return result
+            return _format_studio_by_id(store)
         
         except Exception as e:
             logger.exception(f"Error in pilates_by_id: {e}")
@@ -705,30 +3171,11 @@ async def pilates_get_fields_raw(投稿ID: int, include_internal: bool = False)
     """
     logger.info(f"pilates_get_fields_raw called with ID={投稿ID}, include_internal={include_internal}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
             logger.debug(f"Fetching pilates studio with ID: {投稿ID}")
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}/{投稿ID}",
-                params={"context": "edit"},
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Response status: {response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if response.status_code in (401, 403) or (response.status_code != 200 and ("権限" in str(response.text) or "rest_forbidden" in str(response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}/{投稿ID}",
-                    params={},
-                    headers=headers,
-                    timeout=30.0
-                )
-            
+            response = await _wp_get_edit_context(client, f"{WP_POST_TYPE}/{投稿ID}")
+
             if response.status_code == 404:
                 return f"ID {投稿ID} のスタジオが見つかりませんでした。"
             
@@ -774,6 +3221,38 @@ async def pilates_get_fields_raw(投稿ID: int, include_internal: bool = False)
             return f"エラーが発生しました: {str(e)}"
 
 
+# ========================================
+# ツール3-3: 複数IDでまとめて取得
+# ========================================
+@mcp.tool()
+async def pilates_by_ids(投稿IDリスト: str) -> str:
+    """
+    複数の投稿IDを指定してピラティススタジオの情報をまとめて取得します（下書き含む）。
+    pilates_by_id と同じ内容を、指定した順番で1つの結果として返します。
+    
+    Args:
+        投稿IDリスト: カンマ区切りの投稿ID（例: "12,34,56"）
+    """
+    logger.info(f"pilates_by_ids called with IDs={投稿IDリスト}")
+    
+    post_ids, error = _parse_post_id_list(投稿IDリスト)
+    if error:
+        return error
+    
+    async with _wp_client(WP_PRIORITY_INTERACTIVE) as client:
+        try:
+            # キャッシュ済みの投稿は再利用し、残りは include= でまとめて取得する
+            posts = await _wp_get_posts_by_ids(client, WP_POST_TYPE, post_ids)
+            return _format_posts_by_ids(post_ids, posts, _format_studio_by_id, "スタジオ")
+        
+        except RuntimeError as exc:
+            logger.error(f"API Error in pilates_by_ids: {exc}")
+            return f"APIエラーが発生しました: {exc}"
+        except Exception as e:
+            logger.exception(f"Error in pilates_by_ids: {e}")
+            return f"エラーが発生しました: {str(e)}"
+
+
 # ========================================
 # ツール4: エリアで絞り込み
 # ========================================
@@ -791,66 +3270,58 @@ async def pilates_by_area(エリア: str, 件数: int = 10, status: str = "publi
     """
     logger.info(f"pilates_by_area called with エリア={エリア}, 件数={件数}, status={status}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
-            # 全件取得してカスタムフィールドでフィルタリング（下書き含む）
+            # 全ページを取得してカスタムフィールドでフィルタリング（下書き含む）
+            # 一致した投稿だけを保持し、件数に達したら以降のページは取得しない
             logger.debug("Fetching all stores for area filtering")
             area_params = {
-                "per_page": 100,
+                "per_page": WP_PAGE_SIZE,
                 "context": "edit",  # 編集コンテキストで下書きも取得可能に
                 "status": _build_status_param(status)  # カンマ区切りで複数ステータスを指定可能
             }
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}",
-                params=area_params,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Response status: {response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if response.status_code in (401, 403) or (response.status_code != 200 and ("権限" in str(response.text) or "rest_forbidden" in str(response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                area_params.pop("context", None)
-                area_params.pop("status", None)
-                response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}",
-                    params=area_params,
-                    headers=headers,
-                    timeout=30.0
-                )
-            
-            # ステータスコードチェック
-            if response.status_code != 200:
-                error_data = response.json() if response.text else {}
-                logger.error(f"API Error: {response.status_code} - {error_data}")
-                return f"APIエラーが発生しました: {error_data.get('message', 'Unknown error')}"
-            
-            all_stores = response.json()
-            
-            # レスポンスが配列でない場合のチェック
-            if not isinstance(all_stores, list):
-                logger.error(f"Unexpected response format: {type(all_stores)}")
-                return f"予期しないレスポンス形式です"
-            
-            logger.debug(f"Total stores fetched: {len(all_stores)}")
             
-            # エリアでフィルタリング
             logger.debug(f"Filtering stores by area: {エリア}")
             filtered = []
-            for store in all_stores:
-                if 'custom_fields' in store:
-                    fields = store['custom_fields']
-                    if '簡易地区' in fields:
-                        area = fields['簡易地区'][0] if isinstance(fields['簡易地区'], list) else fields['簡易地区']
-                        if エリア in area:
+            scanned = 0
+            
+            # 簡易地区・住所を正規化（全角/半角・都道府県/市区の接尾辞）して照合する
+            terms = _area_query_terms(エリア)
+            
+            def collect(page_stores: list[dict]) -> None:
+                for store in page_stores:
+                    fields = _get_custom_fields_from_post(store)
+                    if fields:
+                        if _area_tokens_match(_area_tokens(fields), terms):
                             filtered.append(store)
                             logger.debug(f"Matched store: {store.get('title', {}).get('rendered', 'Unknown')}")
             
-            logger.info(f"Filtered {len(filtered)} stores for area: {エリア}")
+            # ミラーか取得済みのスナップショットがあれば、エリアインデックスで絞り込む
+            # （エリア検索のためだけに全件は取得しない）
+            indexed = None
+            if _index_available():
+                try:
+                    indexed = _index_posts(status, _area_index_lookup(エリア))
+                except sqlite3.Error as exc:
+                    logger.warning(f"Area index lookup failed: {exc}")
+            if indexed is not None:
+                scanned = len(_area_index["by_post"])
+                filtered.extend(indexed)
+            else:
+                # インデックスを使えない場合はページを順に取得して照合する
+                try:
+                    async for page_stores in _wp_iter_collection_pages(
+                        client, WP_POST_TYPE, area_params,
+                        fields=PILATES_LIST_FIELDS, custom_field_keys=PILATES_LIST_CUSTOM_FIELDS,
+                    ):
+                        scanned += len(page_stores)
+                        collect(page_stores)
+                        if len(filtered) >= 件数:
+                            break
+                except RuntimeError as exc:
+                    return f"APIエラーが発生しました: {exc}"
+            
+            logger.info(f"Filtered {len(filtered)} stores for area: {エリア} (scanned {scanned})")
             
             if not filtered:
                 logger.warning(f"No stores found for area: {エリア}")
@@ -867,8 +3338,9 @@ async def pilates_by_area(エリア: str, 件数: int = 10, status: str = "publi
                 result += f"{status_emoji} {store['title']['rendered']}\n"
                 result += f"🆔 ID: {store['id']} | ステータス: {store.get('status', '不明')}\n"
                 
-                if 'custom_fields' in store:
-                    fields = store['custom_fields']
+                # カスタムフィールド（custom_fields / meta / ルートから取得）
+                fields = _get_custom_fields_from_post(store)
+                if fields:
                     
                     if '住所' in fields:
                         addr = fields['住所'][0] if isinstance(fields['住所'], list) else fields['住所']
@@ -888,31 +3360,204 @@ async def pilates_by_area(エリア: str, 件数: int = 10, status: str = "publi
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# ヘルパー関数（更新用）
+# ヘルパー関数（更新用）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+async def _pilates_wp_post(path: str, payload: dict) -> dict:
+    """
+    WordPress REST APIにPOSTリクエストを送信
+    """
+    url = path
+    if not url.startswith("http"):
+        url = f"{WP_SITE_URL}/wp-json/wp/v2/{path.lstrip('/')}"
+    
+    headers = get_auth_headers()
+    
+    async with _wp_client() as client:
+        response = await _wp_send(client, "POST", url, json=payload, headers=headers, timeout=30.0)
+        
+        # 書き込んだ投稿のキャッシュを破棄（失敗時も部分的に更新されている可能性がある）
+        wp_path = url.split("/wp-json/wp/v2/", 1)[-1]
+        _post_cache_invalidate_path(wp_path)
+        
+        data = _wp_write_response_json(response)
+        if response.status_code >= 400:
+            raise _wp_write_error(response.status_code, data)
+        
+        return _wp_apply_write_result(wp_path, data)
+
+
+def _wp_write_error(status_code: int, error_data) -> RuntimeError:
+    """書き込み失敗時の例外を作成"""
+    return RuntimeError(
+        f"WordPress APIエラー (HTTP {status_code}): {json.dumps(error_data, ensure_ascii=False)}"
+    )
+
+
+def _wp_write_response_json(response: httpx.Response):
+    """
+    書き込みのレスポンスをJSONとして読む。
+    
+    Raises:
+        RuntimeError: 本文がJSONでない場合（プロキシのエラーページ・WAF・PHPの警告など）
+    """
+    if not response.text:
+        return {}
+    try:
+        return response.json()
+    except ValueError:
+        raise _wp_write_error(response.status_code, {"message": response.text[:200]}) from None
+
+
+def _wp_apply_write_result(wp_path: str, result) -> dict:
+    """書き込み成功時のレスポンスを検証し、ローカルミラーへ反映する"""
+    if isinstance(result, dict):
+        _mirror_apply_write(wp_path.strip("/").split("/", 1)[0], result)
+        return result
+    raise RuntimeError("予期しないレスポンス形式です。JSONオブジェクトを受信できませんでした。")
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# バッチ書き込み（/wp-json/batch/v1）
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-async def _pilates_wp_post(path: str, payload: dict) -> dict:
+# supported: None=未判定 / True=利用可 / False=非対応（以後は単体POSTで送信）
+_wp_batch_state: dict = {"supported": None, "batches": 0, "sub_requests": 0, "fallbacks": 0}
+
+
+async def _wp_batch_send(
+    client: httpx.AsyncClient,
+    writes: list[tuple[str, dict]],
+) -> list | None:
     """
-    WordPress REST APIにPOSTリクエストを送信
+    最大 WP_BATCH_MAX_REQUESTS 件の書き込みを1回のバッチリクエストで送信する。
+    
+    Returns:
+        各書き込みの結果（投稿dict / RuntimeError / バッチ不可で単体送信が必要な場合は None）のリスト。
+        サイトがバッチAPIに対応していない場合は None。
     """
-    url = path
-    if not url.startswith("http"):
-        url = f"{WP_SITE_URL}/wp-json/wp/v2/{path.lstrip('/')}"
+    body = {
+        "validation": "normal",
+        "requests": [
+            {"method": "POST", "path": f"/wp/v2/{path.strip('/')}", "body": payload}
+            for path, payload in writes
+        ],
+    }
+    response = await _wp_send(
+        client,
+        "POST",
+        f"{WP_SITE_URL}/wp-json/batch/v1",
+        json=body,
+        headers=get_auth_headers(),
+        timeout=60.0,
+    )
     
-    headers = get_auth_headers()
+    # バッチ内の書き込みは成否にかかわらずキャッシュを破棄する
+    for path, _ in writes:
+        _post_cache_invalidate_path(path)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload, headers=headers, timeout=30.0)
-        
-        if response.status_code >= 400:
-            error_data = response.json() if response.text else {"message": str(response.text)}
-            raise RuntimeError(
-                f"WordPress APIエラー (HTTP {response.status_code}): {json.dumps(error_data, ensure_ascii=False)}"
-            )
-        
-        result = response.json()
-        if isinstance(result, dict):
-            return result
-        raise RuntimeError("予期しないレスポンス形式です。JSONオブジェクトを受信できませんでした。")
+    if response.status_code in (404, 405, 501):
+        # ルートが存在しない（WordPress 5.6未満やREST APIの制限）
+        logger.warning(f"Batch API not available (HTTP {response.status_code}). Falling back to single writes")
+        _wp_batch_state["supported"] = False
+        return None
+    
+    try:
+        data = response.json() if response.text else {}
+    except ValueError:
+        data = {"message": response.text[:200]}
+    if response.status_code >= 400 or not isinstance(data, dict):
+        error = _wp_write_error(response.status_code, data)
+        return [error] * len(writes)
+    
+    _wp_batch_state["supported"] = True
+    _wp_batch_state["batches"] += 1
+    _wp_batch_state["sub_requests"] += len(writes)
+    
+    # サブレスポンスはリクエストと同じ順序で返る
+    responses = data.get("responses") or []
+    results: list = []
+    for index, (path, _) in enumerate(writes):
+        if index >= len(responses) or not isinstance(responses[index], dict):
+            results.append(RuntimeError("バッチ応答にこのリクエストの結果が含まれていません。"))
+            continue
+        status_code = responses[index].get("status") or 500
+        sub_body = responses[index].get("body")
+        if status_code >= 400:
+            if isinstance(sub_body, dict) and sub_body.get("code") == "rest_batch_not_allowed":
+                # このルートはバッチ非対応。単体POSTで送り直す
+                results.append(None)
+            else:
+                results.append(_wp_write_error(status_code, sub_body))
+            continue
+        try:
+            results.append(_wp_apply_write_result(path, sub_body))
+        except RuntimeError as exc:
+            results.append(exc)
+    return results
+
+
+async def _wp_batch_write(
+    writes: list[tuple[str, dict]],
+    *,
+    concurrency: int = WP_BULK_UPDATE_CONCURRENCY,
+) -> list:
+    """
+    複数の書き込み（wp/v2 からの相対パス, ペイロード）をまとめて送信する。
+    バッチAPIが使えれば WP_BATCH_MAX_REQUESTS 件ずつ束ね、使えなければ単体POSTを並列に送る。
+    
+    Returns:
+        writes と同じ順序の結果リスト（成功時は投稿dict、失敗時は RuntimeError）
+    """
+    results: list = [None] * len(writes)
+    semaphore = asyncio.Semaphore(max(1, min(concurrency, WP_MAX_CONCURRENT_REQUESTS)))
+    
+    async def send_single(index: int) -> None:
+        path, payload = writes[index]
+        async with semaphore:
+            try:
+                results[index] = await _pilates_wp_post(path, payload)
+            except RuntimeError as exc:
+                results[index] = exc
+            except httpx.HTTPError as exc:
+                results[index] = RuntimeError(str(exc) or type(exc).__name__)
+    
+    async def send_batch(indexes: list[int]) -> list[int]:
+        """バッチで送信し、単体で送り直す必要があるインデックスを返す"""
+        if _wp_batch_state["supported"] is False:
+            return indexes
+        async with semaphore:
+            async with _wp_client() as client:
+                try:
+                    batch_results = await _wp_batch_send(client, [writes[i] for i in indexes])
+                except (RuntimeError, httpx.HTTPError) as exc:
+                    batch_results = [RuntimeError(str(exc) or type(exc).__name__)] * len(indexes)
+        if batch_results is None:
+            return indexes
+        retry = []
+        for index, result in zip(indexes, batch_results):
+            if result is None:
+                retry.append(index)
+            else:
+                results[index] = result
+        return retry
+    
+    pending = list(range(len(writes)))
+    if WP_BATCH_ENABLED and len(writes) > 1 and _wp_batch_state["supported"] is not False:
+        chunks = [
+            pending[start:start + WP_BATCH_MAX_REQUESTS]
+            for start in range(0, len(pending), WP_BATCH_MAX_REQUESTS)
+        ]
+        if _wp_batch_state["supported"] is None:
+            # 対応状況が未判定なら最初のバッチで確かめてから残りを送る
+            pending = await send_batch(chunks[0])
+            chunks = chunks[1:]
+        else:
+            pending = []
+        for retry in await asyncio.gather(*(send_batch(chunk) for chunk in chunks)):
+            pending.extend(retry)
+        _wp_batch_state["fallbacks"] += len(pending)
+    
+    await asyncio.gather(*(send_single(index) for index in pending))
+    return results
 
 
 def _pilates_format_update_summary(
@@ -948,6 +3593,33 @@ def _pilates_parse_fields_json(raw: str) -> tuple[dict | None, str | None]:
     return data, None
 
 
+def _build_update_payload(
+    data: dict,
+    container: str,
+    wrap_payload: bool,
+    post_type: str = WP_POST_TYPE,
+) -> tuple[dict, str, str | None]:
+    """
+    カスタムフィールド更新の送信内容を組み立てる（field_group は "投稿タイプ:container" の表示用ラベル）。
+    
+    Returns:
+        (payload, field_group, エラーメッセージ or None)
+    """
+    container = (container or "meta").strip()
+    
+    if bool(wrap_payload):
+        # containerでラップして送信
+        if container not in ("custom_fields", "meta", "acf"):
+            return {}, "", (
+                f"❌ container='{container}' はサポートされていません。"
+                " 使用可能: custom_fields / meta / acf"
+            )
+        return {container: data}, f"{post_type}:{container}", None
+    
+    # そのまま送信
+    return data, f"{post_type}:raw", None
+
+
 async def _pilates_handle_update_tool(
     *,
     post_id: int,
@@ -968,24 +3640,10 @@ async def _pilates_handle_update_tool(
     if not isinstance(data, dict) or not data:
         return "❌ JSONはキーと値を持つオブジェクト形式で指定してください。"
     
-    container = (container or "meta").strip()
-    wrap_payload = bool(wrap_payload)
-    
-    if wrap_payload:
-        # containerでラップして送信
-        if container not in ("custom_fields", "meta", "acf"):
-            return (
-                f"❌ container='{container}' はサポートされていません。"
-                " 使用可能: custom_fields / meta / acf"
-            )
-        payload = {container: data}
-        summary_fields = data
-        field_group = f"pilates-studio:{container}"
-    else:
-        # そのまま送信
-        payload = data
-        summary_fields = data
-        field_group = "pilates-studio:raw"
+    payload, field_group, error = _build_update_payload(data, container, wrap_payload)
+    if error:
+        return error
+    summary_fields = data
     
     logger.info(
         "[Pilates] 更新開始 id=%s container=%s wrap=%s",
@@ -1039,6 +3697,108 @@ async def pilates_update_fields(
     )
 
 
+# ========================================
+# ツール5-2: カスタムフィールド一括更新（pilates-studio / media-free-content / posts）
+# ========================================
+@mcp.tool()
+async def pilates_bulk_update_fields(
+    更新JSON: str,
+    container: str = "meta",
+    wrap_payload: bool = True,
+    同時実行数: int = 0,
+    投稿タイプ: str = WP_POST_TYPE,
+) -> str:
+    """
+    複数の投稿のカスタムフィールドをまとめて更新します。
+    サイトがバッチAPI（WordPress 5.6+）に対応していれば最大25件ずつ1リクエストに束ね、
+    非対応なら同時実行数を制限して単体で並列送信し、投稿IDごとの成功・失敗を返します。
+    
+    Args:
+        更新JSON: {"投稿ID": {"フィールド名": "値"}} 形式のJSON文字列
+        container: custom_fields / meta / acf のいずれか（wrap_payload=True の場合）
+        wrap_payload: True で各フィールドを container 内に包んで送信、False でそのまま送信
+        同時実行数: 同時に送信するリクエストの数（0で既定値 WP_BULK_UPDATE_CONCURRENCY）
+        投稿タイプ: 更新する投稿タイプ（既定: pilates-studio）。media-free-content / posts を指定すると、
+            その投稿タイプのカスタムフィールドを同じ形式で一括更新します
+    
+    例:
+        更新JSON: '{"123": {"表用料金": "月額10,000円〜"}, "456": {"表用料金": "月額8,800円〜"}}'
+        media-free-content の場合: 更新JSON='{"789": {"フィールド名": "値"}}', 投稿タイプ="media-free-content"
+    """
+    logger.info(f"pilates_bulk_update_fields called with 投稿タイプ={投稿タイプ}")
+    
+    post_type = (投稿タイプ or WP_POST_TYPE).strip()
+    if post_type not in (WP_POST_TYPE, "media-free-content", "posts"):
+        return f"❌ 投稿タイプ '{post_type}' はサポートされていません。使用可能: {WP_POST_TYPE} / media-free-content / posts"
+    
+    try:
+        data = json.loads(更新JSON)
+    except json.JSONDecodeError as exc:
+        return (
+            "❌ JSONの形式に問題があります。\n"
+            f"エラー: {exc}\n"
+            "例: {\"123\": {\"カスタムフィールド名\": \"値\"}}"
+        )
+    if not isinstance(data, dict) or not data:
+        return "❌ JSONは {\"投稿ID\": {\"フィールド名\": \"値\"}} 形式のオブジェクトで指定してください。"
+    
+    # 入力を検証し、送信内容を組み立てる（不正なエントリはその投稿IDの失敗として報告する）
+    # 投稿IDは空白・先頭の0を除いて比較し、同じ投稿は最初の指定だけを更新する
+    report: dict[str, str] = {}
+    duplicates: list[str] = []
+    jobs: list[tuple[str, dict]] = []
+    field_group = ""
+    for key, fields in data.items():
+        key = str(key).strip()
+        if key.isdigit():
+            key = str(int(key))
+        if key in report:
+            duplicates.append(key)
+            continue
+        if not key.isdigit():
+            report[key] = "❌ 投稿IDは数字で指定してください"
+            continue
+        if not isinstance(fields, dict) or not fields:
+            report[key] = "❌ フィールドはキーと値を持つオブジェクトで指定してください"
+            continue
+        payload, field_group, error = _build_update_payload(fields, container, wrap_payload, post_type)
+        if error:
+            report[key] = error
+            continue
+        report[key] = "❌ 未実行"
+        jobs.append((key, payload))
+    
+    limit = 同時実行数 if 同時実行数 > 0 else WP_BULK_UPDATE_CONCURRENCY
+    
+    started = time.monotonic()
+    # 一括処理は対話的な読み取りより後回しにして送信する
+    async with _wp_client(WP_PRIORITY_BULK):
+        results = await _wp_batch_write(
+            [(f"{post_type}/{post_id}", payload) for post_id, payload in jobs],
+            concurrency=limit,
+        )
+    elapsed = time.monotonic() - started
+    
+    for (post_id, _), result in zip(jobs, results):
+        if isinstance(result, dict):
+            report[post_id] = f"✅ {result.get('title', {}).get('rendered', 'タイトル未設定')}"
+            continue
+        logger.error("[BulkUpdate] 一括更新失敗 %s id=%s : %s", post_type, post_id, result)
+        message = str(result)
+        report[post_id] = f"❌ {message[:200]}{'…' if len(message) > 200 else ''}"
+    
+    succeeded = sum(1 for line in report.values() if line.startswith("✅"))
+    lines = [
+        f"📦 一括更新（{field_group or post_type}）: 成功 {succeeded}件 / 失敗 {len(report) - succeeded}件（{elapsed:.1f}秒）",
+        "",
+    ]
+    lines.extend(f"{key}: {line}" for key, line in report.items())
+    if duplicates:
+        lines.append("")
+        lines.append(f"⚠️ 重複した投稿ID（最初の指定のみ更新）: {', '.join(dict.fromkeys(duplicates))}")
+    return "\n".join(lines)
+
+
 def _pilates_normalize_single_status(status: str | None) -> str:
     """ステータスを正規化（単一ステータス用）"""
     value = (status or "").strip().lower()
@@ -1094,6 +3854,209 @@ def _normalize_taxonomy_name(taxonomy_name: str) -> str:
     return normalized
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# タームインデックス（カテゴリー・カスタムタクソノミー共通）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# タクソノミーごとに全タームを取得して保持する。名前解決はローカルの辞書参照で行う。
+# キー: タクソノミースラッグ（"categories", "pilates-features", "studio_name" など）
+_term_indexes: dict[str, dict] = {}
+_term_index_locks: dict[str, asyncio.Lock] = {}
+
+
+def _term_index(taxonomy: str) -> dict:
+    """タクソノミーのインデックスを返す（なければ空で作成）"""
+    return _term_indexes.setdefault(taxonomy, {
+        "by_id": {},      # ID -> ターム
+        "by_name": {},    # 名前 -> ID
+        "by_slug": {},    # スラッグ -> ID
+        "loaded_at": None,
+    })
+
+
+def _term_index_add(taxonomy: str, term: dict) -> None:
+    """ターム1件をインデックスに追加"""
+    term_id = term.get('id')
+    if term_id is None:
+        return
+    index = _term_index(taxonomy)
+    index["by_id"][term_id] = term
+    name = term.get('name') or ""
+    if name:
+        index["by_name"][name] = term_id
+        # WordPressは名前をHTMLエスケープして返すため、元の表記でも引けるようにする
+        index["by_name"].setdefault(html.unescape(name), term_id)
+    if term.get('slug'):
+        index["by_slug"][term['slug']] = term_id
+
+
+def _term_index_is_fresh(taxonomy: str) -> bool:
+    loaded_at = _term_index(taxonomy)["loaded_at"]
+    return loaded_at is not None and time.monotonic() - loaded_at <= WP_TERM_INDEX_TTL
+
+
+def _term_index_lookup(taxonomy: str, name: str) -> int | None:
+    """名前またはスラッグからタームIDを引く"""
+    index = _term_index(taxonomy)
+    if name in index["by_name"]:
+        return index["by_name"][name]
+    return index["by_slug"].get(name)
+
+
+async def _load_term_index(client: httpx.AsyncClient, taxonomy: str, force: bool = False) -> None:
+    """
+    タームインデックスを読み込む（期限内なら何もしない）。
+    force=True の場合は期限に関係なく再取得する。
+    """
+    lock = _term_index_locks.setdefault(taxonomy, asyncio.Lock())
+    async with lock:
+        if not force and _term_index_is_fresh(taxonomy):
+            return
+        terms: list[dict] = []
+        async for page in _wp_iter_collection_pages(client, taxonomy, edit_context=False):
+            terms.extend(page)
+        _term_indexes.pop(taxonomy, None)
+        for term in terms:
+            _term_index_add(taxonomy, term)
+        _term_index(taxonomy)["loaded_at"] = time.monotonic()
+        logger.info(f"Term index loaded: {taxonomy} ({len(terms)} terms)")
+
+
+async def _resolve_term_ids(
+    client: httpx.AsyncClient,
+    taxonomy: str,
+    term_names: list[str],
+) -> tuple[list[int], list[str]]:
+    """
+    ターム名（またはスラッグ）のリストをIDに変換する。
+    見つからない名前があればインデックスを1度だけ再読み込みしてから判定する。
+    
+    Returns:
+        (見つかったIDのリスト（入力順）, 見つからなかった名前のリスト)
+    """
+    refreshed = not _term_index_is_fresh(taxonomy)
+    await _load_term_index(client, taxonomy)
+    
+    if not refreshed and any(_term_index_lookup(taxonomy, name) is None for name in term_names):
+        # 期限内でも未登録の名前があれば最新化する（他の経路で作成された場合）
+        await _load_term_index(client, taxonomy, force=True)
+    
+    term_ids: list[int] = []
+    missing: list[str] = []
+    for name in term_names:
+        term_id = _term_index_lookup(taxonomy, name)
+        if term_id is None:
+            missing.append(name)
+        elif term_id not in term_ids:
+            term_ids.append(term_id)
+    return term_ids, missing
+
+
+async def _get_terms_by_ids(
+    client: httpx.AsyncClient,
+    taxonomy: str,
+    term_ids: list[int],
+) -> dict[int, dict]:
+    """
+    タームIDのリストから詳細をまとめて取得する。
+    インデックスが期限内ならそこから返し、足りない分だけ include= で
+    100件ずつ（並列に）取得する。取得に失敗したIDは結果に含まれない。
+    """
+    found: dict[int, dict] = {}
+    if _term_index_is_fresh(taxonomy):
+        index = _term_index(taxonomy)
+        for term_id in term_ids:
+            if term_id in index["by_id"]:
+                found[term_id] = index["by_id"][term_id]
+    
+    missing = [term_id for term_id in dict.fromkeys(term_ids) if term_id not in found]
+    if not missing:
+        return found
+    
+    async def fetch_chunk(chunk: list[int]) -> list[dict]:
+        response = await _wp_get(
+            client,
+            taxonomy,
+            {"include": ",".join(map(str, chunk)), "per_page": len(chunk)},
+        )
+        if response.status_code != 200:
+            logger.warning(f"Failed to fetch {taxonomy} {chunk}: HTTP {response.status_code}")
+            return []
+        data = response.json()
+        return data if isinstance(data, list) else []
+    
+    chunks = [missing[i:i + WP_PAGE_SIZE] for i in range(0, len(missing), WP_PAGE_SIZE)]
+    for terms in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+        for term in terms:
+            found[term.get('id')] = term
+            if _term_index(taxonomy)["loaded_at"] is not None:
+                _term_index_add(taxonomy, term)
+    return found
+
+
+async def _create_terms(
+    client: httpx.AsyncClient,
+    taxonomy: str,
+    term_names: list[str],
+) -> None:
+    """
+    タームをまとめて（並列に）作成し、インデックスに追加する。
+    既に存在する場合（term_exists）は返されたIDを登録する。
+    
+    Raises:
+        RuntimeError: 作成に失敗したタームがある場合
+    """
+    async def create(name: str) -> str | None:
+        response = await _wp_send(
+            client,
+            "POST",
+            f"{WP_SITE_URL}/wp-json/wp/v2/{taxonomy}",
+            json={"name": name},
+            headers=get_auth_headers(),
+            timeout=30.0
+        )
+        try:
+            data = response.json() if response.text else {}
+        except ValueError:
+            data = None
+        if response.status_code < 400 and isinstance(data, dict):
+            _term_index_add(taxonomy, data)
+            logger.info(f"Term created: {taxonomy} / {name} (ID: {data.get('id')})")
+            return None
+        if isinstance(data, dict) and data.get('code') == 'term_exists':
+            term_id = (data.get('data') or {}).get('term_id')
+            if term_id:
+                _term_index_add(taxonomy, {"id": term_id, "name": name})
+                return None
+        return f"{name}: {_wp_error_message(response)}"
+    
+    errors = [error for error in await asyncio.gather(*(create(name) for name in term_names)) if error]
+    if errors:
+        raise RuntimeError("タームの作成に失敗しました: " + " / ".join(errors))
+
+
+async def _pilates_term_names_to_ids(taxonomy_name: str, term_names: list[str]) -> list[int]:
+    """
+    ターム名リストをタームIDリストに変換する（入力順を維持）。
+    インデックスにないタームはまとめて作成してから変換する。
+    
+    Raises:
+        RuntimeError: ターム一覧の取得または作成に失敗した場合
+    """
+    taxonomy = _normalize_taxonomy_name(taxonomy_name)
+    async with _wp_client() as client:
+        _, missing = await _resolve_term_ids(client, taxonomy, term_names)
+        if missing:
+            logger.info(f"Creating missing terms in {taxonomy}: {missing}")
+            await _create_terms(client, taxonomy, missing)
+    
+    term_ids: list[int] = []
+    for name in term_names:
+        term_id = _term_index_lookup(taxonomy, name)
+        if term_id is not None and term_id not in term_ids:
+            term_ids.append(term_id)
+    return term_ids
+
+
 # ========================================
 # ツール16: タクソノミーのターム一覧取得
 # ========================================
@@ -1114,21 +4077,14 @@ async def pilates_get_taxonomy_terms(タクソノミー名: str, 件数: int = 1
     # タクソノミー名を正規化（スラッグに変換）
     taxonomy_slug = _normalize_taxonomy_name(タクソノミー名)
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
             params = {
                 "per_page": min(max(件数, 1), 100),
                 "context": "edit"
             }
             
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/{taxonomy_slug}",
-                params=params,
-                headers=headers,
-                timeout=30.0
-            )
+            response = await _wp_get(client, taxonomy_slug, params)
             
             logger.debug(f"Response status: {response.status_code}")
             
@@ -1184,16 +4140,10 @@ async def pilates_get_post_taxonomy_terms(投稿ID: int, タクソノミー名:
     """
     logger.info(f"pilates_get_post_taxonomy_terms called with 投稿ID={投稿ID}, タクソノミー名={タクソノミー名}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}/{投稿ID}",
-                params={"context": "edit"},
-                headers=headers,
-                timeout=30.0
-            )
+            # pilates_by_id 等と同じキャッシュを共有
+            response = await _wp_get(client, f"{WP_POST_TYPE}/{投稿ID}", {"context": "edit"})
             
             logger.debug(f"Response status: {response.status_code}")
             
@@ -1284,7 +4234,7 @@ async def pilates_create_taxonomy_term(
     # タクソノミー名を正規化（スラッグに変換）
     taxonomy_slug = _normalize_taxonomy_name(タクソノミー名)
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
             headers = get_auth_headers()
             
@@ -1296,7 +4246,9 @@ async def pilates_create_taxonomy_term(
             if 説明:
                 payload["description"] = 説明
             
-            response = await client.post(
+            response = await _wp_send(
+                client,
+                "POST",
                 f"{WP_SITE_URL}/wp-json/wp/v2/{taxonomy_slug}",
                 json=payload,
                 headers=headers,
@@ -1312,6 +4264,8 @@ async def pilates_create_taxonomy_term(
                 return f"❌ ターム作成に失敗しました: {error_message}"
             
             term = response.json()
+            if _term_index(taxonomy_slug)["loaded_at"] is not None:
+                _term_index_add(taxonomy_slug, term)
             
             result = f"✅ タームを作成しました\n\n"
             result += f"🏷️ タクソノミー: {タクソノミー名}（スラッグ: {taxonomy_slug}）\n"
@@ -1349,6 +4303,7 @@ async def pilates_update_post_taxonomy_terms(
         ターム名リスト: ターム名のカンマ区切りリスト（例: "マシンピラティス,マットピラティス"）
     
     注意: タームIDリストとターム名リストの両方を指定した場合、タームIDリストが優先されます。
+    ターム名リストで指定したタームが存在しない場合は自動で作成されます。
     
     例:
         タクソノミー名: "特徴" または "pilates-features"
@@ -1362,7 +4317,7 @@ async def pilates_update_post_taxonomy_terms(
     # タクソノミー名を正規化（スラッグに変換）
     taxonomy_slug = _normalize_taxonomy_name(タクソノミー名)
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
             headers = get_auth_headers()
             
@@ -1372,11 +4327,18 @@ async def pilates_update_post_taxonomy_terms(
                 term_ids = [int(tid.strip()) for tid in タームIDリスト.split(",") if tid.strip()]
                 payload = {taxonomy_slug: term_ids}
             else:
-                # ターム名リストを使用
+                # ターム名リストを使用（タームインデックスでIDに変換し、ないタームはまとめて作成）
                 term_names = [name.strip() for name in ターム名リスト.split(",") if name.strip()]
-                payload = {taxonomy_slug: term_names}
+                try:
+                    term_ids = await _pilates_term_names_to_ids(taxonomy_slug, term_names)
+                except RuntimeError as exc:
+                    logger.error(f"Term resolution failed: {exc}")
+                    return f"❌ タームの解決に失敗しました: {exc}"
+                payload = {taxonomy_slug: term_ids}
             
-            response = await client.post(
+            response = await _wp_send(
+                client,
+                "POST",
                 f"{WP_SITE_URL}/wp-json/wp/v2/{WP_POST_TYPE}/{投稿ID}",
                 json=payload,
                 headers=headers,
@@ -1384,6 +4346,7 @@ async def pilates_update_post_taxonomy_terms(
             )
             
             logger.debug(f"Response status: {response.status_code}")
+            _post_cache_invalidate(WP_POST_TYPE, 投稿ID)
             
             if response.status_code >= 400:
                 error_data = response.json() if response.text else {}
@@ -1392,6 +4355,7 @@ async def pilates_update_post_taxonomy_terms(
                 return f"❌ ターム更新に失敗しました: {error_message}"
             
             post = response.json()
+            _mirror_apply_write(WP_POST_TYPE, post)
             title = post.get('title', {}).get('rendered', 'タイトル未設定')
             
             # 更新後のタームを取得
@@ -1404,8 +4368,17 @@ async def pilates_update_post_taxonomy_terms(
             result += f"設定されたターム:\n"
             
             if updated_terms:
-                for term in updated_terms:
-                    result += f"  • ID: {term.get('id')} | 名前: {term.get('name')}\n"
+                # WordPress はタームIDの配列を返すため、タームの詳細をまとめて取得する
+                term_ids = [
+                    int(term.get('id') if isinstance(term, dict) else term) for term in updated_terms
+                ]
+                terms = await _get_terms_by_ids(client, taxonomy_slug, term_ids)
+                for term_id in term_ids:
+                    term = terms.get(term_id)
+                    if term:
+                        result += f"  • ID: {term.get('id')} | 名前: {term.get('name')}\n"
+                    else:
+                        result += f"  • ID: {term_id} (詳細取得失敗)\n"
             else:
                 result += "  （タームが設定されていません）\n"
             
@@ -1446,6 +4419,7 @@ async def pilates_create_post(
         特徴ターム名リスト: 特徴タクソノミーのターム名（カンマ区切り、例: "マシンピラティス,マットピラティス"）
         スタジオ名タームIDリスト: スタジオ名タクソノミーのタームID（カンマ区切り）
         スタジオ名ターム名リスト: スタジオ名タクソノミーのターム名（カンマ区切り）
+        ※ ターム名で指定したタームが存在しない場合は自動で作成されます
     
     カスタムフィールドの構造:
     - 表用情報: 表用特徴、表用料金、表用アクセス
@@ -1484,20 +4458,24 @@ async def pilates_create_post(
     if fields:
         payload["meta"] = fields
     
-    # タクソノミータームの設定（スラッグを使用）
-    if 特徴タームIDリスト:
-        term_ids = [int(tid.strip()) for tid in 特徴タームIDリスト.split(",") if tid.strip()]
-        payload["pilates-features"] = term_ids
-    elif 特徴ターム名リスト:
-        term_names = [name.strip() for name in 特徴ターム名リスト.split(",") if name.strip()]
-        payload["pilates-features"] = term_names
-    
-    if スタジオ名タームIDリスト:
-        term_ids = [int(tid.strip()) for tid in スタジオ名タームIDリスト.split(",") if tid.strip()]
-        payload["studio_name"] = term_ids
-    elif スタジオ名ターム名リスト:
-        term_names = [name.strip() for name in スタジオ名ターム名リスト.split(",") if name.strip()]
-        payload["studio_name"] = term_names
+    # タクソノミータームの設定（スラッグを使用、ターム名はタームインデックスでIDに変換）
+    try:
+        if 特徴タームIDリスト:
+            term_ids = [int(tid.strip()) for tid in 特徴タームIDリスト.split(",") if tid.strip()]
+            payload["pilates-features"] = term_ids
+        elif 特徴ターム名リスト:
+            term_names = [name.strip() for name in 特徴ターム名リスト.split(",") if name.strip()]
+            payload["pilates-features"] = await _pilates_term_names_to_ids("pilates-features", term_names)
+        
+        if スタジオ名タームIDリスト:
+            term_ids = [int(tid.strip()) for tid in スタジオ名タームIDリスト.split(",") if tid.strip()]
+            payload["studio_name"] = term_ids
+        elif スタジオ名ターム名リスト:
+            term_names = [name.strip() for name in スタジオ名ターム名リスト.split(",") if name.strip()]
+            payload["studio_name"] = await _pilates_term_names_to_ids("studio_name", term_names)
+    except RuntimeError as exc:
+        logger.error("[Pilates] ターム解決失敗: %s", exc)
+        return f"❌ タームの解決に失敗しました。\n{exc}"
     
     try:
         post = await _pilates_wp_post(WP_POST_TYPE, payload)
@@ -1540,6 +4518,7 @@ async def pilates_update_post(
         特徴ターム名リスト: 特徴タクソノミーのターム名（カンマ区切り、例: "マシンピラティス,マットピラティス"）
         スタジオ名タームIDリスト: スタジオ名タクソノミーのタームID（カンマ区切り）
         スタジオ名ターム名リスト: スタジオ名タクソノミーのターム名（カンマ区切り）
+        ※ ターム名で指定したタームが存在しない場合は自動で作成されます
     
     カスタムフィールドの構造:
     - 表用情報: 表用特徴、表用料金、表用アクセス
@@ -1575,20 +4554,24 @@ async def pilates_update_post(
     if fields:
         payload.setdefault("meta", {}).update(fields)
     
-    # タクソノミータームの設定（スラッグを使用）
-    if 特徴タームIDリスト:
-        term_ids = [int(tid.strip()) for tid in 特徴タームIDリスト.split(",") if tid.strip()]
-        payload["pilates-features"] = term_ids
-    elif 特徴ターム名リスト:
-        term_names = [name.strip() for name in 特徴ターム名リスト.split(",") if name.strip()]
-        payload["pilates-features"] = term_names
-    
-    if スタジオ名タームIDリスト:
-        term_ids = [int(tid.strip()) for tid in スタジオ名タームIDリスト.split(",") if tid.strip()]
-        payload["studio_name"] = term_ids
-    elif スタジオ名ターム名リスト:
-        term_names = [name.strip() for name in スタジオ名ターム名リスト.split(",") if name.strip()]
-        payload["studio_name"] = term_names
+    # タクソノミータームの設定（スラッグを使用、ターム名はタームインデックスでIDに変換）
+    try:
+        if 特徴タームIDリスト:
+            term_ids = [int(tid.strip()) for tid in 特徴タームIDリスト.split(",") if tid.strip()]
+            payload["pilates-features"] = term_ids
+        elif 特徴ターム名リスト:
+            term_names = [name.strip() for name in 特徴ターム名リスト.split(",") if name.strip()]
+            payload["pilates-features"] = await _pilates_term_names_to_ids("pilates-features", term_names)
+        
+        if スタジオ名タームIDリスト:
+            term_ids = [int(tid.strip()) for tid in スタジオ名タームIDリスト.split(",") if tid.strip()]
+            payload["studio_name"] = term_ids
+        elif スタジオ名ターム名リスト:
+            term_names = [name.strip() for name in スタジオ名ターム名リスト.split(",") if name.strip()]
+            payload["studio_name"] = await _pilates_term_names_to_ids("studio_name", term_names)
+    except RuntimeError as exc:
+        logger.error("[Pilates] ターム解決失敗: %s", exc)
+        return f"❌ タームの解決に失敗しました。\n{exc}"
     
     if not payload:
         return "更新項目を1つ以上指定してください。"
@@ -1626,10 +4609,8 @@ async def media_free_content_list(
     """
     logger.info(f"media_free_content_list called with キーワード={キーワード}, 件数={件数}, status={status}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
             params = {
                 "per_page": min(max(件数, 1), 100),
                 "context": "edit",  # 編集コンテキストで下書きも取得可能に
@@ -1639,39 +4620,25 @@ async def media_free_content_list(
             if キーワード:
                 params["search"] = キーワード
             
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content",
-                params=params,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Response status: {response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if response.status_code in (401, 403) or (response.status_code != 200 and ("権限" in str(response.text) or "rest_forbidden" in str(response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                params.pop("context", None)
-                params.pop("status", None)
-                response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content",
-                    params=params,
-                    headers=headers,
-                    timeout=30.0
-                )
-            
-            # ステータスコードチェック
-            if response.status_code != 200:
-                error_data = response.json() if response.text else {}
-                logger.error(f"API Error: {response.status_code} - {error_data}")
-                return f"APIエラーが発生しました: {error_data.get('message', 'Unknown error')}"
-            
-            posts = response.json()
-            
-            # レスポンスが配列でない場合のチェック
-            if not isinstance(posts, list):
-                logger.error(f"Unexpected response format: {type(posts)}")
-                return f"予期しないレスポンス形式です"
+            # ローカルミラーが鮮度内なら全文検索インデックスで検索する
+            posts = _mirror_search_top("media-free-content", キーワード, status, params["per_page"])
+            if posts is not None:
+                logger.debug("Answered from local mirror")
+            else:
+                response = await _wp_get_projected(client, "media-free-content", params, MEDIA_FREE_CONTENT_LIST_FIELDS)
+                
+                # ステータスコードチェック
+                if response.status_code != 200:
+                    error_data = response.json() if response.text else {}
+                    logger.error(f"API Error: {response.status_code} - {error_data}")
+                    return f"APIエラーが発生しました: {error_data.get('message', 'Unknown error')}"
+                
+                posts = response.json()
+                
+                # レスポンスが配列でない場合のチェック
+                if not isinstance(posts, list):
+                    logger.error(f"Unexpected response format: {type(posts)}")
+                    return f"予期しないレスポンス形式です"
             
             logger.debug(f"Found {len(posts)} posts")
             
@@ -1710,10 +4677,8 @@ async def media_free_content_detail(タイトル: str, status: str = "publish,dr
     """
     logger.info(f"media_free_content_detail called with タイトル={タイトル}, status={status}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
             # 投稿を検索（下書き含む）
             logger.debug(f"Searching for post: {タイトル}")
             search_params = {
@@ -1722,26 +4687,7 @@ async def media_free_content_detail(タイトル: str, status: str = "publish,dr
                 "context": "edit",  # 編集コンテキストで下書きも取得可能に
                 "status": _build_status_param(status)  # カンマ区切りで複数ステータスを指定可能
             }
-            search_response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content",
-                params=search_params,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Search response status: {search_response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if search_response.status_code in (401, 403) or (search_response.status_code != 200 and ("権限" in str(search_response.text) or "rest_forbidden" in str(search_response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                search_params.pop("context", None)
-                search_params.pop("status", None)
-                search_response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content",
-                    params=search_params,
-                    headers=headers,
-                    timeout=30.0
-                )
+            search_response = await _wp_get_edit_context(client, "media-free-content", search_params)
             
             # ステータスコードチェック
             if search_response.status_code != 200:
@@ -1762,36 +4708,22 @@ async def media_free_content_detail(タイトル: str, status: str = "publish,dr
                 logger.warning(f"No posts found for: {タイトル}")
                 return f"「{タイトル}」が見つかりませんでした。"
             
-            post_id = posts[0]['id']
+            post = posts[0]
+            post_id = post['id']
             logger.info(f"Found post ID: {post_id}")
             
-            # 詳細取得（編集コンテキストで下書きも取得可能に）
-            logger.debug(f"Fetching details for post ID: {post_id}")
-            detail_response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content/{post_id}",
-                params={"context": "edit"},
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Detail response status: {detail_response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if detail_response.status_code in (401, 403) or (detail_response.status_code != 200 and ("権限" in str(detail_response.text) or "rest_forbidden" in str(detail_response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                detail_response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content/{post_id}",
-                    params={},
-                    headers=headers,
-                    timeout=30.0
-                )
-            
-            # ステータスコードをチェック
-            if detail_response.status_code != 200:
-                logger.error(f"HTTP error: {detail_response.status_code}")
-                return f"エラーが発生しました: HTTPステータス {detail_response.status_code}"
-            
-            post = detail_response.json()
+            # 検索結果は詳細取得と同じ投稿オブジェクトなので、そのまま表示する。
+            # 必要な項目が欠けている場合のみ詳細を取得し直す
+            if _post_missing_detail_fields(post, require_custom_fields=False):
+                logger.debug(f"Fetching details for post ID: {post_id}")
+                detail_response = await _wp_get_edit_context(client, f"media-free-content/{post_id}")
+                
+                # ステータスコードをチェック
+                if detail_response.status_code != 200:
+                    logger.error(f"HTTP error: {detail_response.status_code}")
+                    return f"エラーが発生しました: HTTPステータス {detail_response.status_code}"
+                
+                post = detail_response.json()
             logger.debug(f"Post data keys: {post.keys()}")
             
             # titleキーが存在するかチェック
@@ -1846,29 +4778,10 @@ async def media_free_content_by_id(投稿ID: int) -> str:
     """
     logger.info(f"media_free_content_by_id called with ID={投稿ID}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
             logger.debug(f"Fetching media-free-content post with ID: {投稿ID}")
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content/{投稿ID}",
-                params={"context": "edit"},  # 編集コンテキストで下書きも取得可能に
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Response status: {response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if response.status_code in (401, 403) or (response.status_code != 200 and ("権限" in str(response.text) or "rest_forbidden" in str(response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content/{投稿ID}",
-                    params={},
-                    headers=headers,
-                    timeout=30.0
-                )
+            response = await _wp_get_edit_context(client, f"media-free-content/{投稿ID}")
             
             # ステータスコードをチェック
             if response.status_code == 404:
@@ -1884,37 +4797,7 @@ async def media_free_content_by_id(投稿ID: int) -> str:
             if 'title' not in post or 'rendered' not in post.get('title', {}):
                 return f"ID {投稿ID} のデータ形式が正しくありません。レスポンス: {post}"
             
-            status_emoji = get_status_emoji(post.get('status', ''))
-            result = f"━━━━━━━━━━━━━━━━━━━━\n"
-            result += f"{status_emoji} {post['title']['rendered']}\n"
-            result += f"🆔 ID: {post['id']} | ステータス: {post.get('status', '不明')}\n"
-            result += f"📅 公開日: {post.get('date', 'N/A')} | 最終更新: {post.get('modified', 'N/A')}\n"
-            result += f"━━━━━━━━━━━━━━━━━━━━\n\n"
-            
-            # 本文（完全なHTMLを含む）
-            result += "━━━ 📝 本文 ━━━\n\n"
-            # content.raw（編集用の生のコンテンツ）があればそれを使用、なければrenderedを使用
-            if post.get('content', {}).get('raw'):
-                content = post['content']['raw']
-                result += f"{content}\n\n"
-            elif post.get('content', {}).get('rendered'):
-                content = post['content']['rendered']
-                result += f"{content}\n\n"
-            else:
-                result += "本文が見つかりませんでした。\n\n"
-            
-            # カスタムフィールドをすべて表示（完全な構造）
-            fields = _get_custom_fields_from_post(post)
-            if fields:
-                result += _format_fields_for_display(fields, include_internal=False)
-            else:
-                result += "【カスタムフィールド】\n\n"
-                result += "カスタムフィールドが見つかりませんでした。\n"
-                result += f"利用可能なキー: {', '.join(post.keys())}\n"
-            
-            result += f"\n🔗 {post['link']}\n"
-            
-            return result
+            return _format_media_free_content_by_id(post)
         
         except Exception as e:
             logger.exception(f"Error in media_free_content_by_id: {e}")
@@ -1940,29 +4823,10 @@ async def media_free_content_get_fields_raw(投稿ID: int, include_internal: boo
     """
     logger.info(f"media_free_content_get_fields_raw called with ID={投稿ID}, include_internal={include_internal}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
             logger.debug(f"Fetching media-free-content post with ID: {投稿ID}")
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content/{投稿ID}",
-                params={"context": "edit"},
-                headers=headers,
-                timeout=30.0
-            )
-            
-            logger.debug(f"Response status: {response.status_code}")
-            
-            # 権限エラーの場合はcontext=editを削除して再試行
-            if response.status_code in (401, 403) or (response.status_code != 200 and ("権限" in str(response.text) or "rest_forbidden" in str(response.text))):
-                logger.warning("context=editで権限エラーが発生。context=editなしで再試行します。")
-                response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/media-free-content/{投稿ID}",
-                    params={},
-                    headers=headers,
-                    timeout=30.0
-                )
+            response = await _wp_get_edit_context(client, f"media-free-content/{投稿ID}")
             
             if response.status_code == 404:
                 return f"ID {投稿ID} の投稿が見つかりませんでした。"
@@ -2018,7 +4882,39 @@ async def media_free_content_get_fields_raw(投稿ID: int, include_internal: boo
             return result
         
         except Exception as e:
-            logger.exception(f"Error in media_free_content_get_fields_raw: {e}")
+            logger.exception(f"Error in media_free_content_get_fields_raw: {e}")
+            return f"エラーが発生しました: {str(e)}"
+
+
+# ========================================
+# ツール8-3: media-free-content 複数IDでまとめて取得
+# ========================================
+@mcp.tool()
+async def media_free_content_by_ids(投稿IDリスト: str) -> str:
+    """
+    複数の投稿IDを指定してmedia-free-content投稿の情報をまとめて取得します（下書き含む）。
+    media_free_content_by_id と同じ内容を、指定した順番で1つの結果として返します。
+    
+    Args:
+        投稿IDリスト: カンマ区切りの投稿ID（例: "12,34,56"）
+    """
+    logger.info(f"media_free_content_by_ids called with IDs={投稿IDリスト}")
+    
+    post_ids, error = _parse_post_id_list(投稿IDリスト)
+    if error:
+        return error
+    
+    async with _wp_client(WP_PRIORITY_INTERACTIVE) as client:
+        try:
+            # キャッシュ済みの投稿は再利用し、残りは include= でまとめて取得する
+            posts = await _wp_get_posts_by_ids(client, "media-free-content", post_ids)
+            return _format_posts_by_ids(post_ids, posts, _format_media_free_content_by_id, "投稿")
+        
+        except RuntimeError as exc:
+            logger.error(f"API Error in media_free_content_by_ids: {exc}")
+            return f"APIエラーが発生しました: {exc}"
+        except Exception as e:
+            logger.exception(f"Error in media_free_content_by_ids: {e}")
             return f"エラーが発生しました: {str(e)}"
 
 
@@ -2045,24 +4941,10 @@ async def _media_free_content_handle_update_tool(
     if not isinstance(data, dict) or not data:
         return "❌ JSONはキーと値を持つオブジェクト形式で指定してください。"
     
-    container = (container or "meta").strip()
-    wrap_payload = bool(wrap_payload)
-    
-    if wrap_payload:
-        # containerでラップして送信
-        if container not in ("custom_fields", "meta", "acf"):
-            return (
-                f"❌ container='{container}' はサポートされていません。"
-                " 使用可能: custom_fields / meta / acf"
-            )
-        payload = {container: data}
-        summary_fields = data
-        field_group = f"media-free-content:{container}"
-    else:
-        # そのまま送信
-        payload = data
-        summary_fields = data
-        field_group = "media-free-content:raw"
+    payload, field_group, error = _build_update_payload(data, container, wrap_payload, "media-free-content")
+    if error:
+        return error
+    summary_fields = data
     
     logger.info(
         "[MediaFreeContent] 更新開始 id=%s container=%s wrap=%s",
@@ -2346,28 +5228,16 @@ async def post_create(
         category_ids = [int(cid.strip()) for cid in カテゴリーIDリスト.split(",") if cid.strip()]
         payload["categories"] = category_ids
     elif カテゴリー名リスト:
-        # カテゴリー名からIDを取得
-        async with httpx.AsyncClient() as client:
-            headers = get_auth_headers()
+        # カテゴリー名からIDを取得（カテゴリーインデックスを参照）
+        async with _wp_client() as client:
             category_names = [name.strip() for name in カテゴリー名リスト.split(",") if name.strip()]
-            category_ids = []
-            
-            for cat_name in category_names:
-                search_response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/categories",
-                    params={"search": cat_name, "per_page": 10},
-                    headers=headers,
-                    timeout=30.0
-                )
-                if search_response.status_code == 200:
-                    cats = search_response.json()
-                    matched = None
-                    for cat in cats:
-                        if cat.get('name') == cat_name:
-                            matched = cat
-                            break
-                    if matched:
-                        category_ids.append(matched.get('id'))
+            try:
+                category_ids, missing = await _resolve_term_ids(client, "categories", category_names)
+            except RuntimeError as exc:
+                return f"❌ カテゴリー一覧の取得に失敗しました: {exc}"
+            
+            for cat_name in missing:
+                logger.warning(f"Category '{cat_name}' not found")
             
             if category_ids:
                 payload["categories"] = category_ids
@@ -2439,28 +5309,16 @@ async def post_update(
         category_ids = [int(cid.strip()) for cid in カテゴリーIDリスト.split(",") if cid.strip()]
         payload["categories"] = category_ids
     elif カテゴリー名リスト:
-        # カテゴリー名からIDを取得
-        async with httpx.AsyncClient() as client:
-            headers = get_auth_headers()
+        # カテゴリー名からIDを取得（カテゴリーインデックスを参照）
+        async with _wp_client() as client:
             category_names = [name.strip() for name in カテゴリー名リスト.split(",") if name.strip()]
-            category_ids = []
-            
-            for cat_name in category_names:
-                search_response = await client.get(
-                    f"{WP_SITE_URL}/wp-json/wp/v2/categories",
-                    params={"search": cat_name, "per_page": 10},
-                    headers=headers,
-                    timeout=30.0
-                )
-                if search_response.status_code == 200:
-                    cats = search_response.json()
-                    matched = None
-                    for cat in cats:
-                        if cat.get('name') == cat_name:
-                            matched = cat
-                            break
-                    if matched:
-                        category_ids.append(matched.get('id'))
+            try:
+                category_ids, missing = await _resolve_term_ids(client, "categories", category_names)
+            except RuntimeError as exc:
+                return f"❌ カテゴリー一覧の取得に失敗しました: {exc}"
+            
+            for cat_name in missing:
+                logger.warning(f"Category '{cat_name}' not found")
             
             if category_ids:
                 payload["categories"] = category_ids
@@ -2477,6 +5335,38 @@ async def post_update(
     return _pilates_format_post_action_result("✅ 通常投稿を更新しました", post)
 
 
+# ========================================
+# ツール15-2: 通常投稿を複数IDでまとめて取得
+# ========================================
+@mcp.tool()
+async def post_by_ids(投稿IDリスト: str) -> str:
+    """
+    複数の投稿IDを指定して通常投稿（posts）の情報をまとめて取得します（下書き含む）。
+    タイトル・ステータス・日付・カテゴリー・本文の冒頭を、指定した順番で1つの結果として返します。
+    
+    Args:
+        投稿IDリスト: カンマ区切りの投稿ID（例: "12,34,56"）
+    """
+    logger.info(f"post_by_ids called with IDs={投稿IDリスト}")
+    
+    post_ids, error = _parse_post_id_list(投稿IDリスト)
+    if error:
+        return error
+    
+    async with _wp_client(WP_PRIORITY_INTERACTIVE) as client:
+        try:
+            # キャッシュ済みの投稿は再利用し、残りは include= でまとめて取得する
+            posts = await _wp_get_posts_by_ids(client, "posts", post_ids)
+            return _format_posts_by_ids(post_ids, posts, _format_post_by_id, "投稿")
+        
+        except RuntimeError as exc:
+            logger.error(f"API Error in post_by_ids: {exc}")
+            return f"APIエラーが発生しました: {exc}"
+        except Exception as e:
+            logger.exception(f"Error in post_by_ids: {e}")
+            return f"エラーが発生しました: {str(e)}"
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 通常投稿（posts）カテゴリー用ツール
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -2497,21 +5387,14 @@ async def post_get_categories(件数: int = 100) -> str:
     """
     logger.info(f"post_get_categories called with 件数={件数}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
             params = {
                 "per_page": min(max(件数, 1), 100),
                 "context": "edit"
             }
             
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/categories",
-                params=params,
-                headers=headers,
-                timeout=30.0
-            )
+            response = await _wp_get(client, "categories", params)
             
             logger.debug(f"Response status: {response.status_code}")
             
@@ -2565,16 +5448,9 @@ async def post_get_post_categories(投稿ID: int) -> str:
     """
     logger.info(f"post_get_post_categories called with 投稿ID={投稿ID}")
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
-            headers = get_auth_headers()
-            
-            response = await client.get(
-                f"{WP_SITE_URL}/wp-json/wp/v2/posts/{投稿ID}",
-                params={"context": "edit"},
-                headers=headers,
-                timeout=30.0
-            )
+            response = await _wp_get(client, f"posts/{投稿ID}", {"context": "edit"})
             
             logger.debug(f"Response status: {response.status_code}")
             
@@ -2603,14 +5479,11 @@ async def post_get_post_categories(投稿ID: int) -> str:
                 # カテゴリーの詳細情報を取得
                 if category_ids:
                     result += "📂 カテゴリー詳細:\n\n"
+                    # まとめて1回で取得（インデックスにあればリクエストなし）
+                    categories = await _get_terms_by_ids(client, "categories", category_ids)
                     for cat_id in category_ids:
-                        cat_response = await client.get(
-                            f"{WP_SITE_URL}/wp-json/wp/v2/categories/{cat_id}",
-                            headers=headers,
-                            timeout=30.0
-                        )
-                        if cat_response.status_code == 200:
-                            cat = cat_response.json()
+                        cat = categories.get(cat_id)
+                        if cat:
                             result += f"  • ID: {cat.get('id')} | 名前: {cat.get('name')} | スラッグ: {cat.get('slug', 'N/A')}\n"
                         else:
                             result += f"  • ID: {cat_id} (詳細取得失敗)\n"
@@ -2653,7 +5526,7 @@ async def post_create_category(
     if not clean_category_name:
         return "カテゴリー名を指定してください。"
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
             headers = get_auth_headers()
             
@@ -2667,7 +5540,9 @@ async def post_create_category(
             if 親カテゴリーID and 親カテゴリーID > 0:
                 payload["parent"] = 親カテゴリーID
             
-            response = await client.post(
+            response = await _wp_send(
+                client,
+                "POST",
                 f"{WP_SITE_URL}/wp-json/wp/v2/categories",
                 json=payload,
                 headers=headers,
@@ -2683,6 +5558,8 @@ async def post_create_category(
                 return f"❌ カテゴリー作成に失敗しました: {error_message}"
             
             category = response.json()
+            if _term_index("categories")["loaded_at"] is not None:
+                _term_index_add("categories", category)
             
             result = f"✅ カテゴリーを作成しました\n\n"
             result += f"🆔 ID: {category.get('id')}\n"
@@ -2728,7 +5605,7 @@ async def post_update_post_categories(
     if not カテゴリーIDリスト and not カテゴリー名リスト:
         return "カテゴリーIDリストまたはカテゴリー名リストを指定してください。"
     
-    async with httpx.AsyncClient() as client:
+    async with _wp_client() as client:
         try:
             headers = get_auth_headers()
             
@@ -2738,39 +5615,21 @@ async def post_update_post_categories(
                 category_ids = [int(cid.strip()) for cid in カテゴリーIDリスト.split(",") if cid.strip()]
                 payload = {"categories": category_ids}
             else:
-                # カテゴリー名リストを使用（まず名前からIDを取得する必要がある）
+                # カテゴリー名リストを使用（カテゴリーインデックスでIDに変換）
                 category_names = [name.strip() for name in カテゴリー名リスト.split(",") if name.strip()]
-                category_ids = []
+                category_ids, missing = await _resolve_term_ids(client, "categories", category_names)
                 
-                # 各カテゴリー名からIDを取得
-                for cat_name in category_names:
-                    search_response = await client.get(
-                        f"{WP_SITE_URL}/wp-json/wp/v2/categories",
-                        params={"search": cat_name, "per_page": 10},
-                        headers=headers,
-                        timeout=30.0
-                    )
-                    if search_response.status_code == 200:
-                        cats = search_response.json()
-                        # 完全一致するカテゴリーを探す
-                        matched = None
-                        for cat in cats:
-                            if cat.get('name') == cat_name:
-                                matched = cat
-                                break
-                        if matched:
-                            category_ids.append(matched.get('id'))
-                        else:
-                            logger.warning(f"Category '{cat_name}' not found")
-                    else:
-                        logger.warning(f"Failed to search category '{cat_name}'")
+                for cat_name in missing:
+                    logger.warning(f"Category '{cat_name}' not found")
                 
                 if not category_ids:
                     return f"❌ 指定されたカテゴリー名が見つかりませんでした: {カテゴリー名リスト}"
                 
                 payload = {"categories": category_ids}
             
-            response = await client.post(
+            response = await _wp_send(
+                client,
+                "POST",
                 f"{WP_SITE_URL}/wp-json/wp/v2/posts/{投稿ID}",
                 json=payload,
                 headers=headers,
@@ -2778,6 +5637,7 @@ async def post_update_post_categories(
             )
             
             logger.debug(f"Response status: {response.status_code}")
+            _post_cache_invalidate("posts", 投稿ID)
             
             if response.status_code >= 400:
                 error_data = response.json() if response.text else {}
@@ -2797,15 +5657,11 @@ async def post_update_post_categories(
             result += f"設定されたカテゴリー:\n"
             
             if updated_category_ids:
-                # カテゴリーの詳細情報を取得
+                # カテゴリーの詳細情報をまとめて取得
+                categories = await _get_terms_by_ids(client, "categories", updated_category_ids)
                 for cat_id in updated_category_ids:
-                    cat_response = await client.get(
-                        f"{WP_SITE_URL}/wp-json/wp/v2/categories/{cat_id}",
-                        headers=headers,
-                        timeout=30.0
-                    )
-                    if cat_response.status_code == 200:
-                        cat = cat_response.json()
+                    cat = categories.get(cat_id)
+                    if cat:
                         result += f"  • ID: {cat.get('id')} | 名前: {cat.get('name')}\n"
                     else:
                         result += f"  • ID: {cat_id} (詳細取得失敗)\n"
@@ -2819,6 +5675,994 @@ async def post_update_post_categories(
             return f"エラーが発生しました: {str(e)}"
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# ピラティススタジオ検索ツール（ローカルインデックス）
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# ========================================
+# ツール25: ファセット検索
+# ========================================
+@mcp.tool()
+async def pilates_facet_search(
+    ジャンル: str = "",
+    レッスン方式: str = "",
+    男性利用可否: str = "",
+    駐車場: str = "",
+    料金下限: int = 0,
+    料金上限: int = 0,
+    件数: int = 20,
+    status: str = "publish,draft"
+) -> str:
+    """
+    ジャンル・レッスン方式・男性利用可否・駐車場・月額料金の条件を組み合わせてスタジオを絞り込みます。
+    各項目の値ごとの件数（ファセット件数）も返すので、次に絞り込む条件の検討に使えます。
+    
+    Args:
+        ジャンル: ジャンル（例: "マシンピラティス"）。カンマ区切りでいずれかに一致
+        レッスン方式: レッスン方式（例: "グループ,パーソナル"）
+        男性利用可否: 男性利用可否（例: "可"）
+        駐車場: 駐車場（例: "あり"）
+        料金下限: 月額料金の下限（円、0で指定なし。価格・表用料金から抽出した最安値）
+        料金上限: 月額料金の上限（円、0で指定なし）
+        件数: 表示する件数
+        status: 対象の投稿ステータス（例: "publish", "draft", "publish,draft"）
+    
+    Example:
+        ジャンル: "マシンピラティス", 男性利用可否: "可", 駐車場: "あり", 料金上限: 10000
+    """
+    logger.info(
+        f"pilates_facet_search called with ジャンル={ジャンル}, レッスン方式={レッスン方式}, "
+        f"男性利用可否={男性利用可否}, 駐車場={駐車場}, 料金={料金下限}-{料金上限}, status={status}"
+    )
+    
+    try:
+        # ファセット・料金インデックス（ミラー、またはミラー無効時は全件取得したスナップショットから構築）
+        if not await _index_ensure_fresh():
+            return "❌ スタジオ一覧を取得できなかったため、ファセット検索を実行できません（pilates_diagnostics で状態を確認してください）。"
+        _facet_index_ensure()
+        _price_index_ensure()
+        
+        # ステータス → 各ファセット → 料金 の順にビットセットの積を取る
+        status_bits = _facet_index["bits"].get("status", {})
+        hits = 0
+        for s in _build_status_param(status).split(","):
+            hits |= status_bits.get(s, 0)
+        
+        conditions = {"ジャンル": ジャンル, "レッスン方式": レッスン方式, "男性利用可否": 男性利用可否, "駐車場": 駐車場}
+        for facet, query in conditions.items():
+            if query.strip():
+                hits &= _facet_match_bits(facet, query)
+        if 料金下限 > 0 or 料金上限 > 0:
+            hits &= _facet_price_bits(料金下限, 料金上限)
+        
+        total = hits.bit_count()
+        result = "🔎 ファセット検索結果\n"
+        applied = [f"{facet}={query}" for facet, query in conditions.items() if query.strip()]
+        if 料金下限 > 0 or 料金上限 > 0:
+            applied.append(f"料金={料金下限 or ''}〜{料金上限 or ''}円")
+        result += f"条件: {', '.join(applied) if applied else 'なし'}\n"
+        result += f"該当: {total}件\n\n"
+        
+        if not total:
+            return result + "条件に一致するスタジオが見つかりませんでした。"
+        
+        # 該当スタジオ（料金の安い順、料金不明は後ろ）
+        hit_ids = _bits_to_ids(hits)
+        prices = {post_id: entry["monthly"] for post_id, entry in _price_index["by_post"].items() if entry["monthly"] is not None}
+        hit_ids.sort(key=lambda post_id: (post_id not in prices, prices.get(post_id, 0), post_id))
+        shown = hit_ids[:max(件数, 1)]
+        rows = {row["id"]: row for row in _index_source_rows("*", shown)}
+        
+        result += f"━━━ 🏢 スタジオ（{len(shown)}件表示） ━━━\n\n"
+        for post_id in shown:
+            row = rows.get(post_id)
+            if row is None:
+                continue
+            fields = json.loads(row["fields"] or "{}")
+            result += f"{get_status_emoji(row['status'] or '')} {row['title']}\n"
+            result += f"🆔 ID: {post_id} | ステータス: {row['status']}\n"
+            area = _facet_field_text(fields.get('簡易地区'))
+            if area:
+                result += f"📌 エリア: {area}\n"
+            price = _facet_field_text(fields.get('表用料金'))
+            if price:
+                result += f"💰 料金: {price}\n"
+            result += f"🔗 {row['link']}\n\n"
+        
+        # ファセット件数（該当スタジオ内での値ごとの件数）
+        result += "━━━ 📊 ファセット件数 ━━━\n\n"
+        for facet in FACET_FIELDS:
+            counts = [
+                (value, (value_bits & hits).bit_count())
+                for value, value_bits in _facet_index["bits"].get(facet, {}).items()
+            ]
+            counts = sorted((item for item in counts if item[1]), key=lambda item: (-item[1], item[0]))
+            if counts:
+                result += f"{facet}: " + " / ".join(f"{value}({count})" for value, count in counts[:10]) + "\n"
+        
+        return result
+    
+    except Exception as e:
+        logger.exception(f"Error in pilates_facet_search: {e}")
+        return f"エラーが発生しました: {str(e)}"
+
+
+# ========================================
+# ツール26: 料金で検索・並べ替え
+# ========================================
+@mcp.tool()
+async def pilates_price_search(
+    種別: str = "月額",
+    エリア: str = "",
+    料金下限: int = 0,
+    料金上限: int = 0,
+    件数: int = 10,
+    並び順: str = "安い順",
+    エリア別: bool = False,
+    status: str = "publish,draft"
+) -> str:
+    """
+    料金（月額・体験・初期費用）の範囲でスタジオを検索し、安い順または高い順に並べます。
+    料金は 価格・表用料金・体験・初期費用 のカスタムフィールドから抽出した数値です。
+    
+    Args:
+        種別: "月額" / "体験" / "初期費用"
+        エリア: エリア名で絞り込み（例: "渋谷"、空欄で全エリア）
+        料金下限: 下限（円、0で指定なし）
+        料金上限: 上限（円、0で指定なし）
+        件数: 表示件数（エリア別の場合はエリアごとの件数）
+        並び順: "安い順" または "高い順"
+        エリア別: True の場合、簡易地区ごとに上位を表示（例: エリアごとの最安スタジオ）
+        status: 対象の投稿ステータス（例: "publish", "draft", "publish,draft"）
+    
+    Example:
+        渋谷で月額の安い順に5件: 種別="月額", エリア="渋谷", 件数=5
+        エリアごとの体験最安: 種別="体験", 件数=1, エリア別=True
+    """
+    logger.info(
+        f"pilates_price_search called with 種別={種別}, エリア={エリア}, 料金={料金下限}-{料金上限}, "
+        f"件数={件数}, 並び順={並び順}, エリア別={エリア別}, status={status}"
+    )
+    
+    kind = PRICE_KINDS.get(種別.strip())
+    if kind is None:
+        return f"❌ 種別は {' / '.join(PRICE_KINDS)} のいずれかを指定してください。"
+    if 並び順 not in ("安い順", "高い順"):
+        return "❌ 並び順は \"安い順\" または \"高い順\" を指定してください。"
+    
+    try:
+        # 料金インデックス（ミラー、またはミラー無効時は全件取得したスナップショットから構築）
+        if not await _index_ensure_fresh():
+            return "❌ スタジオ一覧を取得できなかったため、料金検索を実行できません（pilates_diagnostics で状態を確認してください）。"
+        _price_index_ensure()
+        area_ids = _area_index_lookup(エリア) if エリア.strip() else None
+        statuses = set(_build_status_param(status).split(","))
+        limit = max(件数, 1)
+        
+        entries = _price_range(kind, 料金下限, 料金上限)
+        if 並び順 == "高い順":
+            entries = reversed(entries)
+        
+        # 昇順（降順）リストを先頭から見て、条件に合うものを件数まで集める
+        groups: dict[str, list[tuple[int, int]]] = {}
+        for price, post_id in entries:
+            entry = _price_index["by_post"][post_id]
+            if entry["status"] not in statuses:
+                continue
+            if area_ids is not None and post_id not in area_ids:
+                continue
+            group = groups.setdefault((entry["area"] or "エリア未設定") if エリア別 else "", [])
+            if len(group) < limit:
+                group.append((price, post_id))
+            elif not エリア別:
+                break
+        
+        hits = [item for group in groups.values() for item in group]
+        if not hits:
+            return "条件に一致するスタジオが見つかりませんでした。"
+        
+        rows = {row["id"]: row for row in _index_source_rows("*", [post_id for _, post_id in hits])}
+        labels = {value: label for label, value in PRICE_KINDS.items()}
+        
+        result = f"💰 {種別}料金の{並び順}（{len(hits)}件）\n"
+        if エリア.strip():
+            result += f"エリア: {エリア}\n"
+        if 料金下限 > 0 or 料金上限 > 0:
+            result += f"範囲: {料金下限 or ''}〜{料金上限 or ''}円\n"
+        result += "\n"
+        
+        # エリアは先頭（最安または最高）のスタジオの順に並ぶ
+        for group_name, group in groups.items():
+            if エリア別:
+                result += f"━━━ 📌 {group_name} ━━━\n\n"
+            for price, post_id in group:
+                row = rows.get(post_id)
+                if row is None:
+                    continue
+                entry = _price_index["by_post"][post_id]
+                result += f"{get_status_emoji(row['status'] or '')} {row['title']}\n"
+                result += f"🆔 ID: {post_id} | ステータス: {row['status']}\n"
+                result += f"💴 {種別}: {price:,}円\n"
+                others = [
+                    f"{labels[other]} {entry[other]:,}円"
+                    for other in PRICE_KINDS.values()
+                    if other != kind and entry[other] is not None
+                ]
+                if others:
+                    result += f"   ({' / '.join(others)})\n"
+                if entry["area"] and not エリア別:
+                    result += f"📌 エリア: {entry['area']}\n"
+                result += f"🔗 {row['link']}\n\n"
+        
+        return result
+    
+    except Exception as e:
+        logger.exception(f"Error in pilates_price_search: {e}")
+        return f"エラーが発生しました: {str(e)}"
+
+
+# ========================================
+# ツール27: キャンペーン一覧
+# ========================================
+@mcp.tool()
+async def pilates_campaigns(
+    基準日: str = "",
+    種別: str = "実施中",
+    日数: int = 14,
+    status: str = "publish,draft"
+) -> str:
+    """
+    キャンペーン期間から、基準日時点で実施中・開始予定・終了済みのキャンペーンを一覧します。
+    各スタジオの詳細を取得せず、ローカルのキャンペーン期間インデックスから回答します。
+    
+    Args:
+        基準日: 基準日（例: "2024-10-15"、空欄で今日）
+        種別: "実施中" / "開始予定"（日数以内に開始）/ "終了"（過去の日数以内に終了）/ "すべて"
+        日数: 開始予定・終了の対象とする日数
+        status: 対象の投稿ステータス（例: "publish", "draft", "publish,draft"）
+    """
+    logger.info(f"pilates_campaigns called with 基準日={基準日}, 種別={種別}, 日数={日数}, status={status}")
+    
+    sections = {"実施中": "active", "開始予定": "upcoming", "終了": "expired"}
+    if 種別 != "すべて" and 種別 not in sections:
+        return "❌ 種別は \"実施中\" / \"開始予定\" / \"終了\" / \"すべて\" のいずれかを指定してください。"
+    
+    if 基準日.strip():
+        try:
+            on = date.fromisoformat(unicodedata.normalize("NFKC", 基準日).strip().replace("/", "-"))
+        except ValueError:
+            return "❌ 基準日は \"2024-10-15\" の形式で指定してください。"
+    else:
+        on = date.today()
+    
+    try:
+        # キャンペーン期間インデックス（ミラー、またはミラー無効時は全件取得したスナップショットから構築）
+        if not await _index_ensure_fresh():
+            return "❌ スタジオ一覧を取得できなかったため、キャンペーン一覧を取得できません（pilates_diagnostics で状態を確認してください）。"
+        _campaign_index_ensure()
+        groups = _campaign_query(on, max(日数, 0))
+        
+        statuses = set(_build_status_param(status).split(","))
+        all_ids = set().union(*groups.values())
+        rows = {
+            row["id"]: row
+            for row in _index_source_rows("*", all_ids)
+            if row["status"] in statuses
+        }
+        
+        def format_day(ordinal: int) -> str:
+            if ordinal in (_CAMPAIGN_OPEN_START, _CAMPAIGN_OPEN_END):
+                return ""
+            return date.fromordinal(ordinal).isoformat()
+        
+        # 実施中は終了の近い順、開始予定は開始の近い順、終了は最近終了した順
+        sort_keys = {
+            "active": lambda post_id: _campaign_index["by_post"][post_id][1],
+            "upcoming": lambda post_id: _campaign_index["by_post"][post_id][0],
+            "expired": lambda post_id: -_campaign_index["by_post"][post_id][1],
+        }
+        
+        result = f"🎉 キャンペーン一覧（基準日: {on.isoformat()}）\n\n"
+        for label, key in sections.items():
+            if 種別 != "すべて" and 種別 != label:
+                continue
+            post_ids = sorted((post_id for post_id in groups[key] if post_id in rows), key=sort_keys[key])
+            result += f"━━━ {label}（{len(post_ids)}件） ━━━\n\n"
+            for post_id in post_ids:
+                row = rows[post_id]
+                fields = json.loads(row["fields"] or "{}")
+                start, end = _campaign_index["by_post"][post_id]
+                result += f"{get_status_emoji(row['status'] or '')} {row['title']}\n"
+                result += f"🆔 ID: {post_id} | ステータス: {row['status']}\n"
+                result += f"📅 期間: {_facet_field_text(fields.get('キャンペーン期間'))}"
+                result += f"（{format_day(start)}〜{format_day(end)}）\n"
+                campaign = _facet_field_text(fields.get('キャンペーン内容'))
+                if campaign:
+                    result += f"📝 内容: {campaign}\n"
+                result += f"🔗 {row['link']}\n\n"
+        
+        return result
+    
+    except Exception as e:
+        logger.exception(f"Error in pilates_campaigns: {e}")
+        return f"エラーが発生しました: {str(e)}"
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 一括インポート・エクスポート
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# pilates-studio のカスタムフィールド（pilates_create_post の docstring の構造に対応）
+PILATES_IMPORT_FIELDS = (
+    "表用特徴", "表用料金", "表用アクセス",
+    "簡易地区", "住所", "営業時間", "定休日", "アクセス", "駐車場", "店舗公式サイト",
+    "h4料金プラン直下", "初期費用", "体験", "価格",
+    "レッスン時間", "レッスン方式", "ジャンル", "取材体験済", "男性利用可否",
+    "AFF_URL", "目次", "ボタン名",
+    "画像_説明付",
+    "キャンペーン期間", "キャンペーン内容",
+    "関連記事", "体験_ユーチューブ",
+)
+# 配列のフィールド（CSVでは JSON配列 か "|" 区切りで指定する）
+PILATES_IMPORT_ARRAY_FIELDS = {"価格", "レッスン方式", "ジャンル", "取材体験済", "男性利用可否", "画像_説明付", "関連記事"}
+
+# 投稿そのものの列名 → 内部のキー
+PILATES_IMPORT_POST_COLUMNS = {
+    "ID": "id", "id": "id", "投稿ID": "id",
+    "タイトル": "title", "title": "title",
+    "本文": "content", "content": "content",
+    "抜粋": "excerpt", "excerpt": "excerpt",
+    "slug": "slug", "スラッグ": "slug",
+    "status": "status", "ステータス": "status",
+    "特徴ターム名リスト": "pilates-features", "pilates-features": "pilates-features",
+    "スタジオ名ターム名リスト": "studio_name", "studio_name": "studio_name",
+}
+# pilates-studio に設定するタクソノミー
+PILATES_IMPORT_TAXONOMIES = ("pilates-features", "studio_name")
+# まとめて指定するカスタムフィールドの列（オブジェクト、またはJSON文字列）
+PILATES_IMPORT_FIELD_GROUP_COLUMNS = {"meta", "custom_fields", "fields", "その他フィールド"}
+# タクソノミー → タームIDの配列 の列（pilates_export_file の「ターム」列）
+PILATES_IMPORT_TERM_COLUMNS = {"ターム", "terms"}
+# エクスポートに含まれる読み取り専用の列（読み込み時は無視する）
+PILATES_IMPORT_READONLY_COLUMNS = {"リンク", "公開日", "更新日", "link", "date", "modified"}
+
+# 結果に表示する失敗行の最大数（大きなファイルでも結果のサイズを一定に保つ）
+IMPORT_REPORT_MAX_ERRORS = 20
+
+
+def _import_title_key(title: str) -> str:
+    """タイトル照合用のキー（HTMLエンティティ・全角半角の違いを無視）"""
+    return unicodedata.normalize("NFKC", html.unescape(title or "")).strip().lower()
+
+
+def _import_detect_format(path: str, fmt: str) -> str | None:
+    """形式の指定（空なら拡張子）から csv / jsonl を判定する"""
+    value = (fmt or "").strip().lower() or os.path.splitext(path)[1].lstrip(".").lower()
+    if value == "csv":
+        return "csv"
+    if value in ("jsonl", "ndjson"):
+        return "jsonl"
+    return None
+
+
+def _import_iter_rows(path: str, fmt: str):
+    """
+    ファイルを1行ずつ読み、(行番号, 行dict または None, エラーメッセージ) を返すジェネレーター。
+    ファイル全体をメモリに読み込まない。
+    """
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row, None
+        return
+    
+    with open(path, encoding="utf-8-sig") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_no, None, f"JSONの形式に問題があります: {exc}"
+                continue
+            if not isinstance(row, dict):
+                yield line_no, None, "各行はJSONオブジェクトで指定してください"
+                continue
+            yield line_no, row, None
+
+
+def _import_cell_value(field: str, value):
+    """セルの値をカスタムフィールドの値に変換する（空セルは None = 更新しない）"""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        return value
+    value = value.strip()
+    if not value:
+        return None
+    if value[0] in "[{":
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
+    if field in PILATES_IMPORT_ARRAY_FIELDS:
+        return [item.strip() for item in value.split("|") if item.strip()]
+    return value
+
+
+def _import_json_object(value) -> dict:
+    """オブジェクト、またはJSON文字列のセルを辞書にする（空・不正な値は空の辞書）"""
+    if isinstance(value, str) and value.strip():
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
+def _import_term_ids(value) -> dict[str, list[int]]:
+    """「ターム」列（タクソノミー → タームID またはタームオブジェクトの配列）から設定するタームIDを取り出す"""
+    term_ids: dict[str, list[int]] = {}
+    for taxonomy, terms in _import_json_object(value).items():
+        if taxonomy not in PILATES_IMPORT_TAXONOMIES or not isinstance(terms, list):
+            continue
+        ids = []
+        for term in terms:
+            term_id = term.get('id') if isinstance(term, dict) else term
+            if isinstance(term_id, int) or (isinstance(term_id, str) and term_id.isdigit()):
+                ids.append(int(term_id))
+        term_ids[taxonomy] = ids
+    return term_ids
+
+
+def _import_split_row(row: dict) -> tuple[dict, dict, list[str]]:
+    """
+    行を投稿の項目とカスタムフィールドに分ける。
+    「ターム」列のタームIDは投稿の項目の "term_ids" に入れる。
+    
+    Returns:
+        (投稿の項目, カスタムフィールド, 対応しない列名のリスト)
+    """
+    post_values: dict = {}
+    fields: dict = {}
+    unknown: list[str] = []
+    for column, value in row.items():
+        if column is None:
+            # CSVでヘッダーより列が多い行
+            continue
+        name = str(column).strip()
+        if name in PILATES_IMPORT_POST_COLUMNS:
+            if isinstance(value, str):
+                value = value.strip()
+            if value not in (None, ""):
+                post_values[PILATES_IMPORT_POST_COLUMNS[name]] = value
+        elif name in PILATES_IMPORT_FIELD_GROUP_COLUMNS:
+            fields.update(_import_json_object(value))
+        elif name in PILATES_IMPORT_TERM_COLUMNS:
+            term_ids = _import_term_ids(value)
+            if term_ids:
+                post_values["term_ids"] = term_ids
+        elif name in PILATES_IMPORT_READONLY_COLUMNS:
+            continue
+        elif name in PILATES_IMPORT_FIELDS:
+            converted = _import_cell_value(name, value)
+            if converted is not None:
+                fields[name] = converted
+        else:
+            unknown.append(name)
+    return post_values, fields, unknown
+
+
+def _import_term_names(value) -> list[str]:
+    """ターム名の列（カンマ・"|" 区切りの文字列または配列）をリストにする"""
+    if isinstance(value, list):
+        return [str(name).strip() for name in value if str(name).strip()]
+    return [name.strip() for name in re.split(r"[,|]", str(value)) if name.strip()]
+
+
+async def _import_match_index(client: httpx.AsyncClient) -> dict:
+    """
+    既存の pilates-studio を slug・タイトルで引くためのローカルインデックスを作る。
+    ミラーが使えればミラーから、使えなければ id/slug/title だけを全ページ取得して作る。
+    """
+    index: dict = {"slug": {}, "title": {}}
+    
+    def add(post_id, slug, title) -> None:
+        if slug:
+            index["slug"].setdefault(slug, int(post_id))
+        if title:
+            index["title"].setdefault(_import_title_key(title), int(post_id))
+    
+    if await _mirror_ensure_fresh(WP_POST_TYPE):
+        try:
+            rows = _mirror_db().execute(
+                "SELECT id, slug, title FROM posts WHERE post_type = ?", (WP_POST_TYPE,)
+            ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning(f"Mirror read failed: {exc}")
+        else:
+            for row in rows:
+                add(row["id"], row["slug"], row["title"])
+            return index
+    
+    async for page_posts in _wp_iter_collection_pages(
+        client, WP_POST_TYPE, {"status": ",".join(ALLOWED_STATUSES)}, fields=("id", "slug", "title")
+    ):
+        for post in page_posts:
+            if isinstance(post, dict) and 'id' in post:
+                add(post['id'], post.get('slug'), _mirror_rendered(post.get('title')))
+    return index
+
+
+def _import_partial_summary(counts: dict) -> str:
+    """途中で中断したインポートで、それまでに書き込んだ件数"""
+    return (
+        f"（中断までに 作成 {counts['created']}件 / 更新 {counts['updated']}件 を書き込み、"
+        f"失敗 {counts['failed']}件 / スキップ {counts['skipped']}件）"
+    )
+
+
+# ========================================
+# ツール28: CSV / JSONL から一括作成・更新
+# ========================================
+@mcp.tool()
+async def pilates_import_file(
+    ファイルパス: str,
+    形式: str = "",
+    status: str = "draft",
+    同時実行数: int = 0,
+    ドライラン: bool = False,
+) -> str:
+    """
+    CSV / JSONL ファイルからピラティススタジオをまとめて作成・更新します。
+    ファイルは1行ずつ読み込み、書き込みは同時実行数を制限して送信します（バッチAPI対応サイトでは25件ずつ束ねます）。
+    
+    既存の投稿は ID列 → slug → タイトル の順で照合し、見つかれば更新、なければ作成します。
+    空のセルは更新しません。
+    
+    Args:
+        ファイルパス: 読み込むファイルのパス（.csv / .jsonl）
+        形式: "csv" または "jsonl"（空の場合は拡張子で判定）
+        status: 新規作成する投稿のステータス（"publish" または "draft"、status列があればそちらを優先）
+        同時実行数: 同時に送信するリクエストの数（0で既定値 WP_BULK_UPDATE_CONCURRENCY）
+        ドライラン: True の場合は書き込まず、作成・更新の件数だけを表示
+    
+    列:
+        ID / タイトル / 本文 / 抜粋 / slug / status / 特徴ターム名リスト / スタジオ名ターム名リスト と、
+        pilates_create_post の「カスタムフィールドの構造」にあるフィールド名（簡易地区、住所、表用料金 など）。
+        配列のフィールドは JSON配列 または "|" 区切りで指定します（例: ジャンル "マシン|マット"）。
+        pilates_export_file の出力もそのまま読み込めます（その他フィールド・ターム列も反映し、
+        リンク / 公開日 / 更新日 列は無視します）。
+    """
+    logger.info(f"pilates_import_file called with ファイルパス={ファイルパス}")
+    
+    path = os.path.expanduser((ファイルパス or "").strip())
+    if not path or not os.path.isfile(path):
+        return f"❌ ファイルが見つかりません: {ファイルパス}"
+    fmt = _import_detect_format(path, 形式)
+    if fmt is None:
+        return "❌ 形式を判定できませんでした。形式に \"csv\" または \"jsonl\" を指定してください。"
+    
+    limit = max(1, min(同時実行数 if 同時実行数 > 0 else WP_BULK_UPDATE_CONCURRENCY, WP_MAX_CONCURRENT_REQUESTS))
+    default_status = _pilates_normalize_single_status(status)
+    counts = {"created": 0, "updated": 0, "failed": 0, "skipped": 0}
+    errors: list[str] = []
+    unknown_columns: set[str] = set()
+    
+    def record_error(line_no: int, message: str, kind: str = "failed") -> None:
+        counts[kind] += 1
+        if len(errors) < IMPORT_REPORT_MAX_ERRORS:
+            errors.append(f"  • {line_no}行目: {message[:200]}")
+    
+    started = time.monotonic()
+    try:
+        async with _wp_client(WP_PRIORITY_BULK) as client:
+            index = await _import_match_index(client)
+            # 作成待ちの slug / タイトル（同じファイル内での重複作成を防ぐ）
+            pending_keys: set[str] = set()
+            queue: asyncio.Queue = asyncio.Queue(maxsize=limit)
+            
+            async def worker() -> None:
+                while True:
+                    batch = await queue.get()
+                    if batch is None:
+                        return
+                    try:
+                        results = await _wp_batch_write(
+                            [(wp_path, payload) for _, wp_path, payload, _ in batch], concurrency=1
+                        )
+                    except Exception as exc:
+                        logger.exception(f"Import batch failed: {exc}")
+                        results = [RuntimeError(str(exc))] * len(batch)
+                    for (line_no, wp_path, payload, key), result in zip(batch, results):
+                        pending_keys.discard(key)
+                        if not isinstance(result, dict):
+                            record_error(line_no, str(result))
+                            continue
+                        if wp_path == WP_POST_TYPE:
+                            counts["created"] += 1
+                            post_id = int(result.get('id') or 0)
+                            if post_id and (result.get('slug') or payload.get('slug')):
+                                index["slug"].setdefault(result.get('slug') or payload['slug'], post_id)
+                            if post_id and payload.get('title'):
+                                index["title"].setdefault(_import_title_key(payload['title']), post_id)
+                        else:
+                            counts["updated"] += 1
+            
+            workers = [asyncio.create_task(worker()) for _ in range(limit)]
+            try:
+                batch: list = []
+                for line_no, row, error in _import_iter_rows(path, fmt):
+                    if error:
+                        record_error(line_no, error)
+                        continue
+                    post_values, fields, unknown = _import_split_row(row)
+                    unknown_columns.update(unknown)
+                    
+                    # 作成か更新かを決める
+                    slug = str(post_values.get("slug", ""))
+                    title_key = _import_title_key(str(post_values.get("title", "")))
+                    raw_id = str(post_values.get("id", "")).strip()
+                    if raw_id:
+                        if not raw_id.isdigit():
+                            record_error(line_no, f"IDは数字で指定してください: {raw_id}")
+                            continue
+                        post_id = int(raw_id)
+                    else:
+                        post_id = index["slug"].get(slug) if slug else None
+                        if post_id is None and title_key:
+                            post_id = index["title"].get(title_key)
+                    key = slug or title_key
+                    if post_id is None:
+                        if not title_key:
+                            record_error(line_no, "一致する投稿がなく、タイトルもないため作成できません")
+                            continue
+                        if key in pending_keys:
+                            record_error(line_no, "同じファイル内で作成待ちの投稿と重複するためスキップ", "skipped")
+                            continue
+                    
+                    payload: dict = {}
+                    for name in ("title", "content", "excerpt", "slug"):
+                        if name in post_values:
+                            payload[name] = str(post_values[name])
+                    if "status" in post_values:
+                        payload["status"] = _pilates_normalize_single_status(str(post_values["status"]))
+                    elif post_id is None:
+                        payload["status"] = default_status
+                    if fields:
+                        payload["meta"] = fields
+                    if post_id is not None and not payload:
+                        record_error(line_no, "更新する列がないためスキップ", "skipped")
+                        continue
+                    
+                    if ドライラン:
+                        counts["updated" if post_id is not None else "created"] += 1
+                        if post_id is None:
+                            pending_keys.add(key)
+                        continue
+                    
+                    # ターム名の列があればそちらを優先する
+                    payload.update(post_values.get("term_ids", {}))
+                    try:
+                        for taxonomy in PILATES_IMPORT_TAXONOMIES:
+                            if taxonomy in post_values:
+                                payload[taxonomy] = await _pilates_term_names_to_ids(
+                                    taxonomy, _import_term_names(post_values[taxonomy])
+                                )
+                    except RuntimeError as exc:
+                        record_error(line_no, f"タームの解決に失敗しました: {exc}")
+                        continue
+                    
+                    if post_id is None:
+                        pending_keys.add(key)
+                        batch.append((line_no, WP_POST_TYPE, payload, key))
+                    else:
+                        batch.append((line_no, f"{WP_POST_TYPE}/{post_id}", payload, ""))
+                    if len(batch) >= WP_BATCH_MAX_REQUESTS:
+                        # キューが一杯なら書き込みが追いつくまで読み込みを止める
+                        await queue.put(batch)
+                        batch = []
+                if batch:
+                    await queue.put(batch)
+            finally:
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+    except (OSError, UnicodeDecodeError, csv.Error) as exc:
+        logger.error(f"Import file read failed: {exc}")
+        return f"❌ ファイルの読み込みに失敗しました: {exc}\n{_import_partial_summary(counts)}"
+    except RuntimeError as exc:
+        logger.error(f"API Error in pilates_import_file: {exc}")
+        return f"APIエラーが発生しました: {exc}\n{_import_partial_summary(counts)}"
+    except Exception as e:
+        logger.exception(f"Error in pilates_import_file: {e}")
+        return f"エラーが発生しました: {str(e)}\n{_import_partial_summary(counts)}"
+    elapsed = time.monotonic() - started
+    
+    total = sum(counts.values())
+    result = f"📥 インポート{'（ドライラン）' if ドライラン else ''}: {os.path.basename(path)}\n\n"
+    result += (
+        f"{'作成予定' if ドライラン else '作成'}: {counts['created']}件 / "
+        f"{'更新予定' if ドライラン else '更新'}: {counts['updated']}件 / "
+        f"失敗: {counts['failed']}件 / スキップ: {counts['skipped']}件\n"
+    )
+    result += f"処理: {total}行（{elapsed:.1f}秒、{total / elapsed if elapsed > 0 else 0:.1f}行/秒）\n"
+    if unknown_columns:
+        result += f"⚠️ 対応しない列（無視しました）: {', '.join(sorted(unknown_columns))}\n"
+    if errors:
+        result += "\n━━━ 失敗・スキップした行 ━━━\n" + "\n".join(errors) + "\n"
+        hidden = counts["failed"] + counts["skipped"] - len(errors)
+        if hidden > 0:
+            result += f"  … ほか{hidden}件\n"
+    return result
+
+
+# エクスポートの共通列（CSV・JSONL）
+EXPORT_BASE_COLUMNS = ("ID", "タイトル", "slug", "status", "リンク", "公開日", "更新日")
+# 共通列の取得に使うフィールド（_fields= で取得するフィールドを絞り込む。本文は含める場合のみ追加）
+EXPORT_POST_FIELDS = ("id", "title", "slug", "status", "link", "date", "modified")
+
+
+def _export_record(post: dict, include_content: bool) -> dict:
+    """投稿をエクスポート用のレコード（JSONLの1行）にする"""
+    terms = _mirror_terms_from_post(post)
+    record = {
+        "id": post.get('id'),
+        "title": html.unescape(_mirror_rendered(post.get('title'))),
+        "slug": post.get('slug', ''),
+        "status": post.get('status', ''),
+        "link": post.get('link', ''),
+        "date": post.get('date', ''),
+        "modified": post.get('modified', ''),
+        # ルートにあるタクソノミーはカスタムフィールドとして拾われるため、terms 側だけに入れる
+        "fields": {
+            key: value for key, value in _get_custom_fields_from_post(post).items() if key not in terms
+        },
+        "terms": terms,
+    }
+    if include_content:
+        record["content"] = _mirror_rendered(post.get('content'))
+    return record
+
+
+def _export_csv_cell(value) -> str:
+    """CSVのセルに書く値（配列・オブジェクトはJSON文字列。インポート時にそのまま読み戻せる）"""
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _export_csv_row(record: dict, field_columns: list[str], include_content: bool) -> list[str]:
+    """レコードをCSVの1行にする（列にないカスタムフィールドは「その他フィールド」にまとめる）"""
+    fields = record["fields"]
+    row = [
+        record["id"], record["title"], record["slug"], record["status"],
+        record["link"], record["date"], record["modified"],
+    ]
+    if include_content:
+        row.append(record.get("content", ""))
+    row.extend(fields.get(name) for name in field_columns)
+    extra = {key: value for key, value in fields.items() if key not in field_columns}
+    row.append(extra or None)
+    row.append(record["terms"] or None)
+    return [_export_csv_cell(value) for value in row]
+
+
+# ========================================
+# ツール29: 全投稿をファイルへエクスポート
+# ========================================
+@mcp.tool()
+async def pilates_export_file(
+    投稿タイプ: str = WP_POST_TYPE,
+    形式: str = "jsonl",
+    ファイルパス: str = "",
+    status: str = "publish,draft",
+    本文を含める: bool = False,
+    同時ページ数: int = 0,
+) -> str:
+    """
+    pilates-studio / media-free-content / posts の全投稿を JSONL または CSV に書き出します。
+    ページは並列に取得し、届いたページから順にファイルへ書き込みます（全件をメモリに保持しません）。
+    
+    Args:
+        投稿タイプ: pilates-studio / media-free-content / posts のいずれか
+        形式: "jsonl" または "csv"
+        ファイルパス: 出力先のパス（空の場合はログディレクトリの exports/ に自動で作成）
+        status: 対象のステータス（"publish", "draft", または "publish,draft"）
+        本文を含める: True の場合は本文も書き出す
+        同時ページ数: 同時に取得するページ数（0で既定値 WP_PAGE_FETCH_CONCURRENCY）
+    
+    CSVの列は pilates_import_file の列名に合わせています（pilates-studio はそのまま読み込み直せます）。
+    """
+    logger.info(f"pilates_export_file called with 投稿タイプ={投稿タイプ}, 形式={形式}")
+    
+    post_type = (投稿タイプ or WP_POST_TYPE).strip()
+    if post_type not in (WP_POST_TYPE, "media-free-content", "posts"):
+        return f"❌ 投稿タイプ '{post_type}' はサポートされていません。使用可能: {WP_POST_TYPE} / media-free-content / posts"
+    fmt = (形式 or "jsonl").strip().lower()
+    if fmt not in ("jsonl", "csv"):
+        return "❌ 形式は \"jsonl\" または \"csv\" を指定してください。"
+    
+    path = os.path.expanduser((ファイルパス or "").strip())
+    if not path:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(log_dir, "exports", f"{post_type}-{stamp}.{fmt}")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # 書き込み中は一時ファイルに出力し、完了してから置き換える
+    part_path = f"{path}.part"
+    
+    concurrency = 同時ページ数 if 同時ページ数 > 0 else WP_PAGE_FETCH_CONCURRENCY
+    params = {"status": _build_status_param(status), "orderby": "id", "order": "asc"}
+    # pilates-studio は書き出す列（カスタムフィールド・タームを含む）だけを取得する
+    # 他の投稿タイプはルートにあるカスタムフィールドの名前が決まっていないため、絞り込まずに取得する
+    fields = None
+    custom_field_keys: tuple[str, ...] = ()
+    if post_type == WP_POST_TYPE:
+        fields = EXPORT_POST_FIELDS + (("content",) if 本文を含める else ())
+        custom_field_keys = PILATES_IMPORT_FIELDS + PILATES_MIRROR_TAXONOMIES
+    rows = 0
+    started = time.monotonic()
+    try:
+        with open(part_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f) if fmt == "csv" else None
+            field_columns: list[str] | None = None
+            async with _wp_client(WP_PRIORITY_BULK) as client:
+                async for page_posts in _wp_iter_collection_pages(
+                    client, post_type, params, concurrency=concurrency,
+                    fields=fields, custom_field_keys=custom_field_keys,
+                ):
+                    for post in page_posts:
+                        if not isinstance(post, dict) or 'id' not in post:
+                            continue
+                        record = _export_record(post, 本文を含める)
+                        if writer is None:
+                            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        else:
+                            if field_columns is None:
+                                # pilates-studio はスキーマの列、それ以外は最初の投稿のフィールドを列にする
+                                field_columns = (
+                                    list(PILATES_IMPORT_FIELDS) if post_type == WP_POST_TYPE
+                                    else list(record["fields"])
+                                )
+                                header = list(EXPORT_BASE_COLUMNS)
+                                if 本文を含める:
+                                    header.append("本文")
+                                writer.writerow(header + field_columns + ["その他フィールド", "ターム"])
+                            writer.writerow(_export_csv_row(record, field_columns, 本文を含める))
+                        rows += 1
+            if writer is not None and field_columns is None:
+                # 対象の投稿がない場合もヘッダーだけは書く
+                writer.writerow(list(EXPORT_BASE_COLUMNS) + (["本文"] if 本文を含める else []))
+        os.replace(part_path, path)
+    except (RuntimeError, httpx.HTTPError) as exc:
+        logger.error(f"API Error in pilates_export_file: {exc}")
+        return f"APIエラーが発生しました: {exc}\n（{rows}件まで書き出した途中のファイル: {part_path}）"
+    except OSError as exc:
+        logger.error(f"Export file write failed: {exc}")
+        return f"❌ ファイルの書き込みに失敗しました: {exc}"
+    except Exception as e:
+        logger.exception(f"Error in pilates_export_file: {e}")
+        return f"エラーが発生しました: {str(e)}"
+    elapsed = time.monotonic() - started
+    
+    size = os.path.getsize(path)
+    result = f"📤 エクスポート完了: {post_type}（{fmt.upper()}）\n\n"
+    result += f"📁 出力先: {path}\n"
+    result += f"件数: {rows}件 / サイズ: {size:,} bytes\n"
+    result += f"所要時間: {elapsed:.1f}秒（{rows / elapsed if elapsed > 0 else 0:.1f}件/秒）\n"
+    return result
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 診断用ツール
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# ========================================
+# ツール24: WordPress接続の診断情報
+# ========================================
+@mcp.tool()
+async def pilates_diagnostics() -> str:
+    """
+    WordPress への接続状態（サーキットブレーカー・リトライ回数）とキャッシュの状態を表示します。
+    「接続を一時停止しています」というエラーが出た場合の確認に使用します。
+    """
+    logger.info("pilates_diagnostics called")
+    
+    state_labels = {"closed": "🟢 正常", "open": "🔴 遮断中", "half_open": "🟡 復旧確認中"}
+    
+    result = "🩺 WordPress接続の診断情報\n\n"
+    result += "━━━ 🔌 サーキットブレーカー ━━━\n\n"
+    if not _circuits:
+        result += "まだリクエストは送信されていません。\n"
+    for host, circuit in _circuits.items():
+        result += f"ホスト: {host}\n"
+        result += f"  状態: {state_labels.get(circuit['state'], circuit['state'])}\n"
+        if circuit["state"] == "open":
+            remaining = WP_CIRCUIT_RESET_TIMEOUT - (time.monotonic() - circuit["opened_at"])
+            result += f"  再開まで: 約{max(int(remaining) + 1, 0)}秒\n"
+        result += f"  連続失敗: {circuit['failures']} / しきい値 {WP_CIRCUIT_FAILURE_THRESHOLD}\n"
+        result += f"  累計 失敗: {circuit['total_failures']} / リトライ: {circuit['total_retries']} / 遮断: {circuit['total_rejected']}\n"
+        if circuit["last_error"]:
+            result += f"  直近のエラー: {circuit['last_error']}\n"
+        result += "\n"
+    
+    result += "━━━ 🚦 同時接続数・レート制限 ━━━\n\n"
+    result += f"上限: 同時{WP_MAX_CONCURRENT_REQUESTS}件 / 毎秒{WP_RATE_LIMIT_PER_SECOND:g}件（バースト{WP_RATE_LIMIT_BURST}）\n"
+    for host, limiter in _limiters.items():
+        waiting = [w for w in limiter["waiters"] if not w[2].done()]
+        lanes = {WP_PRIORITY_INTERACTIVE: 0, WP_PRIORITY_NORMAL: 0, WP_PRIORITY_BULK: 0}
+        for priority, _, _ in waiting:
+            lanes[priority] = lanes.get(priority, 0) + 1
+        result += (
+            f"  {host}: 実行中 {limiter['active']}件 / 待機 対話{lanes[WP_PRIORITY_INTERACTIVE]}"
+            f"・通常{lanes[WP_PRIORITY_NORMAL]}・一括{lanes[WP_PRIORITY_BULK]}件\n"
+        )
+    result += "\n"
+    
+    result += "━━━ 📮 バッチAPI ━━━\n\n"
+    supported = {None: "未確認", True: "対応", False: "非対応（単体POSTで送信）"}[_wp_batch_state["supported"]]
+    result += f"状態: {supported}（1回あたり最大{WP_BATCH_MAX_REQUESTS}件）\n"
+    result += (
+        f"送信: {_wp_batch_state['batches']}回 / {_wp_batch_state['sub_requests']}件"
+        f"・単体送信へのフォールバック {_wp_batch_state['fallbacks']}件\n\n"
+    )
+    
+    result += "━━━ 🔑 context=edit 権限 ━━━\n\n"
+    if not _edit_context_capability:
+        result += "未確認\n"
+    for key, (allowed, _) in _edit_context_capability.items():
+        result += f"  • {key}: {'使用可' if allowed else '使用不可'}\n"
+    
+    result += "\n━━━ 📦 キャッシュ ━━━\n\n"
+    result += f"投稿キャッシュ: {len(_post_cache)}件 / {_post_cache_bytes:,} bytes\n"
+    result += f"実行中のGET: {len(_inflight_gets)}件\n"
+    for taxonomy, index in _term_indexes.items():
+        state = "有効" if _term_index_is_fresh(taxonomy) else "期限切れ"
+        result += f"タームインデックス {taxonomy}: {len(index['by_id'])}件（{state}）\n"
+    if _area_index["built"]:
+        result += f"エリアインデックス: {len(_area_index['by_post'])}件 / {len(_area_index['postings'])}トークン\n"
+    if _facet_index["built"]:
+        result += f"ファセットインデックス: {len(_facet_index['by_post'])}件\n"
+    if _price_index["built"]:
+        counts = " / ".join(f"{label} {len(_price_index['sorted'][kind])}件" for label, kind in PRICE_KINDS.items())
+        result += f"料金インデックス: {counts}\n"
+    if _campaign_index["built"]:
+        result += f"キャンペーン期間インデックス: {len(_campaign_index['by_post'])}件\n"
+    for post_type, index in _search_indexes.items():
+        result += f"全文検索インデックス {post_type}: {len(index['doc_len'])}件 / {len(index['postings'])}トークン\n"
+    
+    result += "\n━━━ 💾 ローカルミラー ━━━\n\n"
+    if not PILATES_MIRROR_ENABLED:
+        result += "無効（環境変数 PILATES_MIRROR=1 で有効）\n"
+    else:
+        result += f"ファイル: {PILATES_MIRROR_PATH}\n"
+        for post_type in PILATES_MIRROR_POST_TYPES:
+            try:
+                count = _mirror_db().execute(
+                    "SELECT COUNT(*) FROM posts WHERE post_type = ?", (post_type,)
+                ).fetchone()[0]
+                sync_state = _mirror_sync_state(post_type)
+            except sqlite3.Error as exc:
+                result += f"  • {post_type}: 読み取りエラー ({exc})\n"
+                continue
+            task = _mirror_refresh_tasks.get(post_type)
+            syncing = " / 同期中" if task is not None and not task.done() else ""
+            if sync_state.get("synced_at"):
+                age = int(time.time() - sync_state["synced_at"])
+                state = "有効" if _mirror_is_fresh(post_type) else "期限切れ"
+                result += f"  • {post_type}: {count}件（{age}秒前に同期・{state}{syncing}）\n"
+            else:
+                result += f"  • {post_type}: {count}件（未同期{syncing}）\n"
+            if sync_state.get("high_water_mark"):
+                result += f"    最終更新日時(GMT): {sync_state['high_water_mark']}\n"
+            if sync_state.get("last_sweep_at"):
+                result += f"    全件照合: {int(time.time() - sync_state['last_sweep_at'])}秒前\n"
+    
+    return result
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # サーバー起動
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+
+import httpx
+import pytest
+
+import server
+
+
+@pytest.fixture
+def index_snapshot(monkeypatch):
+    """ミラー無効（既定）の状態で、ローカルインデックスの元データを取得済みのスナップショットに差し替える"""
+    monkeypatch.setattr(server, "PILATES_MIRROR_ENABLED", False)
+    monkeypatch.setattr(server, "_area_index", {"built": False, "postings": {}, "by_post": {}})
+    monkeypatch.setattr(server, "_facet_index", {
+        "built": False, "bits": {}, "by_post": {}, "ordinals": {}, "ids": [], "free": [],
+    })
+    monkeypatch.setattr(server, "_price_index", {
+        "built": False, "by_post": {}, "sorted": {kind: [] for kind in server.PRICE_KINDS.values()},
+    })
+    monkeypatch.setattr(server, "_campaign_index", {"built": False, "by_post": {}, "starts": [], "ends": []})
+
+    def load(posts: dict[int, dict]) -> None:
+        now = time.time()
+        rows = {}
+        for post_id, post in posts.items():
+            post = {
+                "id": post_id,
+                "status": "publish",
+                "link": f"https://example.com/?p={post_id}",
+                "date": "2024-10-01T00:00:00",
+                "modified": "2024-10-01T00:00:00",
+                **post,
+            }
+            rows[post_id] = server._mirror_post_row(server.WP_POST_TYPE, post, now)
+        monkeypatch.setattr(server, "_index_snapshot", {"rows": rows, "loaded_at": now, "writes": None})
+
+    return load
+
+
+@pytest.fixture
+def wordpress_api(monkeypatch):
+    """
+    共有HTTPクライアントを httpx.MockTransport に差し替え、接続・キャッシュの状態を初期化する（ミラーは無効）。
+    返り値に handler(request) -> httpx.Response を渡すと、送信されたリクエストのリストを返す。
+    """
+    monkeypatch.setattr(server, "PILATES_MIRROR_ENABLED", False)
+    for name, value in {
+        "_circuits": {}, "_limiters": {}, "_inflight_gets": {},
+        "_post_cache": OrderedDict(), "_post_cache_bytes": 0, "_post_cache_generation": {},
+        "_edit_context_capability": {}, "_fields_projection_unsupported": set(),
+        "_fields_custom_fields_absent": {},
+        "_wp_batch_state": {"supported": None, "batches": 0, "sub_requests": 0, "fallbacks": 0},
+    }.items():
+        monkeypatch.setattr(server, name, value)
+    requests = []
+    handlers = []
+
+    def dispatch(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handlers[-1](request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(dispatch), headers=server._AUTH_HEADERS)
+    monkeypatch.setattr(server, "_http_client", client)
+
+    def use(handler) -> list[httpx.Request]:
+        handlers.append(handler)
+        return requests
+
+    return use
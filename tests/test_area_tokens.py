@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("東京都東村山市本町1-2-3", ["東京都", "東村山市", "本町"]),
+    ("三重県四日市市諏訪町", ["三重県", "四日市市", "諏訪町"]),
+    ("新潟県十日町市", ["新潟県", "十日町市"]),
+    ("長野県大町市", ["長野県", "大町市"]),
+    ("東京都武蔵村山市", ["東京都", "武蔵村山市"]),
+    ("奈良県大和郡山市", ["奈良県", "大和郡山市"]),
+    ("千葉県市川市市川", ["千葉県", "市川市", "市川"]),
+    ("東京都西多摩郡瑞穂町", ["東京都", "西多摩郡", "瑞穂町"]),
+    ("神奈川県横浜市中区", ["神奈川県", "横浜市", "中区"]),
+    ("東京都渋谷区神宮前1-2-3", ["東京都", "渋谷区", "神宮前"]),
+])
+def test_area_units_keep_municipality_names_whole(text, expected):
+    assert server._area_units(text) == expected
+
+
+@pytest.mark.parametrize("address, query, expected", [
+    ("岡山県岡山市北区", "山", False),
+    ("東京都東村山市本町", "村山", False),
+    ("東京都東村山市本町", "東村山", True),
+    ("東京都港区", "港", True),
+    ("東京都渋谷区神宮前", "神宮", True),
+])
+def test_area_match_is_exact_or_prefix(address, query, expected):
+    tokens = server._area_tokens({"住所": address})
+    assert server._area_tokens_match(tokens, server._area_query_terms(query)) is expected
+
+
+def _studio(post_id, title, area):
+    return {
+        "id": post_id, "status": "publish", "title": {"rendered": title},
+        "link": f"https://example.com/?p={post_id}", "custom_fields": {"簡易地区": area},
+    }
+
+
+def test_by_area_streams_pages_without_snapshot(monkeypatch, index_snapshot):
+    pages_read = []
+
+    async def pages(client, post_type, params, **kwargs):
+        for page in range(1, 4):
+            pages_read.append(page)
+            yield [_studio(page * 10 + n, f"スタジオ{page}-{n}", "東京都渋谷区" if n == 0 else "東京都新宿区") for n in range(2)]
+
+    async def load():
+        raise AssertionError("area search must not fetch the whole corpus")
+
+    monkeypatch.setattr(server, "_wp_iter_collection_pages", pages)
+    monkeypatch.setattr(server, "_index_snapshot_load", load)
+    result = asyncio.run(server.pilates_by_area("渋谷", 件数=2))
+    assert "（2件）" in result
+    assert pages_read == [1, 2]
+
+
+def test_by_area_uses_loaded_snapshot(monkeypatch, index_snapshot):
+    index_snapshot({
+        1: {"title": {"rendered": "渋谷スタジオ"}, "custom_fields": {"簡易地区": "東京都渋谷区"}},
+        2: {"title": {"rendered": "新宿スタジオ"}, "custom_fields": {"簡易地区": "東京都新宿区"}},
+    })
+
+    async def pages(client, post_type, params, **kwargs):
+        raise AssertionError("a loaded snapshot answers without paging")
+        yield
+
+    monkeypatch.setattr(server, "_wp_iter_collection_pages", pages)
+    result = asyncio.run(server.pilates_by_area("渋谷"))
+    assert "渋谷スタジオ" in result
+    assert "新宿スタジオ" not in result
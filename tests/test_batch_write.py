@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import server
+
+BATCH_PATH = "/wp-json/batch/v1"
+
+
+@pytest.fixture
+def wordpress(wordpress_api, index_snapshot):
+    """バッチAPIとは別に、単体POSTには投稿を返すWordPress。batch(request) でバッチの応答を決める"""
+    index_snapshot({})
+    state = {"batch": None}
+
+    def handler(request):
+        if request.url.path == BATCH_PATH:
+            return state["batch"](request)
+        post_id = int(request.url.path.rsplit("/", 1)[1])
+        return httpx.Response(200, json={"id": post_id, "title": {"rendered": f"単体{post_id}"}})
+
+    requests = wordpress_api(handler)
+
+    def use(batch):
+        state["batch"] = batch
+        return requests
+
+    return use
+
+
+def _post(post_id):
+    return {"status": 200, "body": {"id": post_id, "title": {"rendered": f"バッチ{post_id}"}}}
+
+
+def _bulk_update(updates, **kwargs):
+    return asyncio.run(server.pilates_bulk_update_fields(json.dumps(updates, ensure_ascii=False), **kwargs))
+
+
+def test_multi_status_sub_responses_map_to_each_post(wordpress):
+    def batch(request):
+        paths = [sub["path"] for sub in json.loads(request.content)["requests"]]
+        assert paths == ["/wp/v2/pilates-studio/1", "/wp/v2/pilates-studio/2", "/wp/v2/pilates-studio/3"]
+        return httpx.Response(207, json={"failed": "normal", "responses": [
+            _post(1),
+            {"status": 400, "body": {"code": "rest_invalid_param", "message": "不正な値"}},
+            {"status": 400, "body": {"code": "rest_batch_not_allowed", "message": "batch not allowed"}},
+        ]})
+
+    requests = wordpress(batch)
+    result = _bulk_update({"1": {"表用料金": "a"}, "2": {"表用料金": "b"}, "3": {"表用料金": "c"}})
+    assert "成功 2件 / 失敗 1件" in result
+    assert "1: ✅ バッチ1" in result
+    assert "2: ❌ WordPress APIエラー (HTTP 400)" in result and "不正な値" in result
+    # バッチ非対応のルートだけ単体POSTで送り直す
+    assert "3: ✅ 単体3" in result
+    assert [request.url.path for request in requests] == [BATCH_PATH, "/wp-json/wp/v2/pilates-studio/3"]
+    assert server._wp_batch_state["supported"] is True
+    assert server._wp_batch_state["fallbacks"] == 1
+
+
+def test_short_batch_response_fails_missing_entries(wordpress):
+    wordpress(lambda request: httpx.Response(207, json={"responses": [_post(1)]}))
+    result = _bulk_update({"1": {"表用料金": "a"}, "2": {"表用料金": "b"}})
+    assert "1: ✅ バッチ1" in result
+    assert "2: ❌ バッチ応答にこのリクエストの結果が含まれていません。" in result
+
+
+def test_falls_back_to_single_posts_without_batch_api(wordpress):
+    requests = wordpress(lambda request: httpx.Response(404, json={"code": "rest_no_route"}))
+    result = _bulk_update({"1": {"表用料金": "a"}, "2": {"表用料金": "b"}})
+    assert "成功 2件 / 失敗 0件" in result
+    assert sorted(request.url.path for request in requests) == [
+        "/wp-json/batch/v1", "/wp-json/wp/v2/pilates-studio/1", "/wp-json/wp/v2/pilates-studio/2",
+    ]
+    assert server._wp_batch_state["supported"] is False
+
+    # 非対応と分かった後はバッチを試さない
+    requests.clear()
+    _bulk_update({"4": {"表用料金": "a"}, "5": {"表用料金": "b"}})
+    assert BATCH_PATH not in [request.url.path for request in requests]
+
+
+def test_ids_are_validated_and_deduplicated(wordpress):
+    def batch(request):
+        subs = json.loads(request.content)["requests"]
+        return httpx.Response(207, json={"responses": [_post(int(sub["path"].rsplit("/", 1)[1])) for sub in subs]})
+
+    requests = wordpress(batch)
+    result = _bulk_update({
+        "12": {"表用料金": "a"},
+        " 012": {"表用料金": "b"},
+        "abc": {"表用料金": "c"},
+        "13": {},
+        "14": {"表用料金": "d"},
+    })
+    assert "成功 2件 / 失敗 2件" in result
+    assert "abc: ❌ 投稿IDは数字で指定してください" in result
+    assert "13: ❌ フィールドはキーと値を持つオブジェクトで指定してください" in result
+    assert "⚠️ 重複した投稿ID（最初の指定のみ更新）: 12" in result
+    subs = json.loads(requests[0].content)["requests"]
+    assert [(sub["path"], sub["body"]) for sub in subs] == [
+        ("/wp/v2/pilates-studio/12", {"meta": {"表用料金": "a"}}),
+        ("/wp/v2/pilates-studio/14", {"meta": {"表用料金": "d"}}),
+    ]
+
+
+def test_bad_container_is_reported_per_id(wordpress):
+    requests = wordpress(lambda request: httpx.Response(500))
+    result = _bulk_update({"1": {"表用料金": "a"}}, container="nope")
+    assert "1: ❌ container='nope' はサポートされていません。" in result
+    assert requests == []
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+import server
+
+OPEN_START = server._CAMPAIGN_OPEN_START
+OPEN_END = server._CAMPAIGN_OPEN_END
+
+
+def _day(year, month, day):
+    return date(year, month, day).toordinal()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2024年10月1日〜2024年10月31日", (_day(2024, 10, 1), _day(2024, 10, 31))),
+    ("10/1〜10/31", (_day(2024, 10, 1), _day(2024, 10, 31))),
+    ("2024-10-01 - 2024-10-31", (_day(2024, 10, 1), _day(2024, 10, 31))),
+    ("10/1~10/31", (_day(2024, 10, 1), _day(2024, 10, 31))),
+    ("10/1～10/31", (_day(2024, 10, 1), _day(2024, 10, 31))),
+    ("１０月１日〜１０月３１日", (_day(2024, 10, 1), _day(2024, 10, 31))),
+])
+def test_closed_period(text, expected):
+    assert server._parse_campaign_period(text, 2024) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("11月末まで", (OPEN_START, _day(2024, 11, 30))),
+    ("〜12/31", (OPEN_START, _day(2024, 12, 31))),
+    ("10月1日から", (_day(2024, 10, 1), OPEN_END)),
+    ("10/1〜", (_day(2024, 10, 1), OPEN_END)),
+    ("２月末まで", (OPEN_START, _day(2024, 2, 29))),
+])
+def test_open_ended_period(text, expected):
+    assert server._parse_campaign_period(text, 2024) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("12/20〜1/10", (_day(2024, 12, 20), _day(2025, 1, 10))),
+    ("１２月２０日〜１月１０日", (_day(2024, 12, 20), _day(2025, 1, 10))),
+    ("2024年12月20日〜2025年1月10日", (_day(2024, 12, 20), _day(2025, 1, 10))),
+])
+def test_year_rollover(text, expected):
+    assert server._parse_campaign_period(text, 2024) == expected
+
+
+@pytest.mark.parametrize("text", ["", "期間限定", "13/40〜13/41"])
+def test_unparseable_period(text):
+    assert server._parse_campaign_period(text, 2024) is None
+
+
+@pytest.fixture
+def campaigns(index_snapshot):
+    index_snapshot({
+        1: {"title": {"rendered": "当日開始"}, "custom_fields": {"キャンペーン期間": "10/15〜10/31"}},
+        2: {"title": {"rendered": "当日終了"}, "custom_fields": {"キャンペーン期間": "10/1〜10/15"}},
+        3: {"title": {"rendered": "前日終了"}, "custom_fields": {"キャンペーン期間": "10/1〜10/14"}},
+        4: {"title": {"rendered": "翌日開始"}, "custom_fields": {"キャンペーン期間": "10/16〜10/31"}},
+        5: {"title": {"rendered": "期限のみ"}, "custom_fields": {"キャンペーン期間": "11月末まで"}},
+        6: {"title": {"rendered": "開始のみ"}, "custom_fields": {"キャンペーン期間": "10/1から"}},
+        7: {"title": {"rendered": "7日後開始"}, "custom_fields": {"キャンペーン期間": "10/22〜10/31"}},
+        8: {"title": {"rendered": "7日前終了"}, "custom_fields": {"キャンペーン期間": "10/1〜10/8"}},
+        9: {"title": {"rendered": "8日前終了"}, "custom_fields": {"キャンペーン期間": "10/1〜10/7"}},
+    })
+    server._campaign_index_ensure()
+
+
+def test_query_boundaries(campaigns):
+    groups = server._campaign_query(date(2024, 10, 15), 7)
+    assert groups["active"] == {1, 2, 5, 6}
+    assert groups["upcoming"] == {4, 7}
+    assert groups["expired"] == {3, 8}
+    assert server._campaign_query(date(2024, 9, 1), 7)["active"] == {5}
+    assert server._campaign_query(date(2024, 12, 1), 7)["active"] == {6}
+
+
+def test_query_without_campaigns(index_snapshot):
+    index_snapshot({1: {"title": {"rendered": "スタジオ"}, "custom_fields": {}}})
+    server._campaign_index_ensure()
+    assert server._campaign_query(date(2024, 10, 15), 7) == {"active": set(), "upcoming": set(), "expired": set()}
+
+
+def test_campaigns_without_mirror(campaigns):
+    result = asyncio.run(server.pilates_campaigns(基準日="2024-10-15", 種別="実施中"))
+    assert "実施中（4件）" in result
+    assert "当日開始" in result
+    assert "前日終了" not in result
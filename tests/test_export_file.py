@@ -0,0 +1,64 @@
+import asyncio
+import csv
+import json
+
+import httpx
+import pytest
+
+import server
+
+
+def _studio(post_id):
+    return {
+        "id": post_id, "title": {"rendered": f"スタジオ{post_id}"}, "slug": f"studio-{post_id}", "status": "publish",
+        "link": f"https://example.com/?p={post_id}", "date": "2024-10-01T00:00:00", "modified": "2024-10-02T00:00:00",
+        "content": {"rendered": "<p>本文</p>"},
+        "meta": {"簡易地区": "渋谷", "独自項目": "x"}, "ジャンル": ["マシン"], "pilates-features": [3],
+    }
+
+
+@pytest.fixture
+def studios(wordpress_api):
+    """2ページに分かれた pilates-studio の一覧。_fields= が指定されればそのフィールドだけを返す"""
+    def handler(request):
+        page = int(request.url.params["page"])
+        posts = [_studio(page * 2 - 1), _studio(page * 2)]
+        projected = request.url.params.get("_fields")
+        if projected:
+            keep = projected.split(",")
+            posts = [{key: value for key, value in post.items() if key in keep} for post in posts]
+        return httpx.Response(200, json=posts, headers={"X-WP-TotalPages": "2", "X-WP-Total": "4"})
+
+    return wordpress_api(handler)
+
+
+def test_export_jsonl_requests_only_exported_fields(tmp_path, studios):
+    path = tmp_path / "studios.jsonl"
+    result = asyncio.run(server.pilates_export_file(ファイルパス=str(path)))
+    assert "件数: 4件" in result
+
+    projected = {request.url.params["_fields"] for request in studios}
+    assert len(projected) == 1
+    fields = projected.pop().split(",")
+    assert "content" not in fields
+    assert {"id", "title", "modified", "meta", "custom_fields", "ジャンル", "pilates-features"} <= set(fields)
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["id"] for record in records] == [1, 2, 3, 4]
+    assert records[0]["fields"] == {"簡易地区": "渋谷", "独自項目": "x", "ジャンル": ["マシン"]}
+    assert records[0]["terms"] == {"pilates-features": [3]}
+    assert "content" not in records[0]
+
+
+def test_export_csv_with_content(tmp_path, studios):
+    path = tmp_path / "studios.csv"
+    asyncio.run(server.pilates_export_file(形式="csv", ファイルパス=str(path), 本文を含める=True))
+    assert all("content" in request.url.params["_fields"].split(",") for request in studios)
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4
+    assert rows[0]["本文"] == "<p>本文</p>"
+    assert rows[0]["ジャンル"] == '["マシン"]'
+    assert json.loads(rows[0]["その他フィールド"]) == {"独自項目": "x"}
+    assert json.loads(rows[0]["ターム"]) == {"pilates-features": [3]}
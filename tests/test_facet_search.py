@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def studios(index_snapshot):
+    index_snapshot({
+        1: {"title": {"rendered": "スタジオA"}, "custom_fields": {"男性利用可否": "可", "駐車場": "あり"}},
+        2: {"title": {"rendered": "スタジオB"}, "custom_fields": {"男性利用可否": "不可", "駐車場": "なし"}},
+        3: {"title": {"rendered": "スタジオC"}, "custom_fields": {"男性利用可否": "可（要予約）", "駐車場": "なし（近隣にコインパーキングあり）"}},
+        4: {"title": {"rendered": "スタジオD"}, "custom_fields": {"男性利用可否": ["不可"], "駐車場": "あり（有料）"}},
+    })
+    server._facet_index_ensure()
+
+
+@pytest.mark.parametrize("facet, query, expected", [
+    ("男性利用可否", "可", [1, 3]),
+    ("男性利用可否", "不可", [2, 4]),
+    ("駐車場", "あり", [1, 4]),
+    ("駐車場", "なし", [2, 3]),
+    ("駐車場", "あり（有料）", [4]),
+])
+def test_match_does_not_cross_negated_values(studios, facet, query, expected):
+    assert server._bits_to_ids(server._facet_match_bits(facet, query)) == expected
+
+
+def test_values_split_outside_parentheses():
+    assert server._facet_values("なし（近隣、コインパーキング）、あり") == {"なし(近隣、コインパーキング)", "あり"}
+
+
+def test_facet_search_without_mirror(studios):
+    result = asyncio.run(server.pilates_facet_search(男性利用可否="可", 駐車場="あり"))
+    assert "該当: 1件" in result
+    assert "スタジオA" in result
+    assert "スタジオC" not in result
@@ -0,0 +1,48 @@
+import asyncio
+
+import httpx
+
+import server
+
+
+FIELDS = ("id", "title")
+CUSTOM_FIELDS = ("簡易地区",)
+
+
+def _posts(request):
+    """カスタムフィールドを持たない投稿。_fields= が指定されればそのフィールドだけを返す"""
+    posts = [{"id": post_id, "title": {"rendered": f"スタジオ{post_id}"}, "slug": f"s{post_id}"} for post_id in (1, 2)]
+    projected = request.url.params.get("_fields")
+    if projected:
+        keep = projected.split(",")
+        posts = [{key: value for key, value in post.items() if key in keep} for post in posts]
+    return httpx.Response(200, json=posts)
+
+
+def _get_projected():
+    async def run():
+        async with server._wp_client() as client:
+            return await server._wp_get_projected(client, server.WP_POST_TYPE, {"page": 1}, FIELDS, CUSTOM_FIELDS)
+
+    return asyncio.run(run())
+
+
+def test_absent_custom_fields_are_checked_once_per_endpoint(wordpress_api):
+    requests = wordpress_api(_posts)
+    assert _get_projected().status_code == 200
+    assert [("_fields" in request.url.params) for request in requests] == [True, False]
+
+    assert _get_projected().status_code == 200
+    assert len(requests) == 3
+    assert "_fields" in requests[-1].url.params
+    assert server.WP_POST_TYPE not in server._fields_projection_unsupported
+
+
+def test_absent_custom_fields_are_rechecked_after_ttl(wordpress_api):
+    requests = wordpress_api(_posts)
+    _get_projected()
+    key = (server._edit_context_endpoint_key(server.WP_POST_TYPE), CUSTOM_FIELDS)
+    server._fields_custom_fields_absent[key] -= server.WP_EDIT_CONTEXT_CACHE_TTL + 1
+
+    _get_projected()
+    assert len(requests) == 4
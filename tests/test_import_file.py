@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def wordpress(monkeypatch, index_snapshot):
+    """既存の投稿の一覧と、書き込み（_wp_batch_write）の送信内容を差し替える"""
+    writes = []
+
+    async def pages(client, post_type, params, **kwargs):
+        yield [{"id": 10, "slug": "existing", "title": {"rendered": "既存スタジオ"}}]
+
+    async def batch_write(jobs, concurrency=None):
+        writes.extend(jobs)
+        return [{"id": 100 + n, **payload} for n, (_, payload) in enumerate(jobs)]
+
+    monkeypatch.setattr(server, "_wp_iter_collection_pages", pages)
+    monkeypatch.setattr(server, "_wp_batch_write", batch_write)
+    return writes
+
+
+def test_split_row_splits_multi_values_and_reports_unknown_columns():
+    post_values, fields, unknown = server._import_split_row({
+        "タイトル": " 新スタジオ ", "ジャンル": "マシン| マット |", "住所": "東京都渋谷区",
+        "リンク": "https://example.com/", "備考": "x",
+    })
+    assert post_values == {"title": "新スタジオ"}
+    assert fields == {"ジャンル": ["マシン", "マット"], "住所": "東京都渋谷区"}
+    assert unknown == ["備考"]
+
+
+def test_import_csv(tmp_path, wordpress):
+    path = tmp_path / "studios.csv"
+    path.write_text(
+        "タイトル,ジャンル,備考\n"
+        "新スタジオ,マシン|マット,メモ\n"
+        "既存スタジオ,マット,\n"
+        "新スタジオ,グループ,\n",
+        encoding="utf-8",
+    )
+    result = asyncio.run(server.pilates_import_file(str(path)))
+    assert "作成: 1件 / 更新: 1件 / 失敗: 0件 / スキップ: 1件" in result
+    assert "対応しない列（無視しました）: 備考" in result
+    assert "4行目: 同じファイル内で作成待ちの投稿と重複するためスキップ" in result
+    assert wordpress == [
+        ("pilates-studio", {"title": "新スタジオ", "status": "draft", "meta": {"ジャンル": ["マシン", "マット"]}}),
+        ("pilates-studio/10", {"title": "既存スタジオ", "meta": {"ジャンル": ["マット"]}}),
+    ]
+
+
+def test_import_jsonl(tmp_path, wordpress):
+    path = tmp_path / "studios.jsonl"
+    lines = [
+        {"slug": "new-studio", "タイトル": "新スタジオ", "レッスン方式": "グループ|パーソナル"},
+        {"slug": "new-studio", "タイトル": "新スタジオ（重複）"},
+        {"slug": "existing", "表用料金": "月額9,800円"},
+    ]
+    path.write_text("\n".join(json.dumps(line, ensure_ascii=False) for line in lines) + "\n\nnot json\n", encoding="utf-8")
+    result = asyncio.run(server.pilates_import_file(str(path), ドライラン=True))
+    assert "作成予定: 1件 / 更新予定: 1件 / 失敗: 1件 / スキップ: 1件" in result
+    assert "5行目: JSONの形式に問題があります" in result
+    assert wordpress == []
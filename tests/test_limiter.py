@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+import server
+
+HOST = "wp.example"
+
+
+@pytest.fixture(autouse=True)
+def limiters(monkeypatch):
+    monkeypatch.setattr(server, "_limiters", {})
+    monkeypatch.setattr(server, "WP_MAX_CONCURRENT_REQUESTS", 2)
+
+
+async def _fill() -> None:
+    """同時接続枠をすべて使用中にする"""
+    for _ in range(server.WP_MAX_CONCURRENT_REQUESTS):
+        await server._limiter_acquire(HOST, server.WP_PRIORITY_NORMAL)
+
+
+def test_high_priority_waiter_is_admitted_first():
+    async def run():
+        await _fill()
+        admitted = []
+
+        async def request(name, priority):
+            await server._limiter_acquire(HOST, priority)
+            admitted.append(name)
+
+        tasks = [
+            asyncio.create_task(request("bulk-1", server.WP_PRIORITY_BULK)),
+            asyncio.create_task(request("bulk-2", server.WP_PRIORITY_BULK)),
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request("interactive", server.WP_PRIORITY_INTERACTIVE)))
+        await asyncio.sleep(0)
+        assert admitted == []
+
+        for _ in range(3):
+            server._limiter_release(HOST)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return admitted
+
+    assert asyncio.run(run()) == ["interactive", "bulk-1", "bulk-2"]
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def run():
+        await _fill()
+        waiter = asyncio.create_task(server._limiter_acquire(HOST, server.WP_PRIORITY_BULK))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        for _ in range(server.WP_MAX_CONCURRENT_REQUESTS):
+            server._limiter_release(HOST)
+        return server._limiters[HOST]["active"]
+
+    assert asyncio.run(run()) == 0
+
+
+def test_slot_handed_to_cancelled_waiter_moves_on():
+    async def run():
+        await _fill()
+        first = asyncio.create_task(server._limiter_acquire(HOST, server.WP_PRIORITY_NORMAL))
+        second = asyncio.create_task(server._limiter_acquire(HOST, server.WP_PRIORITY_NORMAL))
+        await asyncio.sleep(0)
+
+        # 枠を受け取った直後（再開する前）にキャンセルされた場合は、次の待機に引き渡す
+        server._limiter_release(HOST)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        await asyncio.wait_for(second, timeout=1)
+
+        limiter = server._limiters[HOST]
+        assert limiter["active"] == server.WP_MAX_CONCURRENT_REQUESTS
+        for _ in range(server.WP_MAX_CONCURRENT_REQUESTS):
+            server._limiter_release(HOST)
+        return limiter["active"]
+
+    assert asyncio.run(run()) == 0
+
+
+def test_token_bucket_paces_requests_beyond_the_burst(monkeypatch):
+    monkeypatch.setattr(server, "WP_MAX_CONCURRENT_REQUESTS", 100)
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        server._limiters[HOST]["tokens"] += delay * server.WP_RATE_LIMIT_PER_SECOND
+        await real_sleep(0)
+
+    async def run():
+        for _ in range(server.WP_RATE_LIMIT_BURST):
+            await server._limiter_acquire(HOST, server.WP_PRIORITY_NORMAL)
+        assert delays == []
+        monkeypatch.setattr(server.asyncio, "sleep", sleep)
+        await server._limiter_acquire(HOST, server.WP_PRIORITY_NORMAL)
+
+    asyncio.run(run())
+    assert len(delays) == 1
+    assert 0 < delays[0] <= 1 / server.WP_RATE_LIMIT_PER_SECOND
@@ -0,0 +1,20 @@
+import pytest
+
+import server
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 600.0),
+    ("120", 120.0),
+    ("90.5", 90.5),
+    ("", 600.0),
+    ("ten", 600.0),
+    ("0", 600.0),
+    ("-5", 600.0),
+])
+def test_env_seconds(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("PILATES_MIRROR_MAX_AGE", raising=False)
+    else:
+        monkeypatch.setenv("PILATES_MIRROR_MAX_AGE", value)
+    assert server._env_seconds("PILATES_MIRROR_MAX_AGE", 600.0) == expected
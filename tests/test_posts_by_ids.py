@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+
+import server
+
+
+def _studio(post_id):
+    return {
+        "id": post_id, "title": {"rendered": f"スタジオ{post_id}"}, "slug": f"studio-{post_id}", "status": "publish",
+        "link": f"https://example.com/?p={post_id}", "date": "2024-10-01T00:00:00", "modified": "2024-10-02T00:00:00",
+        "content": {"rendered": "<p>本文</p>"}, "meta": {"簡易地区": "渋谷"},
+    }
+
+
+def _handler(request):
+    include = request.url.params.get("include")
+    if include:
+        return httpx.Response(200, json=[_studio(int(post_id)) for post_id in include.split(",")])
+    return httpx.Response(200, json=_studio(int(request.url.path.rsplit("/", 1)[-1])))
+
+
+def test_bulk_fetch_populates_single_post_cache(wordpress_api):
+    requests = wordpress_api(_handler)
+    result = asyncio.run(server.pilates_by_ids("1,2"))
+    assert "スタジオ1" in result and "スタジオ2" in result
+    assert len(requests) == 1
+
+    result = asyncio.run(server.pilates_by_id(2))
+    assert "スタジオ2" in result
+    assert len(requests) == 1
+
+
+def test_post_updated_during_bulk_fetch_is_not_cached(wordpress_api):
+    def handler(request):
+        # 取得中に投稿1が更新された（世代が進んだ）
+        server._post_cache_invalidate(server.WP_POST_TYPE, 1)
+        return _handler(request)
+
+    requests = wordpress_api(handler)
+    asyncio.run(server.pilates_by_ids("1,2"))
+    assert (server.WP_POST_TYPE, 1, "edit") not in server._post_cache
+    assert (server.WP_POST_TYPE, 2, "edit") in server._post_cache
+
+    asyncio.run(server.pilates_by_id(1))
+    assert len(requests) == 2
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("事務手数料 3,300円 / 入会金 通常10,000円→0円", [3300, 0]),
+    ("入会金 11,000円→無料 / 事務手数料 5,500円", [5500]),
+    ("月額 9,800円→7,800円 / 年間プラン ¥98,000", [7800, 98000]),
+    ("通常1.5万円→1万円", [10000]),
+])
+def test_clean_text_drops_only_old_prices(text, expected):
+    assert server._parse_yen_amounts(server._price_clean_text(text)) == expected
+
+
+def test_entry_keeps_other_fees_before_arrow():
+    prices = server._parse_studio_prices({"初期費用": "事務手数料 3,300円 / 入会金 通常10,000円→0円"})
+    assert prices["entry"] == 3300
+
+
+def test_entry_free_only():
+    prices = server._parse_studio_prices({"初期費用": "入会金 通常10,000円→無料"})
+    assert prices["entry"] == 0
+
+
+def test_monthly_from_multi_plan_table_price():
+    prices = server._parse_studio_prices({"表用料金": "月4回 通常12,000円→9,800円 / 通い放題 15,000円"})
+    assert prices["monthly"] == 9800
+
+
+def test_monthly_prefers_plans_with_month():
+    prices = server._parse_studio_prices({
+        "価格": ["月4回 10,800円→8,800円", "体験 3,000円→0円", "回数券 20,000円"],
+        "表用料金": "5,000円",
+    })
+    assert prices["monthly"] == 8800
+    assert prices["trial"] == 0
+
+
+def test_price_search_without_mirror(index_snapshot):
+    index_snapshot({
+        1: {"title": {"rendered": "スタジオA"}, "custom_fields": {"表用料金": "月額12,000円", "簡易地区": "渋谷"}},
+        2: {"title": {"rendered": "スタジオB"}, "custom_fields": {"表用料金": "月額8,800円", "簡易地区": "新宿"}},
+        3: {"title": {"rendered": "スタジオC"}, "custom_fields": {"表用料金": "月額9,900円", "簡易地区": "渋谷"}},
+    })
+    result = asyncio.run(server.pilates_price_search(種別="月額", 料金上限=10000))
+    assert "（2件）" in result
+    assert result.index("スタジオB") < result.index("スタジオC")
+    assert "スタジオA" not in result
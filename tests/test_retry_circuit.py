@@ -0,0 +1,138 @@
+import asyncio
+
+import httpx
+import pytest
+
+import server
+
+HOST = httpx.URL(server.WP_SITE_URL).host
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """リトライの待ち時間を記録し、実際には待たない"""
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(server.asyncio, "sleep", sleep)
+    return delays
+
+
+def _responses(*responses):
+    """リクエストの順に返すレスポンスを決める"""
+    queue = list(responses)
+    return lambda request: queue.pop(0) if len(queue) > 1 else queue[0]
+
+
+def _get(path="pilates-studio"):
+    async def run():
+        async with server._wp_client() as client:
+            return await server._wp_get(client, path, {"per_page": 1})
+    return asyncio.run(run())
+
+
+def test_retries_5xx_then_succeeds(wordpress_api, sleeps):
+    requests = wordpress_api(_responses(httpx.Response(502), httpx.Response(502), httpx.Response(200, json=[])))
+    assert _get().status_code == 200
+    assert len(requests) == 3
+    assert len(sleeps) == 2
+    circuit = server._circuits[HOST]
+    assert circuit["total_retries"] == 2
+    assert circuit["total_failures"] == 2
+    assert circuit["state"] == "closed"
+    assert circuit["failures"] == 0
+
+
+def test_gives_up_after_max_attempts(wordpress_api, sleeps):
+    requests = wordpress_api(_responses(httpx.Response(503)))
+    assert _get().status_code == 503
+    assert len(requests) == server.WP_RETRY_MAX_ATTEMPTS
+
+
+def test_retry_after_is_honoured(wordpress_api, sleeps):
+    wordpress_api(_responses(httpx.Response(429, headers={"Retry-After": "3"}), httpx.Response(200, json=[])))
+    assert _get().status_code == 200
+    assert sleeps == [3.0]
+    # 429 はサーバーの障害ではないので、サーキットの失敗には数えない
+    assert server._circuits[HOST]["total_failures"] == 0
+
+
+def test_long_retry_after_returns_immediately(wordpress_api, sleeps):
+    requests = wordpress_api(_responses(httpx.Response(503, headers={"Retry-After": str(int(server.WP_RETRY_AFTER_MAX) + 1)})))
+    assert _get().status_code == 503
+    assert len(requests) == 1
+    assert sleeps == []
+
+
+def test_post_is_not_retried(wordpress_api, sleeps):
+    requests = wordpress_api(_responses(httpx.Response(502)))
+
+    async def run():
+        async with server._wp_client() as client:
+            return await server._wp_send(client, "POST", f"{server.WP_SITE_URL}/wp-json/wp/v2/pilates-studio/1", json={})
+
+    assert asyncio.run(run()).status_code == 502
+    assert len(requests) == 1
+
+
+def test_transport_errors_are_retried(wordpress_api, sleeps):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json=[])
+
+    wordpress_api(handler)
+    assert _get().status_code == 200
+    assert server._circuits[HOST]["total_retries"] == 1
+
+
+def test_circuit_opens_and_half_open_probe_closes_it(wordpress_api, sleeps):
+    responses = [httpx.Response(502)]
+    requests = wordpress_api(lambda request: responses[0])
+    # 1回の呼び出しで WP_RETRY_MAX_ATTEMPTS 回失敗する。しきい値に達するまで呼ぶ
+    with pytest.raises(RuntimeError, match="一時停止"):
+        for _ in range(server.WP_CIRCUIT_FAILURE_THRESHOLD):
+            _get()
+    circuit = server._circuits[HOST]
+    assert circuit["state"] == "open"
+    sent = len(requests)
+
+    # オープン中は送信せずに拒否する
+    with pytest.raises(RuntimeError, match="一時停止"):
+        _get()
+    assert len(requests) == sent
+    assert circuit["total_rejected"] >= 2
+
+    # リセット時間を過ぎるとハーフオープンで1件だけ試行し、成功すれば閉じる
+    circuit["opened_at"] -= server.WP_CIRCUIT_RESET_TIMEOUT + 1
+    responses[0] = httpx.Response(200, json=[])
+    assert _get().status_code == 200
+    assert len(requests) == sent + 1
+    assert circuit["state"] == "closed"
+
+
+def test_failed_half_open_probe_reopens(wordpress_api, sleeps):
+    requests = wordpress_api(_responses(httpx.Response(502)))
+    circuit = server._circuit(HOST)
+    circuit.update({"state": "open", "opened_at": 0.0, "failures": server.WP_CIRCUIT_FAILURE_THRESHOLD})
+    with pytest.raises(RuntimeError, match="一時停止"):
+        _get()
+    # 試行の1件が失敗した時点で再びオープンになり、残りのリトライは送信しない
+    assert len(requests) == 1
+    assert circuit["state"] == "open"
+    assert circuit["probe_in_flight"] is False
+
+
+def test_diagnostics_reports_counters(wordpress_api, sleeps):
+    wordpress_api(_responses(httpx.Response(502), httpx.Response(502), httpx.Response(200, json=[])))
+    _get()
+    result = asyncio.run(server.pilates_diagnostics())
+    assert "状態: 🟢 正常" in result
+    assert "累計 失敗: 2 / リトライ: 2 / 遮断: 0" in result
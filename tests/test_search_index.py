@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import server
+
+
+def _build_index(monkeypatch, docs):
+    index = {"postings": {}, "by_post": {}, "doc_len": {}, "total_len": 0.0}
+    rows = [
+        {"id": post_id, "title": title, "content": content, "fields": json.dumps(fields, ensure_ascii=False)}
+        for post_id, (title, content, fields) in docs.items()
+    ]
+    server._search_index_update(index, rows)
+    monkeypatch.setitem(server._search_indexes, "test-type", index)
+
+
+def test_tokens_split_where_script_changes():
+    tokens = server._search_tokens("ピラティスstudio", query=True)
+    assert "studio" in tokens
+    assert "スs" not in tokens
+
+
+def test_single_character_query(monkeypatch):
+    _build_index(monkeypatch, {
+        1: ("スタジオ港", "", {"住所": "東京都港区"}),
+        2: ("スタジオ渋谷", "", {"住所": "東京都渋谷区"}),
+    })
+    assert set(server._search_index_query("test-type", "港")) == {1}
+
+
+def test_mixed_script_query(monkeypatch):
+    _build_index(monkeypatch, {
+        1: ("ピラティスstudio渋谷", "", {}),
+        2: ("ヨガスタジオ", "<p>studios</p>", {}),
+    })
+    assert set(server._search_index_query("test-type", "studio")) == {1}
+    assert set(server._search_index_query("test-type", "ピラティス")) == {1}
+
+
+@pytest.mark.parametrize("query", ["", "  ", "!!"])
+def test_empty_query(monkeypatch, query):
+    _build_index(monkeypatch, {1: ("スタジオ", "", {})})
+    assert server._search_index_query("test-type", query) == {}
+
+
+def test_list_without_mirror_searches_wordpress(monkeypatch, wordpress_api):
+    def mirror_db():
+        raise AssertionError("the mirror is disabled")
+
+    monkeypatch.setattr(server, "_mirror_db", mirror_db)
+    requests = wordpress_api(lambda request: httpx.Response(200, json=[
+        {"id": 1, "status": "publish", "title": {"rendered": "スタジオ渋谷"}, "link": "https://example.com/?p=1",
+         "custom_fields": {"簡易地区": "渋谷"}},
+    ]))
+    result = asyncio.run(server.pilates_list(店舗名="渋谷"))
+    assert "スタジオ渋谷" in result
+    assert [request.url.params["search"] for request in requests] == ["渋谷"]
+    assert server._search_indexes.get(server.WP_POST_TYPE) is None